@@ -0,0 +1,87 @@
+"""
+Construction time and memory of Event against the previous plain dataclass.
+
+    python benchmarks/bench_event_model.py [--sizes 100000 1000000]
+
+``LegacyEvent`` reproduces the model before slots: a regular dataclass whose
+``__post_init__`` looks the zone up with ``pytz.timezone`` on every event.
+"""
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytz
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.models import Event, EventSource, FrozenEvent  # noqa: E402
+
+@dataclass
+class LegacyEvent:
+    title: str
+    description: str
+    url: str
+    start_dt: datetime
+    end_dt: datetime
+    location: str
+    popularity: float
+    source: EventSource
+    source_id: str
+    is_all_day: bool = False
+    score: float = None
+
+    def __post_init__(self):
+        montreal_tz = pytz.timezone('America/Montreal')
+        if self.start_dt.tzinfo is None:
+            self.start_dt = montreal_tz.localize(self.start_dt)
+        else:
+            self.start_dt = self.start_dt.astimezone(montreal_tz)
+        if self.end_dt.tzinfo is None:
+            self.end_dt = montreal_tz.localize(self.end_dt)
+        else:
+            self.end_dt = self.end_dt.astimezone(montreal_tz)
+
+def build(cls, n: int):
+    base = datetime(2025, 6, 1, 18)
+    hours = [base + timedelta(hours=h) for h in range(24 * 60)]
+    return [
+        cls(
+            title="Concert", description="Live music", url="https://example.com",
+            start_dt=hours[i % len(hours)], end_dt=hours[i % len(hours)] + timedelta(hours=2),
+            location="Montreal", popularity=0.5, source=EventSource.VILLE_MTL, source_id=str(i),
+        )
+        for i in range(n)
+    ]
+
+def measure(cls, n: int):
+    gc.collect()
+    start = time.perf_counter()
+    build(cls, n)
+    elapsed = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    events = build(cls, n)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del events
+    return elapsed, size / n
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'events':>9} {'model':>12} {'build s':>9} {'bytes/event':>12}")
+    for n in args.sizes:
+        for cls in (LegacyEvent, Event, FrozenEvent):
+            elapsed, per_event = measure(cls, n)
+            print(f"{n:>9} {cls.__name__:>12} {elapsed:>9.2f} {per_event:>12.0f}")
+
+if __name__ == "__main__":
+    main()
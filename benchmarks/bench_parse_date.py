@@ -0,0 +1,91 @@
+"""
+Date parsing of a city CSV: the original exception cascade against DateParser.
+
+    python benchmarks/bench_parse_date.py [--rows 50000] [--csv evenements.csv]
+
+Without ``--csv`` a synthetic file shaped like the city's evenements.csv is
+used: ``date_debut`` values over a year of days, some with a time of day, so
+the same strings repeat across rows. ``legacy_parse_date`` is the
+parser before this change, copied verbatim.
+"""
+import argparse
+import csv
+import io
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+
+import pytz
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.dates import DateParser  # noqa: E402
+
+def legacy_parse_date(date_str: str) -> datetime:
+    montreal_tz = pytz.timezone('America/Montreal')
+    try:
+        dt = parsedate_to_datetime(date_str)
+        return dt.astimezone(montreal_tz)
+    except (ValueError, TypeError):
+        pass
+    try:
+        dt = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=pytz.UTC)
+        return dt.astimezone(montreal_tz)
+    except ValueError:
+        pass
+    for fmt in ['%Y-%m-%d', '%Y-%m-%d %H:%M:%S', '%d/%m/%Y %H:%M']:
+        try:
+            dt = datetime.strptime(date_str, fmt)
+            return montreal_tz.localize(dt)
+        except ValueError:
+            continue
+    raise ValueError(f"Could not parse date string: {date_str}")
+
+def synthetic_csv(rows: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    first = date(2025, 1, 1)
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(["titre", "description", "url_fiche", "date_debut", "date_fin", "titre_adresse", "arrondissement"])
+    for i in range(rows):
+        day = first + timedelta(days=rng.randrange(365))
+        start = day.isoformat()
+        if rng.random() < 0.3:
+            start += f"T{rng.choice([10, 13, 19, 20]):02d}:00:00"
+        writer.writerow([f"Activité {i}", "Description", "https://montreal.ca", start, start,
+                         "Parc", "Ville-Marie"])
+    return out.getvalue()
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--csv", type=Path, help="a downloaded evenements.csv instead of synthetic rows")
+    args = parser.parse_args()
+
+    text = args.csv.read_text(encoding="utf-8") if args.csv else synthetic_csv(args.rows)
+    values = [r["date_debut"] for r in csv.DictReader(io.StringIO(text))]
+    print(f"{len(values)} rows, {len(set(values))} distinct date_debut values")
+
+    legacy_s, expected = timed(lambda: [legacy_parse_date(v) for v in values])
+    row_parser = DateParser()
+    rows_s, per_row = timed(lambda: [row_parser.parse(v, "ville_mtl") for v in values])
+    bulk_s, bulk = timed(lambda: DateParser().parse_dates(values, "ville_mtl"))
+    assert per_row == expected and bulk == expected
+
+    print(f"{'parser':>22} {'seconds':>9} {'speedup':>8}")
+    for name, seconds in [("legacy parse_date", legacy_s), ("DateParser.parse", rows_s),
+                          ("DateParser.parse_dates", bulk_s)]:
+        print(f"{name:>22} {seconds:>9.3f} {legacy_s / seconds:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
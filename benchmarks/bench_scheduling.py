@@ -0,0 +1,63 @@
+"""
+Compare the greedy and optimal ranking engines on synthetic days.
+
+    python benchmarks/bench_scheduling.py [--events 100 1000 3000] [--days 3]
+
+For each size, prints the total selected score and the runtime of both
+engines, with the caps from the ranker and with looser festival-season caps.
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.models import Event, EventSource  # noqa: E402
+from src.ranker import MAX_PARALLEL, MAX_PER_DAY  # noqa: E402
+from src.scheduling import greedy_select, optimal_select  # noqa: E402
+
+def synthetic_events(n: int, days: int, seed: int = 0):
+    rng = random.Random(seed)
+    base = datetime(2025, 7, 1, 8)
+    events = []
+    for i in range(n):
+        start = base + timedelta(days=rng.randrange(days), minutes=rng.randrange(0, 14 * 60, 15))
+        length = rng.choice([30, 60, 90, 120, 180, 240, 480])
+        e = Event(
+            title=f"event {i}", description="", url="", location="Montreal",
+            start_dt=start, end_dt=start + timedelta(minutes=length),
+            popularity=0.0, source=EventSource.VILLE_MTL, source_id=str(i),
+        )
+        # Long events score a little higher, which is where greedy gets blocked
+        e.score = round(rng.uniform(0.2, 0.8) + (0.15 if length >= 240 else 0.0), 3)
+        events.append(e)
+    return events
+
+def run(engine, events, max_per_day, max_parallel):
+    start = time.perf_counter()
+    selected = engine(events, max_per_day, max_parallel)
+    return sum(e.score for e in selected), len(selected), time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--events", type=int, nargs="+", default=[100, 1000, 3000])
+    parser.add_argument("--days", type=int, default=3)
+    args = parser.parse_args()
+
+    caps = [(MAX_PER_DAY, MAX_PARALLEL), (50, 10)]
+    print(f"{'events':>7} {'caps':>7} {'greedy score':>13} {'optimal score':>14} {'gain':>7} "
+          f"{'greedy s':>9} {'optimal s':>10}")
+    for n in args.events:
+        events = synthetic_events(n, args.days)
+        for max_per_day, max_parallel in caps:
+            g_score, _, g_time = run(greedy_select, events, max_per_day, max_parallel)
+            o_score, _, o_time = run(optimal_select, events, max_per_day, max_parallel)
+            gain = (o_score - g_score) / g_score * 100 if g_score else 0.0
+            print(f"{n:>7} {f'{max_per_day}/{max_parallel}':>7} {g_score:>13.2f} {o_score:>14.2f} "
+                  f"{gain:>6.1f}% {g_time:>9.3f} {o_time:>10.3f}")
+
+if __name__ == "__main__":
+    main()
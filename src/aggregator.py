@@ -1,29 +1,113 @@
-from typing import List, Tuple, Dict
-from datetime import datetime, timedelta
-import hashlib
-import concurrent.futures
+from typing import List, Mapping, Optional, Tuple, Dict
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from . import fetcher
+from .dedupe import hash_title, merge_near_duplicates
 from .models import Event
 from .ranker import rank_and_filter
-from .sources import (
-    # get_eventbrite_events,  # Eventbrite disabled
-    # get_ticketmaster_events, # Removed as requested
-    # get_tourisme_events,
-    get_rss_events,
-    get_reddit_events,
-    get_city_events
-)
+from .sources import LatencyHistory, enabled_sources, record_run, schedule
+from .utils.published import PublishedIndex, PublishedRecord
 
-def hash_title(title: str, date: datetime) -> str:
-    """Create a unique hash for an event based on its title and date."""
-    # Normalize title: lowercase, remove special chars
-    normalized = ''.join(c.lower() for c in title if c.isalnum() or c.isspace())
-    # Use date in YYYY-MM-DD format
-    date_str = date.strftime('%Y-%m-%d')
-    # Create hash
-    return hashlib.md5(f"{normalized}|{date_str}".encode()).hexdigest()
+PUBLISHED_RETENTION = timedelta(days=30)  # keep past events this long in the published index
+
+def published_key(event: Event) -> Tuple[str, str]:
+    """Key of an event in the published index."""
+    return hash_title(event.title, event.start_dt), event.source_id
+
+def restore_published(
+    events: List[Event],
+    index: PublishedIndex,
+    ranking: str,
+) -> Dict[Tuple[str, str], PublishedRecord]:
+    """
+    Find fetched events that were published before and have not changed since.
+
+    Their stored score is put back on the event when it was computed with the
+    current weights, so ranking with ``reuse_scores`` skips them. Returns the
+    index records of those events by published key.
+    """
+    if not events:
+        return {}
+    days = [e.start_dt.date() for e in events]
+    known = index.lookup(map(published_key, events), min(days), max(days))
+    unchanged = {}
+    for event in events:
+        key = published_key(event)
+        record = known.get(key)
+        if record is None or record.content_hash != event.content_hash():
+            continue
+        unchanged[key] = record
+        if record.ranking == ranking:
+            event.score = record.score
+    return unchanged
+
+@dataclass
+class SyncPlan:
+    """What a sync would do to the calendar, per event."""
+    create: List[Event] = field(default_factory=list)
+    update: List[Event] = field(default_factory=list)
+    unchanged: List[Event] = field(default_factory=list)
+
+def plan_sync(
+    events: List[Event],
+    index: PublishedIndex,
+    unchanged: Mapping[Tuple[str, str], PublishedRecord],
+) -> SyncPlan:
+    """
+    Split events the way a sync would treat them, from the published index
+    alone: unchanged since published, published before and changed (updated
+    in place), or new. ``unchanged`` is what ``restore_published`` returned.
+    """
+    plan = SyncPlan()
+    if not events:
+        return plan
+    days = [e.start_dt.date() for e in events]
+    known = index.lookup(map(published_key, events), min(days), max(days))
+    for event in events:
+        key = published_key(event)
+        if key in unchanged:
+            plan.unchanged.append(event)
+        elif key in known and known[key].calendar_id:
+            plan.update.append(event)
+        else:
+            plan.create.append(event)
+    return plan
+
+def record_published(
+    index: PublishedIndex,
+    events: List[Event],
+    calendar_ids: Mapping[str, str],
+    ranking: str,
+    today: Optional[date] = None,
+) -> int:
+    """
+    Store the events that made it to the calendar (those with a calendar id)
+    and forget events that are long past. Returns how many were stored.
+    """
+    records = [
+        PublishedRecord(
+            key=published_key(e)[0],
+            source_id=e.source_id,
+            day=e.start_dt.date().isoformat(),
+            score=e.score,
+            content_hash=e.content_hash(),
+            ranking=ranking,
+            calendar_id=calendar_ids[e.source_id],
+        )
+        for e in events
+        if e.source_id in calendar_ids
+    ]
+    index.record(records)
+    index.prune((today or date.today()) - PUBLISHED_RETENTION)
+    return len(records)
 
 def deduplicate(events: List[Event]) -> List[Event]:
-    """Remove duplicate events based on title and date."""
+    """Remove duplicate events based on title and date.
+
+    Exact duplicates go first; near-duplicates across sources (e.g. a
+    bilingual city title and the English blog title) are then merged,
+    keeping the richest record.
+    """
     seen = set()
     unique = []
     
@@ -35,55 +119,39 @@ def deduplicate(events: List[Event]) -> List[Event]:
             seen.add(event_hash)
             unique.append(event)
             
-    return unique
+    return merge_near_duplicates(unique)
+
+def pull_all(budget: Optional[float] = None) -> List[Event]:
+    """
+    Fetch events from all enabled sources concurrently under one shared deadline.
+
+    Sources start slowest-first with deadlines sized from their latency in
+    previous runs; by default the overall budget is the longest of those.
+    Sources still running when it expires are cancelled; whatever they
+    produced before that is kept.
+    """
+    history = LatencyHistory.load()
+    plan, planned_budget = schedule(enabled_sources(), history)
+    results = fetcher.run(plan, planned_budget if budget is None else budget)
+    record_run(results, history)
+    report_results(results)
 
-def pull_all() -> List[Event]:
-    """Fetch events from all sources with timeouts."""
     all_events = []
-    
-    # Fetch from each source
-    sources = [
-        # get_eventbrite_events,
-        # get_ticketmaster_events, # Removed as requested
-        # get_tourisme_events,
-        get_rss_events,
-        get_reddit_events,
-        get_city_events
-    ]
-    
-    # Use a single ThreadPoolExecutor with a timeout for all sources
-    with concurrent.futures.ThreadPoolExecutor(max_workers=len(sources)) as executor:
-        # Submit all source fetches with timeout
-        futures = []
-        for source in sources:
-            future = executor.submit(source)
-            futures.append((future, source.__name__))
-        
-        # Wait for all futures with timeout
-        try:
-            # Give each source appropriate timeout
-            for future, source_name in futures:
-                try:
-                    # City events need more time for translations
-                    timeout = 60 if source_name == 'get_city_events' else 30
-                    events = future.result(timeout=timeout)
-                    all_events.extend(events)
-                    print(f"Fetched {len(events)} events from {source_name}")
-                except concurrent.futures.TimeoutError:
-                    print(f"Timeout fetching from {source_name}")
-                    future.cancel()
-                except Exception as e:
-                    print(f"Error fetching from {source_name}: {e}")
-                    future.cancel()
-                    
-        except Exception as e:
-            print(f"Error during event fetching: {e}")
-            # Cancel any remaining futures
-            for future, _ in futures:
-                future.cancel()
-    
+    for result in results:
+        all_events.extend(result.events)
     return all_events
 
+def report_results(results: List[fetcher.SourceResult]) -> None:
+    """Print one status line per source."""
+    for result in results:
+        if result.status == "ok":
+            print(f"Fetched {result.count} events from {result.name} in {result.elapsed:.1f}s")
+        elif result.status == "timeout":
+            print(f"Timeout fetching from {result.name} after {result.elapsed:.1f}s "
+                  f"(kept {result.count} partial events)")
+        else:
+            print(f"Error fetching from {result.name}: {result.error}")
+
 def process(events: List[Event]) -> Tuple[List[Event], List[Event]]:
     """
     Process events: deduplicate, separate festivals, and rank curated events.
@@ -0,0 +1,191 @@
+"""
+Columnar storage for many events at once.
+
+``EventBatch`` keeps one NumPy array per numeric field (start and end as
+epoch microseconds with their UTC offsets, source code, popularity, score,
+all-day flag) and stores strings once in a shared pool, with integer codes
+per row. Bulk stages then work on whole columns (local days, dedupe keys,
+masks) instead of touching ``Event`` attributes one object at a time.
+
+Conversion is lossless: rebuilt events compare equal and have the same
+``content_hash``, down to the offset pytz gives wall times in a DST gap.
+``None`` popularity and scores are stored as NaN, and repeated strings are
+shared between the rebuilt events.
+"""
+from __future__ import annotations
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence
+import numpy as np
+import pytz
+from .dedupe import hash_title
+from .models import Event, EventSource, to_montreal
+
+SOURCES = tuple(EventSource)          # source code -> EventSource
+_SOURCE_CODES = {s: i for i, s in enumerate(SOURCES)}
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = pytz.UTC.localize(_EPOCH)
+_EPOCH_ORDINAL = _EPOCH.toordinal()
+_US_PER_DAY = 86_400_000_000
+_ONE_US = timedelta(microseconds=1)
+_ONE_S = timedelta(seconds=1)
+
+STRING_COLUMNS = ("title", "description", "url", "location", "source_id")
+ARRAY_COLUMNS = ("start_us", "end_us", "start_offset", "end_offset", "source", "popularity", "score", "is_all_day") + STRING_COLUMNS
+
+def _epoch_us(dt: datetime) -> int:
+    """Exact microseconds since the epoch of an aware datetime."""
+    return (dt - _EPOCH_UTC) // _ONE_US
+
+def _offset_s(dt: datetime) -> int:
+    return dt.utcoffset() // _ONE_S
+
+@lru_cache(maxsize=65536)
+def _event_datetime(us: int, offset: int) -> datetime:
+    """Datetime to build an Event with, so that it gets back ``offset`` at that instant."""
+    instant = _EPOCH_UTC + timedelta(microseconds=us)
+    if _offset_s(to_montreal(instant)) == offset:
+        return instant
+    # A wall time in a DST gap keeps the offset pytz localizes it with; only
+    # the naive wall time gets that back, an aware one would be normalized
+    return _EPOCH + timedelta(microseconds=us, seconds=offset)
+
+class StringPool:
+    """Each distinct string (or None) stored once; rows refer to it by code."""
+
+    def __init__(self):
+        self.values: List[Optional[str]] = []
+        self._codes: Dict[Optional[str], int] = {}
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def code(self, value: Optional[str]) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def encode(self, values: Iterable[Optional[str]]) -> np.ndarray:
+        return np.fromiter((self.code(v) for v in values), dtype=np.int32)
+
+@dataclass
+class EventBatch:
+    """Events as columns. String columns hold codes into ``strings``."""
+    start_us: np.ndarray        # int64 epoch microseconds
+    end_us: np.ndarray          # int64 epoch microseconds
+    start_offset: np.ndarray    # int32 UTC offset of start_dt, in seconds
+    end_offset: np.ndarray      # int32 UTC offset of end_dt, in seconds
+    source: np.ndarray          # int8 index into SOURCES
+    popularity: np.ndarray      # float64, NaN for None
+    score: np.ndarray           # float64, NaN for None
+    is_all_day: np.ndarray      # bool
+    title: np.ndarray           # int32 codes
+    description: np.ndarray
+    url: np.ndarray
+    location: np.ndarray
+    source_id: np.ndarray
+    strings: StringPool = field(default_factory=StringPool)
+
+    @classmethod
+    def from_events(cls, events: Sequence[Event], strings: Optional[StringPool] = None) -> EventBatch:
+        strings = strings if strings is not None else StringPool()
+        n = len(events)
+
+        def floats(values) -> np.ndarray:
+            return np.fromiter((np.nan if v is None else v for v in values), dtype=np.float64, count=n)
+
+        return cls(
+            start_us=np.fromiter((_epoch_us(e.start_dt) for e in events), dtype=np.int64, count=n),
+            end_us=np.fromiter((_epoch_us(e.end_dt) for e in events), dtype=np.int64, count=n),
+            start_offset=np.fromiter((_offset_s(e.start_dt) for e in events), dtype=np.int32, count=n),
+            end_offset=np.fromiter((_offset_s(e.end_dt) for e in events), dtype=np.int32, count=n),
+            source=np.fromiter((_SOURCE_CODES[e.source] for e in events), dtype=np.int8, count=n),
+            popularity=floats(e.popularity for e in events),
+            score=floats(e.score for e in events),
+            is_all_day=np.fromiter((bool(e.is_all_day) for e in events), dtype=bool, count=n),
+            strings=strings,
+            **{name: strings.encode(getattr(e, name) for e in events) for name in STRING_COLUMNS},
+        )
+
+    def __len__(self) -> int:
+        return len(self.start_us)
+
+    def __getitem__(self, i: int) -> Event:
+        return self.filter(slice(i, i + 1 if i != -1 else None)).to_events()[0]
+
+    def to_events(self) -> List[Event]:
+        # Whole columns to Python objects first: far cheaper than indexing row by row
+        text = self.strings.values
+        columns = zip(*(getattr(self, name).tolist() for name in ARRAY_COLUMNS))
+        return [
+            Event(
+                title=text[title],
+                description=text[description],
+                url=text[url],
+                start_dt=_event_datetime(start_us, start_offset),
+                end_dt=_event_datetime(end_us, end_offset),
+                location=text[location],
+                popularity=None if popularity != popularity else popularity,   # NaN
+                source=SOURCES[source],
+                source_id=text[source_id],
+                is_all_day=is_all_day,
+                score=None if score != score else score,
+            )
+            for (start_us, end_us, start_offset, end_offset, source, popularity, score, is_all_day,
+                 title, description, url, location, source_id) in columns
+        ]
+
+    @property
+    def start_ts(self) -> np.ndarray:
+        """Start as float epoch seconds, equal to ``Event.start_ts``."""
+        return self.start_us / 1e6
+
+    @property
+    def end_ts(self) -> np.ndarray:
+        return self.end_us / 1e6
+
+    def filter(self, selector) -> EventBatch:
+        """Rows picked by a boolean mask or an index array; strings are shared."""
+        columns = {name: getattr(self, name)[selector] for name in ARRAY_COLUMNS}
+        return EventBatch(strings=self.strings, **columns)
+
+    def days(self) -> np.ndarray:
+        """Montreal start day of each row, in days since 1970-01-01."""
+        return (self.start_us + self.start_offset.astype(np.int64) * 1_000_000) // _US_PER_DAY
+
+    def day_buckets(self) -> Dict[date, np.ndarray]:
+        """Row indices by Montreal start day, in row order within each day."""
+        days = self.days()
+        order = np.argsort(days, kind="stable")
+        unique, starts = np.unique(days[order], return_index=True)
+        return {
+            date.fromordinal(_EPOCH_ORDINAL + int(day)): rows
+            for day, rows in zip(unique.tolist(), np.split(order, starts[1:]))
+        }
+
+    def dedupe_keys(self) -> List[str]:
+        """``hash_title(title, start_dt)`` of each row, hashed once per distinct pair."""
+        keys: Dict[tuple, str] = {}
+        out = []
+        for pair in zip(self.title.tolist(), self.days().tolist()):
+            key = keys.get(pair)
+            if key is None:
+                title, day = pair
+                key = keys[pair] = hash_title(self.strings.values[title],
+                                              date.fromordinal(_EPOCH_ORDINAL + day))
+            out.append(key)
+        return out
+
+    def first_occurrences(self) -> np.ndarray:
+        """Mask keeping the first row of each dedupe key, like the exact pass of ``deduplicate``."""
+        seen = set()
+        mask = np.zeros(len(self), dtype=bool)
+        for i, key in enumerate(self.dedupe_keys()):
+            if key not in seen:
+                seen.add(key)
+                mask[i] = True
+        return mask
+
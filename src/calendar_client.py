@@ -1,20 +1,26 @@
-from typing import List
+from typing import Dict, Iterable, List, Set
+import hashlib, json
 import os
 from datetime import datetime, timedelta
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
-from .models import Event
+from .models import MONTREAL_TZ, Event
 import time
 import pytz
 
 
 SCOPES = ["https://www.googleapis.com/auth/calendar"]
+# Checked when a session starts, so offline modes (--replay) run without it
 CALENDAR_ID = os.getenv("GCAL_ID") or os.getenv("GOOGLE_CALENDAR_ID")
-if not CALENDAR_ID:
-    raise RuntimeError("GCAL_ID (or GOOGLE_CALENDAR_ID) var not set")
 
 BATCH_SIZE = 50  # Process events in batches of 50
 
+# Private extended property stamped on every event we write; listing filters on it
+AGENT_PROPERTY = ("agent", "mtl-events")
+LIST_PAGE_SIZE = 2500
+LIST_FIELDS = "items(id,extendedProperties/private),nextPageToken"
+HASH_PROPERTY = "content_hash"  # private extended property with a hash of the rest of the body
+
 def get_calendar_service():
     sa_path = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
     if not sa_path or not os.path.isfile(sa_path):
@@ -54,105 +60,213 @@ def event_to_calendar_event(event: Event) -> dict:
         },
         'extendedProperties': {
             'private': {
+                AGENT_PROPERTY[0]: AGENT_PROPERTY[1],
                 'source': event.source.value,
                 'source_id': event.source_id
             }
         }
     }
+    calendar_event['extendedProperties']['private'][HASH_PROPERTY] = _body_hash(calendar_event)
     return calendar_event
 
-def sync(events: List[Event]) -> None:
+def _body_hash(calendar_event: dict) -> str:
+    """Hash of everything written for an event, so unchanged events can be skipped."""
+    data = json.dumps(calendar_event, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(data.encode()).hexdigest()
+
+class SyncSession:
     """
-    Sync events to Google Calendar.
-    Creates new events and updates existing ones based on source_id.
+    Incremental calendar writer.
+
+    Existing calendar events are looked up for the dates of each round of
+    writes that were not listed before, in one window query, so events can be
+    upserted in several rounds (as the pipeline does) without re-listing the
+    calendar. Events whose stored content hash matches are not written again.
+    Events created by this session can be deleted again if they are later
+    retracted.
     """
-    if not CALENDAR_ID:
-        raise ValueError("GOOGLE_CALENDAR_ID environment variable not set")
-        
-    service = get_calendar_service()
-    
-    # Calculate date range (only fetch next 35 days)
-    now = datetime.utcnow()
-    future = now + timedelta(days=35)  # Reduced from 365 to 35 days
-    
-    # Get existing events within date range
-    existing_events = {}
-    page_token = None
-    
-    # First, build a map of event dates to optimize calendar fetching
-    event_dates = set()
-    for event in events:
-        event_dates.add(event.start_dt.date())
-        if event.end_dt.date() != event.start_dt.date():
-            event_dates.add(event.end_dt.date())
-    
-    print(f"\nFetching existing calendar events for {len(event_dates)} unique dates...")
-    updated_count = 0
-    created_count = 0
-    error_count = 0
-    
-    # Only fetch calendar events for dates where we have events to sync
-    for date in event_dates:
-        date_start = datetime.combine(date, datetime.min.time())
-        date_end = datetime.combine(date, datetime.max.time())
-        
+
+    def __init__(self, service=None, marked_only: bool = False):
+        if not CALENDAR_ID:
+            raise ValueError("GCAL_ID (or GOOGLE_CALENDAR_ID) environment variable not set")
+        self.service = service or get_calendar_service()
+        # Only list events carrying our agent property; safe once no event
+        # written before the property existed is left in the calendar
+        self.marked_only = marked_only
+        self.existing: Dict[str, str] = {}  # source_id -> calendar event id
+        self.hashes: Dict[str, str] = {}    # source_id -> content hash stored on the calendar event
+        self.created: Dict[str, str] = {}   # source_id -> id of events inserted by this session
+        self.synced: Dict[str, str] = {}    # source_id -> id of events written successfully
+        self._loaded_dates: Set = set()
+        self.list_requests = 0
+        self.updated_count = 0
+        self.created_count = 0
+        self.unchanged_count = 0
+        self.deleted_count = 0
+        self.error_count = 0
+
+    def load_existing(self, dates: Iterable) -> None:
+        """Map source_id to calendar event id for every date not listed yet.
+
+        The dates are covered by one window query, followed page by page and
+        returning only ids and private properties. Events written before the
+        agent property existed lack it, so the query is only filtered on it
+        with ``marked_only``.
+        """
+        dates = sorted(set(dates) - self._loaded_dates)
+        if not dates:
+            return
+        time_min = MONTREAL_TZ.localize(datetime.combine(dates[0], datetime.min.time()))
+        time_max = MONTREAL_TZ.localize(datetime.combine(dates[-1] + timedelta(days=1), datetime.min.time()))
         try:
-            events_result = service.events().list(
-                calendarId=CALENDAR_ID,
-                singleEvents=True,
-                orderBy='startTime',
-                timeMin=date_start.isoformat() + 'Z',
-                timeMax=date_end.isoformat() + 'Z',
-                maxResults=2500
-            ).execute()
-            
+            self._list_window(time_min, time_max, marked=self.marked_only)
+        except Exception as e:
+            print(f"Error fetching calendar events for {dates[0]} to {dates[-1]}: {e}")
+            self.error_count += 1
+            return
+        # Only a complete listing counts; failed dates are listed again next time
+        self._loaded_dates.update(dates)
+
+    def _list_window(self, time_min: datetime, time_max: datetime, marked: bool) -> None:
+        """Record the ids of our events in [time_min, time_max)."""
+        params = dict(
+            calendarId=CALENDAR_ID,
+            singleEvents=True,
+            timeMin=time_min.isoformat(),
+            timeMax=time_max.isoformat(),
+            maxResults=LIST_PAGE_SIZE,
+            fields=LIST_FIELDS,
+        )
+        if marked:
+            params['privateExtendedProperty'] = '='.join(AGENT_PROPERTY)
+        while True:
+            events_result = self.service.events().list(**params).execute()
+            self.list_requests += 1
             for event in events_result.get('items', []):
-                source_id = event.get('extendedProperties', {}).get('private', {}).get('source_id')
+                private = event.get('extendedProperties', {}).get('private', {})
+                source_id = private.get('source_id')
                 if source_id:
-                    existing_events[source_id] = event['id']
-                    
-        except Exception as e:
-            print(f"Error fetching calendar events for {date}: {e}")
-            error_count += 1
-            continue
-    
-    print(f"Found {len(existing_events)} existing events in calendar")
-    
-    # Process events in smaller batches
-    for i in range(0, len(events), BATCH_SIZE):
-        batch = service.new_batch_http_request()
-        batch_events = events[i:i + BATCH_SIZE]
-        
-        for event in batch_events:
+                    self.existing[source_id] = event['id']
+                    self.hashes[source_id] = private.get(HASH_PROPERTY)
+            if not events_result.get('nextPageToken'):
+                return
+            params['pageToken'] = events_result['nextPageToken']
+
+    def upsert(self, events: List[Event]) -> None:
+        """Create new events and update changed ones based on source_id; skip the rest."""
+        self.load_existing(_event_dates(events))
+
+        writes = []
+        for event in events:
             calendar_event = event_to_calendar_event(event)
-            
-            if event.source_id in existing_events:
-                # Update existing event
-                batch.add(service.events().update(
-                    calendarId=CALENDAR_ID,
-                    eventId=existing_events[event.source_id],
-                    body=calendar_event
-                ))
-                updated_count += 1
+            content_hash = calendar_event['extendedProperties']['private'][HASH_PROPERTY]
+            event_id = self.existing.get(event.source_id)
+            if event_id is not None and self.hashes.get(event.source_id) == content_hash:
+                self.synced[event.source_id] = event_id
+                self.unchanged_count += 1
             else:
-                # Create new event
-                batch.add(service.events().insert(
-                    calendarId=CALENDAR_ID,
-                    body=calendar_event
-                ))
-                created_count += 1
-        
+                writes.append((event.source_id, event_id, calendar_event, content_hash))
+
+        # Process events in smaller batches
+        for i in range(0, len(writes), BATCH_SIZE):
+            batch = self.service.new_batch_http_request()
+            for source_id, event_id, calendar_event, content_hash in writes[i:i + BATCH_SIZE]:
+                if event_id is not None:
+                    # Update existing event
+                    batch.add(self.service.events().update(
+                        calendarId=CALENDAR_ID,
+                        eventId=event_id,
+                        body=calendar_event
+                    ), callback=self._on_written(source_id, content_hash))
+                    self.updated_count += 1
+                else:
+                    # Create new event, remembering its id for later updates or retraction
+                    batch.add(self.service.events().insert(
+                        calendarId=CALENDAR_ID,
+                        body=calendar_event
+                    ), callback=self._on_written(source_id, content_hash, created=True))
+                    self.created_count += 1
+
+            self._execute(batch, "syncing batch of events to")
+
+    def delete(self, events: List[Event]) -> List[Event]:
+        """Delete retracted events that this session created; returns those deleted.
+
+        Events that were already in the calendar before this session are left
+        in place, as the batch sync would have done.
+        """
+        targets = [(e, self.created[e.source_id]) for e in events if e.source_id in self.created]
+        deleted: List[Event] = []
+        for i in range(0, len(targets), BATCH_SIZE):
+            batch = self.service.new_batch_http_request()
+            for event, event_id in targets[i:i + BATCH_SIZE]:
+                batch.add(self.service.events().delete(calendarId=CALENDAR_ID, eventId=event_id),
+                          callback=self._on_deleted(event, deleted))
+            self._execute(batch, "deleting retracted events from")
+        ids = {self.created.pop(e.source_id) for e in deleted}
+        self.deleted_count += len(deleted)
+        self.existing = {sid: eid for sid, eid in self.existing.items() if eid not in ids}
+        self.hashes = {sid: h for sid, h in self.hashes.items() if sid in self.existing}
+        self.synced = {sid: eid for sid, eid in self.synced.items() if eid not in ids}
+        return deleted
+
+    def report(self) -> None:
+        print(f"\nCalendar sync complete:")
+        print(f"- Created: {self.created_count} events")
+        print(f"- Updated: {self.updated_count} events")
+        print(f"- Unchanged: {self.unchanged_count} events (not written)")
+        print(f"- Deleted: {self.deleted_count} retracted events")
+        if self.error_count > 0:
+            print(f"- Errors: {self.error_count}")
+
+    def _on_written(self, source_id: str, content_hash: str, created: bool = False):
+        def callback(request_id, response, exception):
+            if exception is None and response:
+                self.existing[source_id] = response['id']
+                self.hashes[source_id] = content_hash
+                self.synced[source_id] = response['id']
+                if created:
+                    self.created[source_id] = response['id']
+        return callback
+
+    def _on_deleted(self, event: Event, deleted: List[Event]):
+        def callback(request_id, response, exception):
+            if exception is None:
+                deleted.append(event)
+        return callback
+
+    def _execute(self, batch, action: str) -> None:
         # Execute batch operations
         try:
             batch.execute()
             time.sleep(0.1)  # Small delay between batches
         except Exception as e:
-            print(f"Error syncing batch of events to calendar: {e}")
-            error_count += 1
-            continue  # Continue with next batch even if this one fails
-            
-    print(f"\nCalendar sync complete:")
-    print(f"- Updated: {updated_count} events")
-    print(f"- Created: {created_count} events")
-    if error_count > 0:
-        print(f"- Errors: {error_count}") 
\ No newline at end of file
+            print(f"Error {action} calendar: {e}")
+            self.error_count += 1  # Continue with next batch even if this one fails
+
+def _event_dates(events: List[Event]) -> Set:
+    event_dates = set()
+    for event in events:
+        event_dates.add(event.start_dt.date())
+        if event.end_dt.date() != event.start_dt.date():
+            event_dates.add(event.end_dt.date())
+    return event_dates
+
+def sync(events: List[Event]) -> SyncSession:
+    """
+    Sync events to Google Calendar.
+    Creates new events and updates existing ones based on source_id.
+    Returns the session, whose ``synced`` map holds the events written.
+    """
+    session = SyncSession()
+
+    # Only fetch calendar events for dates where we have events to sync
+    event_dates = _event_dates(events)
+    print(f"\nFetching existing calendar events for {len(event_dates)} unique dates...")
+    session.load_existing(event_dates)
+    print(f"Found {len(session.existing)} existing events in calendar "
+          f"({session.list_requests} list requests)")
+
+    session.upsert(events)
+    session.report()
+    return session
@@ -0,0 +1,190 @@
+"""
+Near-duplicate detection across sources with MinHash and LSH.
+
+Titles are normalised (case, accents, punctuation) and cut into character
+shingles. Bilingual titles such as "Titre FR / Title EN" are indexed under the
+full title and under each half, so they match either language on its own.
+MinHash signatures of those shingle sets are split into LSH bands and bucketed
+together with the event's start date. Only events sharing a bucket are ever
+compared, which keeps the work roughly linear in the number of events.
+
+Candidates are confirmed on exact Jaccard similarity: titles alone, or
+moderately similar titles backed by similar descriptions. Confirmed
+duplicates are merged with union-find, and each cluster is represented by its
+richest record.
+"""
+from __future__ import annotations
+import hashlib, random, re, unicodedata, zlib
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, FrozenSet, List, Tuple
+from .models import Event
+
+SHINGLE_SIZE = 3        # characters per title shingle
+NUM_PERM = 32           # MinHash permutations
+BANDS = 16              # LSH bands of NUM_PERM // BANDS rows; ~99% of pairs at 0.5 become candidates
+TITLE_THRESHOLD = 0.8   # title similarity that makes a duplicate on its own
+TITLE_FLOOR = 0.5       # lower title similarity accepted when descriptions agree
+DESCRIPTION_THRESHOLD = 0.5
+
+_PRIME = (1 << 61) - 1
+_BILINGUAL_SPLIT = re.compile(r"\s+/\s+")
+_NON_WORD = re.compile(r"[\W_]+")
+_NUMBER = re.compile(r"\d+")
+
+def hash_title(title: str, date: datetime) -> str:
+    """Create a unique hash for an event based on its title and date."""
+    # Normalize title: lowercase, remove special chars
+    normalized = ''.join(c.lower() for c in title if c.isalnum() or c.isspace())
+    # Use date in YYYY-MM-DD format
+    date_str = date.strftime('%Y-%m-%d')
+    # Create hash
+    return hashlib.md5(f"{normalized}|{date_str}".encode()).hexdigest()
+
+def normalize(text: str) -> str:
+    """Lowercase, strip accents and collapse punctuation to single spaces."""
+    text = unicodedata.normalize("NFKD", (text or "").lower())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return " ".join(_NON_WORD.sub(" ", text).split())
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> FrozenSet[str]:
+    """Character shingles of the normalised text."""
+    text = normalize(text)
+    if len(text) <= size:
+        return frozenset([text]) if text else frozenset()
+    return frozenset(text[i:i + size] for i in range(len(text) - size + 1))
+
+def word_shingles(text: str) -> FrozenSet[Tuple[str, str]]:
+    """Word bigrams of the normalised text, used for descriptions."""
+    words = normalize(text).split()
+    return frozenset(zip(words, words[1:])) if len(words) > 1 else frozenset((w, "") for w in words)
+
+def title_variants(title: str) -> List[str]:
+    """The title plus each half of a bilingual "FR / EN" title."""
+    parts = [p for p in _BILINGUAL_SPLIT.split(title or "") if p.strip()]
+    return [title] + parts if len(parts) > 1 else [title]
+
+def jaccard(a: FrozenSet, b: FrozenSet) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+def richness(event: Event) -> Tuple:
+    """Sort key for the record kept from a cluster: most information first."""
+    return (
+        bool((event.description or "").strip()),
+        bool(event.url),
+        len((event.description or "").strip()) + len(event.location or ""),
+        event.popularity or 0.0,
+    )
+
+class MinHasher:
+    """MinHash signatures from universal hashes ``(a * x + b) mod p``.
+
+    Shingles repeat a lot across titles, so each shingle's hash values are
+    computed once and a signature is the element-wise minimum of those rows.
+    """
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = 1):
+        rng = random.Random(seed)
+        self._perms = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)]
+        self._rows: Dict[str, Tuple[int, ...]] = {}
+
+    def _row(self, shingle: str) -> Tuple[int, ...]:
+        row = self._rows.get(shingle)
+        if row is None:
+            h = zlib.crc32(shingle.encode())
+            row = self._rows[shingle] = tuple((a * h + b) % _PRIME for a, b in self._perms)
+        return row
+
+    def signature(self, shingle_set: FrozenSet[str]) -> Tuple[int, ...]:
+        return tuple(map(min, zip(*map(self._row, shingle_set))))
+
+@dataclass
+class _Entry:
+    event: Event
+    titles: List[FrozenSet[str]]
+    description: FrozenSet[Tuple[str, str]]
+    numbers: FrozenSet[str]
+
+class NearDuplicateIndex:
+    """
+    Incremental near-duplicate clustering.
+
+    ``add`` indexes one event and returns the events that stopped representing
+    a cluster because of it: the new event itself when an existing record is
+    richer, or the previous representatives it displaced or merged.
+    """
+
+    def __init__(self, num_perm: int = NUM_PERM, bands: int = BANDS):
+        self.rows = num_perm // bands
+        self.bands = bands
+        self._hasher = MinHasher(num_perm)
+        self._buckets: Dict[Tuple, List[int]] = {}
+        self._entries: List[_Entry] = []
+        self._parent: List[int] = []
+        self._representative: Dict[int, Event] = {}
+
+    def _find(self, i: int) -> int:
+        while self._parent[i] != i:
+            self._parent[i] = self._parent[self._parent[i]]
+            i = self._parent[i]
+        return i
+
+    def _bucket_keys(self, event: Event, titles: List[FrozenSet[str]]) -> List[Tuple]:
+        day = event.start_dt.date()
+        keys = set()
+        for title in titles:
+            if not title:
+                continue
+            signature = self._hasher.signature(title)
+            for band in range(self.bands):
+                keys.add((day, band, signature[band * self.rows:(band + 1) * self.rows]))
+        return list(keys)
+
+    def is_duplicate(self, a: _Entry, b: _Entry) -> bool:
+        # "Session 1" and "Session 2" of a series are different events
+        if a.numbers and b.numbers and a.numbers != b.numbers:
+            return False
+        title_sim = max(jaccard(x, y) for x in a.titles for y in b.titles)
+        if title_sim >= TITLE_THRESHOLD:
+            return True
+        return title_sim >= TITLE_FLOOR and jaccard(a.description, b.description) >= DESCRIPTION_THRESHOLD
+
+    def add(self, event: Event) -> List[Event]:
+        entry = _Entry(
+            event=event,
+            titles=[shingles(t) for t in title_variants(event.title)],
+            description=word_shingles(event.description),
+            numbers=frozenset(_NUMBER.findall(event.title or "")),
+        )
+        index = len(self._entries)
+        self._entries.append(entry)
+        self._parent.append(index)
+
+        candidates = set()
+        for key in self._bucket_keys(event, entry.titles):
+            bucket = self._buckets.setdefault(key, [])
+            candidates.update(bucket)
+            bucket.append(index)
+
+        roots = {self._find(i) for i in candidates if self.is_duplicate(entry, self._entries[i])}
+        if not roots:
+            self._representative[index] = event
+            return []
+
+        previous = [self._representative.pop(root) for root in sorted(roots)]
+        for root in roots:
+            self._parent[root] = index
+        # max() keeps the earliest of equally rich records
+        keep = max(previous + [event], key=richness)
+        self._representative[index] = keep
+        return [e for e in previous + [event] if e is not keep]
+
+def merge_near_duplicates(events: List[Event]) -> List[Event]:
+    """Keep the richest record of each near-duplicate cluster, in input order."""
+    index = NearDuplicateIndex()
+    dropped = set()
+    for event in events:
+        dropped.update(id(e) for e in index.add(event))
+    return [e for e in events if id(e) not in dropped]
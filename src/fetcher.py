@@ -0,0 +1,98 @@
+"""
+Asyncio fetch engine: runs every source under one shared wall-clock budget.
+
+A source is any zero-argument callable returning an async iterator of event
+batches. Batches are kept as soon as they arrive, so a source that is cancelled
+when the budget expires still contributes whatever it yielded before that.
+With a ``sink`` the batches are handed on as they arrive instead of being kept.
+"""
+from __future__ import annotations
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, Sequence, Tuple
+from .models import Event
+
+SourceStream = Callable[[], AsyncIterator[List[Event]]]
+BatchSink = Callable[[str, List[Event]], Awaitable[None]]
+
+@dataclass
+class SourceResult:
+    """Outcome of a single source run by the engine."""
+    name: str
+    events: List[Event] = field(default_factory=list)
+    status: str = "pending"   # ok | timeout | error
+    error: Optional[str] = None
+    elapsed: float = 0.0
+    count: int = 0            # events yielded, including those handed to a sink
+
+async def _drain(
+    stream: SourceStream,
+    result: SourceResult,
+    deadline: Optional[float],
+    sink: Optional[BatchSink] = None,
+) -> None:
+    start = time.monotonic()
+    try:
+        async with asyncio.timeout_at(deadline):
+            async for batch in stream():
+                result.count += len(batch)
+                if sink is None:
+                    result.events.extend(batch)
+                else:
+                    await sink(result.name, batch)
+        result.status = "ok"
+    except TimeoutError:
+        result.status = "timeout"
+    except asyncio.CancelledError:
+        result.status = "timeout"
+        raise
+    except Exception as e:
+        result.status = "error"
+        result.error = str(e)
+    finally:
+        result.elapsed = time.monotonic() - start
+
+async def fetch_all(
+    sources: Sequence[Tuple[str, SourceStream, Optional[float]]],
+    budget: float,
+    sink: Optional[BatchSink] = None,
+) -> List[SourceResult]:
+    """
+    Run all sources concurrently and stop at the shared deadline.
+
+    Args:
+        sources: (name, stream, per-source deadline in seconds or None) tuples
+        budget: Global wall-clock budget in seconds
+        sink: Optional coroutine receiving (source name, batch) as batches
+            arrive; a slow sink holds back the source that produced the batch
+
+    Returns:
+        One SourceResult per source, in input order, including partial results
+        of sources that were cancelled when the budget expired
+    """
+    loop = asyncio.get_running_loop()
+    results = [SourceResult(name) for name, _, _ in sources]
+    start = loop.time()
+    tasks = [
+        asyncio.create_task(
+            _drain(stream, result, None if limit is None else start + limit, sink),
+            name=name,
+        )
+        for (name, stream, limit), result in zip(sources, results)
+    ]
+    if not tasks:
+        return results
+
+    _, pending = await asyncio.wait(tasks, timeout=budget)
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+    return results
+
+def run(
+    sources: Sequence[Tuple[str, SourceStream, Optional[float]]],
+    budget: float,
+) -> List[SourceResult]:
+    """Synchronous entry point for :func:`fetch_all`."""
+    return asyncio.run(fetch_all(sources, budget))
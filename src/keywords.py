@@ -0,0 +1,173 @@
+"""
+Multi-keyword matching for the ranker.
+
+``KeywordMatcher`` compiles a keyword → weight map into an Aho–Corasick
+automaton once; each text is then scanned a single time, whatever the number
+of keywords. Matching is case-insensitive substring matching, exactly like
+``keyword.lower() in text.lower()``; with ``word_boundary=True`` a keyword
+only counts when it is not part of a longer word.
+
+``load_profile`` parses, validates and compiles ``keywords.yaml`` once and
+reuses the result until the file changes on disk.
+"""
+from __future__ import annotations
+import os
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Tuple
+import yaml
+
+KEYWORDS_PATH = Path(__file__).parent / "keywords.yaml"
+
+DEFAULT_KEYWORDS = {
+    "music": 1.0,
+    "concert": 1.0,
+    "food": 0.9,
+    "improv": 0.8,
+    "theatre": 0.8,
+}
+
+class KeywordMatcher:
+    """Aho–Corasick automaton returning the highest weight among matched keywords."""
+
+    def __init__(self, kw_map: Mapping[str, float], word_boundary: bool = False):
+        self.weights: Dict[str, float] = dict(kw_map)
+        self.word_boundary = word_boundary
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # (keyword length, weight) pairs ending at each state, fail chain included
+        self._out: List[List[Tuple[int, float]]] = [[]]
+        # highest weight ending at each state, fail chain included
+        self._best: List[Optional[float]] = [None]
+        self._empty: Optional[float] = None  # weight of "" which matches every text
+        self._top: Optional[float] = None
+
+        for keyword, weight in self.weights.items():
+            pattern = str(keyword).lower()
+            if not pattern:
+                self._empty = weight if self._empty is None else max(self._empty, weight)
+                continue
+            state = 0
+            for ch in pattern:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                    self._best.append(None)
+                state = nxt
+            self._out[state].append((len(pattern), weight))
+            self._best[state] = _max(self._best[state], weight)
+            self._top = _max(self._top, weight)
+        self._link()
+
+    def _link(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+                self._best[nxt] = _max(self._best[nxt], self._best[self._fail[nxt]])
+
+    def match(self, text: str) -> Optional[float]:
+        """Highest weight among keywords found in ``text``, or None if none match."""
+        text = text.lower()
+        found = self._empty
+        if found is not None and found == _max(found, self._top):
+            return found
+        goto, fail, out, best = self._goto, self._fail, self._out, self._best
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if best[state] is None:
+                continue
+            if self.word_boundary:
+                after = i + 1 < len(text) and text[i + 1].isalnum()
+                if after:
+                    continue
+                for length, weight in out[state]:
+                    start = i - length + 1
+                    if start == 0 or not text[start - 1].isalnum():
+                        found = _max(found, weight)
+            else:
+                found = _max(found, best[state])
+            if found == self._top:
+                break  # nothing can beat the heaviest keyword
+        return found
+
+    def score(self, text: str) -> float:
+        """Keyword score of a text: the best matched weight, 0.0 without a match."""
+        found = self.match(text)
+        return found if found is not None else 0.0
+
+def _max(a: Optional[float], b: Optional[float]) -> Optional[float]:
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return a if a >= b else b
+
+@dataclass(frozen=True)
+class KeywordProfile:
+    """Validated keyword weights with their compiled matcher."""
+    path: Path
+    stamp: Optional[Tuple[int, int]]   # (mtime_ns, size) of the file, None for the defaults
+    weights: Mapping[str, float]
+    matcher: KeywordMatcher
+
+_profiles: Dict[Tuple[str, bool], KeywordProfile] = {}
+
+def _stamp(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+def validate_weights(data, source: str = "keywords") -> Dict[str, float]:
+    """Check that keywords map to weights between 0 and 1; raise ValueError otherwise."""
+    if not isinstance(data, Mapping):
+        raise ValueError(f"{source}: expected a mapping of keyword to weight, got {type(data).__name__}")
+    weights = {}
+    for keyword, weight in data.items():
+        if isinstance(weight, bool) or not isinstance(weight, (int, float)):
+            raise ValueError(f"{source}: weight for {keyword!r} must be a number, got {weight!r}")
+        if not 0.0 <= weight <= 1.0:
+            raise ValueError(f"{source}: weight for {keyword!r} must be between 0.0 and 1.0, got {weight}")
+        weights[str(keyword)] = float(weight)
+    return weights
+
+def load_profile(path: Optional[Path] = None, word_boundary: bool = False) -> KeywordProfile:
+    """
+    Keyword profile for ``path`` (``keywords.yaml`` by default).
+
+    The parsed and compiled profile is cached on the file's modification time
+    and size, so repeated calls cost a ``stat`` and edits are picked up on the
+    next call. Without the file, DEFAULT_KEYWORDS are used.
+    """
+    path = Path(path or KEYWORDS_PATH)
+    stamp = _stamp(path)
+    key = (str(path), word_boundary)
+    cached = _profiles.get(key)
+    if cached is not None and cached.stamp == stamp:
+        return cached
+
+    if stamp is None:
+        weights = dict(DEFAULT_KEYWORDS)
+    else:
+        with open(path, "r") as f:
+            weights = validate_weights(yaml.safe_load(f), str(path))
+    profile = KeywordProfile(path, stamp, weights, KeywordMatcher(weights, word_boundary))
+    _profiles[key] = profile
+    return profile
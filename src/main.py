@@ -5,17 +5,74 @@ import os
 import src.aggregator as aggregator
 import src.calendar_client as calendar_client
 from datetime import datetime
-from .aggregator import pull_all
-from .ranker import rank_and_filter
-from .calendar_client import sync
+from typing import Dict, List, Optional, Tuple
+from .aggregator import deduplicate, plan_sync, published_key, pull_all, record_published, restore_published
+from .keywords import load_profile
+from .models import Event
+from .ranker import rank_and_filter, ranking_fingerprint
+from .calendar_client import SyncSession, sync
+from .sources import commit_reddit_cursors
+from .snapshot import default_snapshot_path, load_events, read_header, save_snapshot
+from .utils.http import http_stats
+from .utils.published import PublishedIndex, get_published_index
 
 T0 = time.time()
 def log(msg: str): print(f"[{time.time()-T0:6.1f}s] {msg}", flush=True)
 
+def rank(events: List[Event], index: PublishedIndex, engine: str) -> Tuple[List[Event], Dict, str]:
+    """Deduplicate and rank events, reusing the scores of those published unchanged with the current weights.
+
+    Exact and near-duplicates are merged first, as the pipeline does. Returns the ranked events, the published records of unchanged events and
+    the ranking fingerprint.
+    """
+    profile = load_profile()
+    ranking = ranking_fingerprint(profile.weights)
+    events = deduplicate(events)
+    unchanged = restore_published(events, index, ranking)
+    ranked = rank_and_filter(events, profile.matcher, reuse_scores=True, engine=engine)
+    return ranked, unchanged, ranking
+
+def write_snapshot(events: List[Event], path: str, mode: str) -> None:
+    path = save_snapshot(events, path or default_snapshot_path(), meta={"mode": mode})
+    print(f"Saved {len(events)} events to snapshot {path}")
+
+def replay_snapshot(path: str, engine: str) -> None:
+    """Rank the events of a snapshot and print the calendar changes a sync would make."""
+    start_time = time.time()
+    header = read_header(path)
+    events = load_events(path)
+    for event in events:
+        event.score = None  # rank with the current weights, not those of the snapshot's run
+    print(f"[{time.time() - start_time:.3f}s] Loaded {len(events)} events from {path} "
+          f"(snapshot of {header['created']}, format v{header['version']})")
+
+    index = get_published_index()
+    ranked, unchanged, _ = rank(events, index, engine)
+    plan = plan_sync(ranked, index, unchanged)
+    print(f"[{time.time() - start_time:.3f}s] Ranked {len(ranked)} events: {len(plan.create)} to create, "
+          f"{len(plan.update)} to update, {len(plan.unchanged)} unchanged")
+    actions = {id(e): "create" for e in plan.create}
+    actions.update({id(e): "update" for e in plan.update})
+    for event in sorted(ranked, key=lambda e: e.start_dt):
+        print(f"  {actions.get(id(event), 'same'):>6} {event.start_dt:%Y-%m-%d %H:%M} "
+              f"{event.score:.3f} {event.source.value:<12} {event.title}")
+
 @click.command()
-def cli():
+@click.option('--pipeline', is_flag=True,
+              help="Stream events from each source through ranking into the calendar as they arrive.")
+@click.option('--engine', type=click.Choice(['greedy', 'optimal']), default='greedy', show_default=True,
+              help="Pick events greedily by score, or maximise each day's total score.")
+@click.option('--save-snapshot', 'snapshot_path', type=click.Path(dir_okay=False), is_flag=False, flag_value='',
+              help="Write the fetched events to a binary snapshot (default: a dated file under .cache/snapshots).")
+@click.option('--replay', type=click.Path(exists=True, dir_okay=False),
+              help="Rank a snapshot and show the calendar changes it would make, without fetching or syncing.")
+def cli(pipeline: bool, engine: str, snapshot_path: Optional[str], replay: Optional[str]):
     """Montréal Events Agent - Curates and publishes events to Google Calendar."""
     try:
+        if replay:
+            replay_snapshot(replay, engine)
+            return
+
         print("Starting event aggregator...")
         print(f"Using calendar ID: {os.getenv('GOOGLE_CALENDAR_ID')}")
         print(f"Service account file path: {os.getenv('GOOGLE_APPLICATION_CREDENTIALS')}")
@@ -29,23 +86,48 @@ def cli():
                         break
         
         start_time = time.time()
-        print(f"\n[{time.time() - start_time:.1f}s] Fetching events from all sources")
-        events = pull_all()
-        fetch_time = time.time()
-        print(f"[{fetch_time - start_time:.1f}s] Fetched {len(events)} total events")
-        
-        print(f"\n[{time.time() - start_time:.1f}s] Ranking events")
-        ranked = rank_and_filter(events)
-        rank_time = time.time()
-        print(f"[{rank_time - fetch_time:.1f}s] Ranked {len(ranked)} events")
-        
-        print(f"\n[{time.time() - start_time:.1f}s] Syncing to calendar")
-        sync(ranked)
-        sync_time = time.time()
-        print(f"[{sync_time - rank_time:.1f}s] Calendar sync complete")
+        if pipeline:
+            from .pipeline import run_pipeline
+            print(f"\n[{time.time() - start_time:.1f}s] Streaming events from all sources to calendar")
+            outcome = run_pipeline(SyncSession(), index=get_published_index(), engine=engine)
+            sync_time = time.time()
+            print(f"[{sync_time - start_time:.1f}s] Published {len(outcome.selected)} events")
+            if snapshot_path is not None:
+                write_snapshot([e for r in outcome.results for e in r.events], snapshot_path, "pipeline")
+        else:
+            print(f"\n[{time.time() - start_time:.1f}s] Fetching events from all sources")
+            events = pull_all()
+            fetch_time = time.time()
+            print(f"[{fetch_time - start_time:.1f}s] Fetched {len(events)} total events")
+            if snapshot_path is not None:
+                write_snapshot(events, snapshot_path, "batch")
+            
+            print(f"\n[{time.time() - start_time:.1f}s] Ranking events")
+            index = get_published_index()
+            ranked, unchanged, ranking = rank(events, index, engine)
+            rank_time = time.time()
+            print(f"[{rank_time - fetch_time:.1f}s] Ranked {len(ranked)} events")
+            
+            to_sync = [e for e in ranked if published_key(e) not in unchanged]
+            print(f"\n[{time.time() - start_time:.1f}s] Syncing to calendar "
+                  f"({len(ranked) - len(to_sync)} already published and unchanged)")
+            session = sync(to_sync)
+            calendar_ids = {r.source_id: r.calendar_id for r in unchanged.values() if r.calendar_id}
+            calendar_ids.update(session.synced)
+            record_published(index, ranked, calendar_ids, ranking)
+            if not session.error_count:
+                commit_reddit_cursors()
+            sync_time = time.time()
+            print(f"[{sync_time - rank_time:.1f}s] Calendar sync complete")
         
         print(f"\nTotal time: {sync_time - start_time:.1f}s")
         
+        print("\nHTTP usage by host:")
+        for host, stats in http_stats().items():
+            print(f"- {host}: {stats['requests']} requests over {stats['connections']} connections, "
+                  f"{stats['retries']} retries, {stats['errors']} errors, "
+                  f"avg {stats['avg_latency'] * 1000:.0f} ms, max {stats['max_latency'] * 1000:.0f} ms")
+        
     except Exception as e:
         log(f"Error: {e}")
         sys.exit(1)
@@ -1,10 +1,11 @@
 from __future__ import annotations
-from dataclasses import dataclass
-from datetime import datetime, timedelta
-from typing import Optional, List
+from dataclasses import dataclass, field, fields
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, Tuple
 from enum import Enum
+import hashlib, json
 import pytz
-from email.utils import parsedate_to_datetime
 
 # Montreal timezone
 MONTREAL_TZ = pytz.timezone('America/Montreal')
@@ -18,8 +19,97 @@ class EventSource(Enum):
     MTL_BLOG = "mtl_blog"
     GAZETTE = "gazette"
 
-@dataclass
-class Event:
+@lru_cache(maxsize=65536)
+def _montreal(dt: datetime) -> Tuple[datetime, float]:
+    if dt.tzinfo is None:
+        dt = MONTREAL_TZ.localize(dt)
+    else:
+        dt = dt.astimezone(MONTREAL_TZ)
+    return dt, dt.timestamp()
+
+def to_montreal(dt: datetime) -> datetime:
+    """Make a datetime timezone-aware in Montreal time (naive means Montreal local time).
+
+    Memoized with its epoch timestamp: events share a limited set of start
+    and end times, and pytz localization dominates event construction. Aware
+    datetimes are equal when they are the same instant, which maps to one
+    Montreal time, so the cache is exact; results are immutable and shared.
+    """
+    return _montreal(dt)[0]
+
+class _EventBehaviour:
+    """Methods shared by Event and FrozenEvent."""
+    __slots__ = ()
+
+    def __post_init__(self):
+        """Ensure all datetimes are timezone-aware and in Montreal time.
+
+        Epoch timestamps of both ends are stored alongside, for fast sorting
+        and comparisons; they are not updated if the datetimes are reassigned.
+        """
+        # object.__setattr__ so the same code serves the frozen variant
+        start_dt, start_ts = _montreal(self.start_dt)
+        end_dt, end_ts = _montreal(self.end_dt)
+        object.__setattr__(self, 'start_dt', start_dt)
+        object.__setattr__(self, 'end_dt', end_dt)
+        object.__setattr__(self, 'start_ts', start_ts)
+        object.__setattr__(self, 'end_ts', end_ts)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain JSON-serializable representation."""
+        return {
+            'title': self.title,
+            'description': self.description,
+            'url': self.url,
+            'start_dt': self.start_dt.isoformat(),
+            'end_dt': self.end_dt.isoformat(),
+            'location': self.location,
+            'popularity': self.popularity,
+            'source': self.source.value,
+            'source_id': self.source_id,
+            'is_all_day': self.is_all_day,
+            'score': self.score,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]):
+        """Inverse of :meth:`to_dict`."""
+        return cls(
+            title=data['title'],
+            description=data['description'],
+            url=data['url'],
+            start_dt=datetime.fromisoformat(data['start_dt']),
+            end_dt=datetime.fromisoformat(data['end_dt']),
+            location=data['location'],
+            popularity=data['popularity'],
+            source=EventSource(data['source']),
+            source_id=data['source_id'],
+            is_all_day=data.get('is_all_day', False),
+            score=data.get('score'),
+        )
+
+    def _init_fields(self) -> Dict[str, Any]:
+        return {f.name: getattr(self, f.name) for f in fields(self) if f.init}
+
+    def content_hash(self) -> str:
+        """Hash of everything written to the calendar (the score excluded)."""
+        data = self.to_dict()
+        del data['score']
+        return hashlib.sha256(json.dumps(data, sort_keys=True, ensure_ascii=False).encode()).hexdigest()
+
+    @property
+    def duration_hours(self) -> float:
+        """Returns the duration in hours."""
+        return (self.end_dt - self.start_dt).total_seconds() / 3600
+
+    @staticmethod
+    def parse_date(date_str: str) -> datetime:
+        """Parse date string and ensure timezone is set to Montreal (see ``src.dates``)."""
+        from .dates import parse_date
+        return parse_date(date_str)
+
+@dataclass(slots=True)
+class Event(_EventBehaviour):
     """Represents a single event with all its metadata."""
     title: str
     description: str
@@ -32,61 +122,30 @@ class Event:
     source_id: str
     is_all_day: bool = False
     score: float = None
-    
-    def __post_init__(self):
-        """Ensure all datetimes are timezone-aware and in Montreal time."""
-        montreal_tz = pytz.timezone('America/Montreal')
-        
-        # Handle start_dt
-        if self.start_dt.tzinfo is None:
-            self.start_dt = montreal_tz.localize(self.start_dt)
-        else:
-            self.start_dt = self.start_dt.astimezone(montreal_tz)
-            
-        # Handle end_dt
-        if self.end_dt.tzinfo is None:
-            self.end_dt = montreal_tz.localize(self.end_dt)
-        else:
-            self.end_dt = self.end_dt.astimezone(montreal_tz)
-        
-    @property
-    def duration_hours(self) -> float:
-        """Returns the duration in hours."""
-        return (self.end_dt - self.start_dt).total_seconds() / 3600
-        
-    @staticmethod
-    def parse_date(date_str: str) -> datetime:
-        """Parse date string and ensure timezone is set to Montreal."""
-        montreal_tz = pytz.timezone('America/Montreal')
-        
-        # Try parsing as RFC 2822 format (used by RSS feeds)
-        try:
-            dt = parsedate_to_datetime(date_str)
-            return dt.astimezone(montreal_tz)
-        except (ValueError, TypeError):
-            pass
-            
-        # Try parsing as ISO format
-        try:
-            dt = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-            if dt.tzinfo is None:
-                dt = dt.replace(tzinfo=pytz.UTC)
-            return dt.astimezone(montreal_tz)
-        except ValueError:
-            pass
-            
-        # Try common date formats
-        formats = [
-            '%Y-%m-%d',           # YYYY-MM-DD
-            '%Y-%m-%d %H:%M:%S',  # YYYY-MM-DD HH:MM:SS
-            '%d/%m/%Y %H:%M',     # DD/MM/YYYY HH:MM
-        ]
-        
-        for fmt in formats:
-            try:
-                dt = datetime.strptime(date_str, fmt)
-                return montreal_tz.localize(dt)
-            except ValueError:
-                continue
-                
-        raise ValueError(f"Could not parse date string: {date_str}") 
\ No newline at end of file
+    start_ts: float = field(init=False, repr=False, compare=False)
+    end_ts: float = field(init=False, repr=False, compare=False)
+
+    def freeze(self) -> FrozenEvent:
+        """Immutable, hashable copy."""
+        return FrozenEvent(**self._init_fields())
+
+@dataclass(slots=True, frozen=True)
+class FrozenEvent(_EventBehaviour):
+    """Immutable Event, usable as a dict key or set member."""
+    title: str
+    description: str
+    url: str
+    start_dt: datetime
+    end_dt: datetime
+    location: str
+    popularity: float
+    source: EventSource
+    source_id: str
+    is_all_day: bool = False
+    score: float = None
+    start_ts: float = field(init=False, repr=False, compare=False)
+    end_ts: float = field(init=False, repr=False, compare=False)
+
+    def thaw(self) -> Event:
+        """Mutable copy."""
+        return Event(**self._init_fields())
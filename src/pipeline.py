@@ -0,0 +1,202 @@
+"""
+Streaming execution mode: fetch → dedupe → rank → sync as concurrent stages.
+
+Each source's batches are deduplicated and ranked as soon as they arrive, and
+changes to the selection are written to the calendar while slower sources are
+still fetching, so a run takes about max(fetch, sync) instead of their sum.
+Stages are connected by bounded queues: a slow calendar holds back ranking,
+which holds back the sources, instead of events piling up in memory.
+
+Ranking stays equivalent to ``rank_and_filter`` on the deduplicated events.
+An event arriving later can displace one that was already selected; the
+displaced event is then retracted (deleted again if this run created it).
+"""
+from __future__ import annotations
+import asyncio
+from dataclasses import dataclass, field
+from datetime import date
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
+from . import fetcher
+from .aggregator import hash_title, published_key, record_published, report_results, restore_published
+from .dedupe import NearDuplicateIndex
+from .keywords import KeywordMatcher, load_profile
+from .models import Event
+from .ranker import MIN_SCORE, ranking_fingerprint, score_event, select
+from .sources import LatencyHistory, commit_reddit_cursors, enabled_sources, record_run, schedule
+from .utils.aio import run_blocking
+from .utils.published import PublishedIndex
+
+if TYPE_CHECKING:
+    from .calendar_client import SyncSession
+
+QUEUE_SIZE = 8  # batches (or selection changes) buffered between two stages
+
+Changes = Tuple[List[Event], List[Event]]  # (added, retracted)
+
+class IncrementalRanker:
+    """
+    Deduplicate, score and select events as they arrive.
+
+    A near-duplicate richer than the record already kept replaces it.
+    Selection is per day, so only the days touched by a batch are selected
+    again; ``add`` returns how the overall selection changed.
+    """
+
+    def __init__(self, kw_map: Optional[Dict[str, float]] = None, engine: Optional[str] = None):
+        self.engine = engine
+        if kw_map is None:
+            profile = load_profile()
+            self.kw_map, self._matcher = profile.weights, profile.matcher
+        else:
+            self.kw_map, self._matcher = kw_map, KeywordMatcher(kw_map)
+        self._seen: Set[str] = set()
+        self._near = NearDuplicateIndex()
+        self._candidates: Dict[date, List[Event]] = {}
+        self._selected: Dict[date, List[Event]] = {}
+
+    def add(self, events: List[Event]) -> Changes:
+        touched = set()
+        for e in events:
+            event_hash = hash_title(e.title, e.start_dt)
+            if event_hash in self._seen:
+                continue
+            self._seen.add(event_hash)
+            dropped = self._near.add(e)
+            for old in dropped:
+                day = old.start_dt.date()
+                if old is not e and day in self._candidates:
+                    self._candidates[day] = [c for c in self._candidates[day] if c is not old]
+                    touched.add(day)
+            if any(old is e for old in dropped):
+                continue
+            if e.score is None:  # scores restored from the published index are kept
+                e.score = score_event(e, self._matcher)
+            if e.score < MIN_SCORE:
+                continue
+            day = e.start_dt.date()
+            self._candidates.setdefault(day, []).append(e)
+            touched.add(day)
+
+        added, retracted = [], []
+        for day in sorted(touched):
+            before = self._selected.get(day, [])
+            after = select(self._candidates[day], engine=self.engine)
+            before_ids = {id(e) for e in before}
+            after_ids = {id(e) for e in after}
+            added.extend(e for e in after if id(e) not in before_ids)
+            retracted.extend(e for e in before if id(e) not in after_ids)
+            self._selected[day] = after
+        return added, retracted
+
+    def selected(self) -> List[Event]:
+        """Current selection, in the order ``rank_and_filter`` returns it."""
+        return sorted((e for day in self._selected.values() for e in day),
+                      key=lambda x: (-x.score, x.start_dt))
+
+@dataclass
+class PipelineResult:
+    results: List[fetcher.SourceResult] = field(default_factory=list)
+    selected: List[Event] = field(default_factory=list)
+
+def _coalesce(pending: List[Changes]) -> Changes:
+    """Net out consecutive changes so an event added then retracted is never written."""
+    upserts: Dict[int, Event] = {}
+    deletes: Dict[int, Event] = {}
+    for added, retracted in pending:
+        for e in retracted:
+            if upserts.pop(id(e), None) is None:
+                deletes[id(e)] = e
+        for e in added:
+            deletes.pop(id(e), None)
+            upserts[id(e)] = e
+    return list(upserts.values()), list(deletes.values())
+
+async def run_stages(
+    sources,
+    budget: float,
+    session: SyncSession,
+    ranker: Optional[IncrementalRanker] = None,
+    queue_size: int = QUEUE_SIZE,
+    index: Optional[PublishedIndex] = None,
+) -> PipelineResult:
+    """
+    Run fetch, rank and sync concurrently until every source is done or out of time.
+
+    With a published index, events published before and unchanged since keep
+    their stored score and are not written again.
+    """
+    ranker = ranker or IncrementalRanker()
+    ranking = ranking_fingerprint(ranker.kw_map)
+    unchanged: Set[Tuple[str, str]] = set()
+    batches: asyncio.Queue = asyncio.Queue(queue_size)
+    changes: asyncio.Queue = asyncio.Queue(queue_size)
+    outcome = PipelineResult()
+
+    async def to_ranker(name: str, batch: List[Event]) -> None:
+        await batches.put(batch)
+
+    async def fetch() -> None:
+        outcome.results = await fetcher.fetch_all(sources, budget, sink=to_ranker)
+        await batches.put(None)
+
+    async def rank() -> None:
+        while (batch := await batches.get()) is not None:
+            if index is not None:
+                unchanged.update(restore_published(batch, index, ranking))
+            added, retracted = ranker.add(batch)
+            if added or retracted:
+                await changes.put((added, retracted))
+        await changes.put(None)
+
+    async def sync() -> None:
+        done = False
+        while not done:
+            pending = [await changes.get()]
+            while not changes.empty():
+                pending.append(changes.get_nowait())
+            if pending[-1] is None:
+                done = True
+                pending.pop()
+            upserts, deletes = _coalesce(pending)
+            upserts = [e for e in upserts if published_key(e) not in unchanged]
+            if deletes:
+                deleted = await run_blocking(session.delete, deletes)
+                if index is not None and deleted:
+                    index.forget(map(published_key, deleted))
+            if upserts:
+                await run_blocking(session.upsert, upserts)
+                if index is not None:
+                    record_published(index, upserts, session.synced, ranking)
+
+    async with asyncio.TaskGroup() as group:
+        group.create_task(fetch())
+        group.create_task(rank())
+        group.create_task(sync())
+
+    outcome.selected = ranker.selected()
+    return outcome
+
+def run_pipeline(
+    session: SyncSession,
+    budget: Optional[float] = None,
+    index: Optional[PublishedIndex] = None,
+    engine: Optional[str] = None,
+) -> PipelineResult:
+    """
+    Fetch, rank and sync in one streaming pass.
+
+    Sources are scheduled exactly as in ``pull_all`` and their latencies are
+    recorded the same way.
+    """
+    history = LatencyHistory.load()
+    plan, planned_budget = schedule(enabled_sources(), history)
+    outcome = asyncio.run(run_stages(
+        plan, planned_budget if budget is None else budget, session,
+        ranker=IncrementalRanker(engine=engine), index=index,
+    ))
+    record_run(outcome.results, history)
+    report_results(outcome.results)
+    session.report()
+    if not session.error_count:
+        commit_reddit_cursors()
+    return outcome
@@ -1,19 +1,16 @@
-from typing import List, Dict
-from datetime import datetime
-import yaml
-from pathlib import Path
+from typing import List, Dict, Optional, Tuple, Union
+import hashlib
+import json
+import numpy as np
+from .keywords import DEFAULT_KEYWORDS, KeywordMatcher, load_profile
 from .models import Event, EventSource
-
-DEFAULT_KEYWORDS = {
-    "music": 1.0,
-    "concert": 1.0,
-    "food": 0.9,
-    "improv": 0.8,
-    "theatre": 0.8,
-}
+from .scheduling import ENGINES, SortKey
 
 MAX_PER_DAY = 5
 MAX_PARALLEL = 3
+MIN_SCORE = 0.2
+SCORING_VERSION = 1  # bump whenever the scoring formula changes, so stored scores are recomputed
+ENGINE = "greedy"  # or "optimal": best total score per day under the same limits
 
 # Source priority weights
 SOURCE_WEIGHTS = {
@@ -27,29 +24,38 @@ SOURCE_WEIGHTS = {
 
 def load_keywords() -> Dict[str, float]:
     """Load keywords from YAML file or return defaults."""
-    try:
-        with open(Path(__file__).parent / "keywords.yaml", "r") as f:
-            return yaml.safe_load(f)
-    except FileNotFoundError:
-        return DEFAULT_KEYWORDS
+    return dict(load_profile().weights)
 
-def score_event(event: Event, kw_map: Dict[str, float]) -> float:
-    """Calculate a comprehensive score for an event.
-    Score is based on source priority, keyword matches, popularity, and language preference.
-    """
+def ranking_fingerprint(kw_map: Dict[str, float]) -> str:
+    """Hash of the weights scores depend on; stored scores are stale once it changes."""
+    weights = {
+        "version": SCORING_VERSION,
+        "keywords": sorted(kw_map.items()),
+        "sources": sorted((s.value, w) for s, w in SOURCE_WEIGHTS.items()),
+        "features": list(zip(FEATURES, FEATURE_WEIGHTS)),
+        "min_score": MIN_SCORE,
+    }
+    return hashlib.sha256(json.dumps(weights).encode()).hexdigest()[:16]
+
+# Score components, in the order of the feature matrix columns, and their weights:
+# - 30% source priority
+# - 25% keywords
+# - 25% language preference
+# - 10% popularity
+# - 10% duration
+FEATURES = ("source", "keywords", "language", "popularity", "duration")
+FEATURE_WEIGHTS = (0.3, 0.25, 0.25, 0.1, 0.1)
+
+def event_features(event: Event, matcher: KeywordMatcher) -> Tuple[float, float, float, float, float]:
+    """Score components of an event, in FEATURES order."""
     # Source priority component (0.0 to 1.0)
     source_weight = SOURCE_WEIGHTS.get(event.source, 0.5)
 
     # Keyword score (0.0 to 1.0)
-    def kw_match_score(text: str) -> float:
-        # Look for keywords in both title and description
-        matches = [kw_map[k] for k in kw_map if k.lower() in text.lower()]
-        return max(matches) if matches else 0.0
-
     # Check both title and description for keywords
     keyword_score = max(
-        kw_match_score(event.title),
-        kw_match_score(event.description)
+        matcher.score(event.title),
+        matcher.score(event.description)
     )
 
     # Popularity component (if available, otherwise 0)
@@ -92,58 +98,115 @@ def score_event(event: Event, kw_map: Dict[str, float]) -> float:
         if "/" in event.title:
             language_component = max(language_component, 0.6)
 
-    # Combine components with new weights:
-    # - 30% source priority
-    # - 25% keywords
-    # - 25% language preference
-    # - 10% popularity
-    # - 10% duration
+    return source_weight, keyword_score, language_component, popularity_component, duration_component
+
+def score_event(event: Event, kw_map: Union[Dict[str, float], KeywordMatcher]) -> float:
+    """Calculate a comprehensive score for an event.
+    Score is based on source priority, keyword matches, popularity, and language preference.
+    Pass a compiled KeywordMatcher when scoring many events with the same keywords.
+    """
+    matcher = kw_map if isinstance(kw_map, KeywordMatcher) else KeywordMatcher(kw_map)
+    source_weight, keyword_score, language_component, popularity_component, duration_component = \
+        event_features(event, matcher)
+    w_source, w_keywords, w_language, w_popularity, w_duration = FEATURE_WEIGHTS
+
     score = (
-        (0.3 * source_weight) +
-        (0.25 * keyword_score) +
-        (0.25 * language_component) +
-        (0.1 * popularity_component) +
-        (0.1 * duration_component)
+        (w_source * source_weight) +
+        (w_keywords * keyword_score) +
+        (w_language * language_component) +
+        (w_popularity * popularity_component) +
+        (w_duration * duration_component)
     )
     
     return score
 
-def rank_and_filter(events: List[Event], kw_map: Dict[str, float] = None) -> List[Event]:
+def feature_matrix(events: List[Event], matcher: KeywordMatcher) -> np.ndarray:
+    """(len(events), len(FEATURES)) float64 matrix of score components."""
+    matrix = np.zeros((len(events), len(FEATURES)), dtype=np.float64)
+    for i, event in enumerate(events):
+        matrix[i] = event_features(event, matcher)
+    return matrix
+
+def score_batch(events: List[Event], kw_map: Union[Dict[str, float], KeywordMatcher]) -> np.ndarray:
+    """
+    Score many events at once and store each score on its event.
+
+    The weighted sum runs column by column in the same order as score_event,
+    so both give bit-identical scores.
+    """
+    matcher = kw_map if isinstance(kw_map, KeywordMatcher) else KeywordMatcher(kw_map)
+    features = feature_matrix(events, matcher)
+    w_source, w_keywords, w_language, w_popularity, w_duration = FEATURE_WEIGHTS
+    scores = (
+        (w_source * features[:, 0]) +
+        (w_keywords * features[:, 1]) +
+        (w_language * features[:, 2]) +
+        (w_popularity * features[:, 3]) +
+        (w_duration * features[:, 4])
+    )
+    for event, score in zip(events, scores.tolist()):
+        event.score = score
+    return scores
+
+def rank_and_filter(
+    events: List[Event],
+    kw_map: Union[Dict[str, float], KeywordMatcher] = None,
+    reuse_scores: bool = False,
+    max_per_day: Optional[int] = None,
+    max_parallel: Optional[int] = None,
+    key: Optional[SortKey] = None,
+    engine: Optional[str] = None,
+) -> List[Event]:
     """
     Rank and filter events based on source priority, keywords, popularity, and scheduling constraints.
     
     Args:
         events: List of events to rank and filter
-        kw_map: Optional keyword to weight mapping. If None, loads from keywords.yaml
+        kw_map: Optional keyword to weight mapping or compiled KeywordMatcher.
+            If None, uses the cached profile from keywords.yaml
+        reuse_scores: Keep scores already set on events (e.g. restored from the
+            published index) instead of scoring them again
+        max_per_day, max_parallel: Scheduling limits, MAX_PER_DAY and MAX_PARALLEL by default
+        key: Sort key deciding which events are considered first
+        engine: "greedy" (default) or "optimal", see select()
         
     Returns:
         Filtered list of events that meet the scheduling constraints and minimum score
     """
     if kw_map is None:
-        kw_map = load_keywords()
+        kw_map = load_profile().matcher
+    matcher = kw_map if isinstance(kw_map, KeywordMatcher) else KeywordMatcher(kw_map)
         
+    score_batch([e for e in events if not (reuse_scores and e.score is not None)], matcher)
     scored_events = []
     for e in events:
-        e.score = score_event(e, kw_map)
-        if e.score >= 0.2: # Filter out events below a certain score
+        if e.score >= MIN_SCORE: # Filter out events below a certain score
             scored_events.append(e)
 
-    # Group by day and apply scheduling constraints
-    out = []
-    by_day = {}
-    
-    # Sort by score (descending) and start time (ascending)
-    for e in sorted(scored_events, key=lambda x: (-x.score, x.start_dt)):
-        day = e.start_dt.date()
-        by_day.setdefault(day, [])
-        
-        # Find overlapping events
-        active = [pe for pe in by_day[day]
-                 if not (e.end_dt <= pe.start_dt or e.start_dt >= pe.end_dt)]
-        
-        # Apply constraints
-        if len(by_day[day]) < MAX_PER_DAY and len(active) < MAX_PARALLEL:
-            by_day[day].append(e)
-            out.append(e)
-            
-    return out 
\ No newline at end of file
+    return select(scored_events, max_per_day, max_parallel, key, engine)
+
+def select(
+    scored_events: List[Event],
+    max_per_day: Optional[int] = None,
+    max_parallel: Optional[int] = None,
+    key: Optional[SortKey] = None,
+    engine: Optional[str] = None,
+) -> List[Event]:
+    """
+    Keep the best-scored events under the per-day and overlap limits.
+
+    Limits default to MAX_PER_DAY and MAX_PARALLEL; ``key`` defaults to score
+    descending, then start time. The "greedy" engine accepts events in ``key``
+    order; the "optimal" engine maximises each day's total score instead.
+    Days are independent, so selecting one day's events on their own gives
+    the same result for that day as selecting all events at once.
+    """
+    engine = engine or ENGINE
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown ranking engine {engine!r}; expected one of {sorted(ENGINES)}")
+    return ENGINES[engine](
+        scored_events,
+        MAX_PER_DAY if max_per_day is None else max_per_day,
+        MAX_PARALLEL if max_parallel is None else max_parallel,
+        key,
+    )
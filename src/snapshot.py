@@ -0,0 +1,122 @@
+"""
+Binary snapshots of fetched events, for replaying ranking without the network.
+
+A snapshot is one file holding an ``EventBatch``::
+
+    b"MTLSNAP\\0"  uint32 header length  uint32 format version
+    JSON header    (event count, metadata, dtype/offset/length of each array)
+    arrays         raw little-endian NumPy data, each aligned to 64 bytes
+
+The string pool is stored as two arrays, UTF-8 bytes and their offsets, plus
+a mask for ``None``. ``load_snapshot`` maps the file and wraps the arrays
+without copying them, so only the strings are decoded on load.
+"""
+from __future__ import annotations
+import json, mmap, os, struct
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from .batch import EventBatch, StringPool, ARRAY_COLUMNS
+from .models import Event
+from .utils.state import state_path
+
+MAGIC = b"MTLSNAP\0"
+SNAPSHOT_VERSION = 1
+ALIGN = 64
+_PREAMBLE = struct.Struct("<8sII")   # magic, header length, version
+
+def default_snapshot_path(day: Optional[date] = None) -> Path:
+    """Dated file under the state directory, so weekly runs keep a history."""
+    return state_path("snapshots", f"events-{(day or date.today()).isoformat()}.snap")
+
+def _string_arrays(strings: StringPool) -> Dict[str, np.ndarray]:
+    encoded = [(v or "").encode("utf-8") for v in strings.values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    return {
+        "string_data": np.frombuffer(b"".join(encoded), dtype=np.uint8),
+        "string_offsets": offsets,
+        "string_null": np.fromiter((v is None for v in strings.values), dtype=bool, count=len(encoded)),
+    }
+
+def _aligned(n: int) -> int:
+    return -(-n // ALIGN) * ALIGN
+
+def save_snapshot(events: Sequence[Event], path: Path, meta: Optional[Dict[str, Any]] = None) -> Path:
+    """Write ``events`` to ``path`` (atomically) and return the path."""
+    batch = EventBatch.from_events(events)
+    arrays = {name: np.ascontiguousarray(getattr(batch, name)) for name in ARRAY_COLUMNS}
+    arrays.update(_string_arrays(batch.strings))
+    arrays = {name: a.astype(a.dtype.newbyteorder("<"), copy=False) for name, a in arrays.items()}
+
+    columns, layout, offset = {}, [], 0
+    for name, array in arrays.items():
+        columns[name] = {"dtype": array.dtype.str, "offset": offset, "length": len(array)}
+        layout.append((offset, array))
+        offset = _aligned(offset + array.nbytes)
+    header = json.dumps({
+        "count": len(batch),
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "meta": meta or {},
+        "columns": columns,
+    }).encode("utf-8")
+    data_start = _aligned(_PREAMBLE.size + len(header))
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(_PREAMBLE.pack(MAGIC, len(header), SNAPSHOT_VERSION))
+        f.write(header)
+        for column_offset, array in layout:
+            f.seek(data_start + column_offset)
+            f.write(array.tobytes())
+        f.truncate(data_start + offset)
+    os.replace(tmp, path)
+    return path
+
+def read_header(path: Path) -> Dict[str, Any]:
+    """Header of a snapshot: count, creation time, metadata and array layout."""
+    with open(path, "rb") as f:
+        return _parse_header(f.read(_PREAMBLE.size), f.read, path)[0]
+
+def _parse_header(preamble: bytes, read, path) -> Tuple[Dict[str, Any], int]:
+    if len(preamble) < _PREAMBLE.size:
+        raise ValueError(f"{path}: not a snapshot (file too short)")
+    magic, length, version = _PREAMBLE.unpack(preamble)
+    if magic != MAGIC:
+        raise ValueError(f"{path}: not a snapshot (bad magic {magic!r})")
+    if version > SNAPSHOT_VERSION:
+        raise ValueError(f"{path}: snapshot version {version} is newer than supported ({SNAPSHOT_VERSION})")
+    header = json.loads(read(length).decode("utf-8"))
+    header["version"] = version
+    return header, _aligned(_PREAMBLE.size + length)
+
+def load_snapshot(path: Path) -> EventBatch:
+    """Map a snapshot back into an ``EventBatch`` whose arrays are read-only views of the file."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise ValueError(f"{path}: not a snapshot (empty file)")
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    header, data_start = _parse_header(buffer[:_PREAMBLE.size],
+                                       lambda n: buffer[_PREAMBLE.size:_PREAMBLE.size + n], path)
+    arrays = {
+        name: np.frombuffer(buffer, dtype=np.dtype(spec["dtype"]), count=spec["length"],
+                            offset=data_start + spec["offset"])
+        for name, spec in header["columns"].items()
+    }
+    missing = [name for name in ARRAY_COLUMNS if name not in arrays]
+    if missing:
+        raise ValueError(f"{path}: snapshot lacks columns {missing}")
+
+    data, offsets, null = arrays["string_data"], arrays["string_offsets"].tolist(), arrays["string_null"]
+    strings = StringPool()
+    raw = data.tobytes()
+    for i, is_null in enumerate(null.tolist()):
+        strings.code(None if is_null else raw[offsets[i]:offsets[i + 1]].decode("utf-8"))
+    return EventBatch(strings=strings, **{name: arrays[name] for name in ARRAY_COLUMNS})
+
+def load_events(path: Path) -> List[Event]:
+    """Events stored in a snapshot."""
+    return load_snapshot(path).to_events()
@@ -1,29 +1,45 @@
 """
 Event source modules for fetching events from various platforms.
+
+Importing this package registers every source with the registry; enable or
+disable them there (or with MTL_EVENTS_SOURCES), not in the aggregator.
 """
 
 from typing import List
-# from .eventbrite import get_eventbrite_events  # Disabled for now
-from .reddit import get_reddit_events
-from .rss_generic import get_rss_events
-from .ville_mtl import get_city_events
-# from .ticketmaster import get_ticketmaster_events # Removed as requested
+from .. import fetcher
+from .registry import (
+    LatencyHistory,
+    SourceSpec,
+    enabled_sources,
+    record_run,
+    register_source,
+    registered_sources,
+    schedule,
+)
+from .reddit import commit_reddit_cursors, get_reddit_events, stream_reddit_events
+from .rss_generic import get_rss_events, stream_rss_events
+from .ville_mtl import get_city_events, stream_city_events
+from . import _tourisme_disabled  # registered but disabled
 from ..models import Event
 
 __all__ = [
-    # 'get_eventbrite_events',  # Disabled for now
+    'commit_reddit_cursors',
     'get_reddit_events',
     'get_rss_events',
     'get_city_events',
-    # 'get_ticketmaster_events', # Removed as requested
+    'stream_reddit_events',
+    'stream_rss_events',
+    'stream_city_events',
+    'LatencyHistory',
+    'SourceSpec',
+    'enabled_sources',
+    'record_run',
+    'register_source',
+    'registered_sources',
+    'schedule',
 ]
 
 def get_all_events() -> List[Event]:
-    """Fetch events from all available sources."""
-    events = []
-    # events.extend(get_eventbrite_events())  # Disabled for now
-    events.extend(get_reddit_events())
-    events.extend(get_rss_events())
-    events.extend(get_city_events())
-    # events.extend(get_ticketmaster_events())  # Removed as requested
-    return events 
\ No newline at end of file
+    """Fetch events from all enabled sources."""
+    plan, budget = schedule(enabled_sources(), LatencyHistory.load())
+    return [event for result in fetcher.run(plan, budget) for event in result.events]
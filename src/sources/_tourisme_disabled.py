@@ -1,7 +1,9 @@
-from typing import List
+from typing import AsyncIterator, List
 from datetime import datetime, timedelta
-import requests
 from ..models import Event, EventSource
+from ..utils.http import request
+from ..utils.aio import run_blocking
+from .registry import register_source
 
 TOURISME_API_URL = "https://www.mtl.org/en/api/whats-on"
 
@@ -22,7 +24,7 @@ def get_tourisme_events() -> List[Event]:
         "limit": 100,
     }
 
-    response = requests.get(TOURISME_API_URL, params=params)
+    response = request("GET", TOURISME_API_URL, params=params, timeout=10)
     response.raise_for_status()
     data = response.json()
     events = []
@@ -48,4 +50,9 @@ def get_tourisme_events() -> List[Event]:
         except (KeyError, ValueError) as e:
             print(f"Error parsing Tourisme Montréal event {event_data.get('id', 'unknown')}: {e}")
             continue
-    return events 
\ No newline at end of file
+    return events 
+
+@register_source("tourisme_mtl", enabled=False, cost=5, deadline=30)
+async def stream_tourisme_events() -> AsyncIterator[List[Event]]:
+    """Async source protocol wrapper around get_tourisme_events."""
+    yield await run_blocking(get_tourisme_events)
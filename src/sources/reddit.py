@@ -1,20 +1,71 @@
-from typing import List, Optional
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+import json
 import requests
 import os
 import praw
 from ..models import Event, EventSource
+from ..utils.aio import run_blocking
+from ..utils.http import cached_get
+from ..utils.state import state_path
+from .registry import register_source
 
-PUBLIC_REDDIT_JSON_URL = "https://www.reddit.com/r/montreal/.json?limit=50"
+PUBLIC_REDDIT_LISTING_URL = "https://www.reddit.com/r/{subreddit}/{listing}.json"
 USER_AGENT_PUBLIC = "mtl-events-agent/0.1 (public fallback)"
 USER_AGENT_PRAW = "mtl-events-agent/0.1 (PRAW client)"
 
+# (subreddit, listing) pairs to scan. Only chronological listings ("new") keep
+# a since-last-seen cursor; others are re-read up to MAX_PAGES every run.
+REDDIT_LISTINGS: List[Tuple[str, str]] = [
+    ("montreal", "new"),
+]
+PAGE_LIMIT = 100   # posts per page, Reddit's maximum
+MAX_PAGES = 5
+
+# Cursors of the last streamed fetch, saved by commit_reddit_cursors once its events are synced
+_pending_cursors: Optional[Dict[str, Dict]] = None
+
+def _load_cursors() -> Dict[str, Dict]:
+    try:
+        with open(state_path("reddit_cursor.json")) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+def _save_cursors(cursors: Dict[str, Dict]) -> None:
+    path = state_path("reddit_cursor.json")
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        json.dump(cursors, f)
+    os.replace(tmp, path)
+
+def _already_seen(name: Optional[str], created_utc: Optional[float], cursor: Optional[Dict]) -> bool:
+    """True once a chronological listing reaches the newest post of the previous run."""
+    if not cursor:
+        return False
+    if name and name == cursor.get("name"):
+        return True
+    return created_utc is not None and created_utc <= cursor.get("created_utc", float("-inf"))
+
 def get_reddit_events() -> List[Event]:
     """
     Fetch events from Reddit's r/montreal subreddit.
     Uses PRAW if REDDIT_CLIENT_ID/SECRET are present, falls back to public JSON feed otherwise.
+    Listings are paged and read only down to the newest post seen by the previous run.
     Returns a list of Event objects.
     """
+    events, cursors = _fetch_reddit_events()
+    _save_cursors(cursors)
+    return events
+
+def _fetch_reddit_events() -> Tuple[List[Event], Dict[str, Dict]]:
+    """
+    Events newer than the saved cursors, and the cursors moved past them.
+
+    The cursors are only saved by the caller once the events are accepted, so
+    posts fetched by a run that is cancelled are read again by the next one.
+    """
     events = []
     keywords = ["festival", "event", "happening", "thing to do"]
 
@@ -29,22 +80,149 @@ def get_reddit_events() -> List[Event]:
                 client_secret=reddit_client_secret,
                 user_agent=USER_AGENT_PRAW,
             )
-            # Fetch top posts (adjust logic if you need specific search)
-            # For simplicity, let's fetch from the subreddit's hot posts for now
-            # You might want to use reddit.subreddit("montreal").search() for specific queries
-            for submission in reddit.subreddit("montreal").hot(limit=50):
-                title = submission.title
+            cursors = _load_cursors()
+            seen_ids = set()
+            for subreddit, listing in REDDIT_LISTINGS:
+                key = f"{subreddit}/{listing}"
+                cursor = cursors.get(key) if listing == "new" else None
+                newest = None
+                # PRAW follows the listing's `after` cursor itself
+                for submission in getattr(reddit.subreddit(subreddit), listing)(limit=PAGE_LIMIT * MAX_PAGES):
+                    if _already_seen(submission.name, submission.created_utc, cursor):
+                        break
+                    if newest is None:
+                        newest = {"name": submission.name, "created_utc": submission.created_utc}
+                    title = submission.title
+                    if submission.id in seen_ids or not any(keyword in title.lower() for keyword in keywords):
+                        continue
+                    seen_ids.add(submission.id)
+
+                    description = submission.selftext or submission.url
+                    url = submission.url
+
+                    # PRAW submissions have a creation timestamp, use it for start_dt if possible
+                    created_utc = datetime.fromtimestamp(submission.created_utc)
+                    start_dt = created_utc
+                    end_dt = start_dt + timedelta(hours=2)
+
+                    location = "Montreal"
+
+                    event = Event(
+                        title=title,
+                        description=description,
+                        start_dt=start_dt,
+                        end_dt=end_dt,
+                        location=location,
+                        url=url,
+                        source=EventSource.REDDIT,
+                        source_id=submission.id,
+                        is_all_day=False,
+                        popularity=submission.score / 100.0 if submission.score else 0.05 # Proxy popularity
+                    )
+                    events.append(event)
+                if newest and listing == "new":
+                    cursors[key] = newest
+        except Exception as e:
+            print(f"Error fetching Reddit events with PRAW: {e}")
+            # Fallback to public feed if PRAW fails
+            return _fetch_public_reddit_events(keywords)
+    else:
+        # Fallback to public JSON feed
+        return _fetch_public_reddit_events(keywords)
+
+    return events, cursors
+
+@register_source("reddit", cost=5, deadline=30)
+async def stream_reddit_events() -> AsyncIterator[List[Event]]:
+    """Async source protocol wrapper around get_reddit_events."""
+    global _pending_cursors
+    events, cursors = await run_blocking(_fetch_reddit_events)
+    yield events
+    # Resumed only once the batch was taken: a fetch cut off at its deadline keeps the old cursors
+    _pending_cursors = cursors
+
+def commit_reddit_cursors() -> None:
+    """Save the cursors of the last streamed fetch; call once its events are in the calendar.
+
+    Until then the previous cursors stay on disk, so posts of a run whose
+    ranking or sync fails are fetched again by the next one.
+    """
+    global _pending_cursors
+    if _pending_cursors is not None:
+        _save_cursors(_pending_cursors)
+        _pending_cursors = None
+
+def _fetch_listing(subreddit: str, listing: str, cursor: Optional[Dict]) -> Tuple[List[Dict], Optional[Dict]]:
+    """
+    Page through one public listing with its `after` cursor.
+
+    Stops at MAX_PAGES or at the first post already seen by the previous run.
+    Returns the posts and the cursor for the newest post read.
+    """
+    headers = {"User-Agent": USER_AGENT_PUBLIC}
+    base_url = PUBLIC_REDDIT_LISTING_URL.format(subreddit=subreddit, listing=listing)
+    posts = []
+    newest = None
+    after = None
+    for _ in range(MAX_PAGES):
+        url = f"{base_url}?limit={PAGE_LIMIT}" + (f"&after={after}" if after else "")
+        response = cached_get(url, headers=headers, timeout=8)
+        response.raise_for_status()  # Raise an exception for HTTP errors
+        data = response.json().get("data", {})
+
+        for post in data.get("children", []):
+            post_data = post.get("data", {})
+            if _already_seen(post_data.get("name"), post_data.get("created_utc"), cursor):
+                return posts, newest
+            if newest is None and post_data.get("name"):
+                newest = {"name": post_data["name"], "created_utc": post_data.get("created_utc")}
+            posts.append(post_data)
+
+        after = data.get("after")
+        if not after:
+            break
+    return posts, newest
+
+def _fetch_public_reddit_events(keywords: List[str]) -> Tuple[List[Event], Dict[str, Dict]]:
+    """Helper to fetch events from the public Reddit JSON listings, concurrently, with their cursors."""
+    public_events = []
+    cursors = _load_cursors()
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, len(REDDIT_LISTINGS))) as pool:
+            futures = {
+                f"{subreddit}/{listing}": pool.submit(
+                    _fetch_listing, subreddit, listing,
+                    cursors.get(f"{subreddit}/{listing}") if listing == "new" else None,
+                )
+                for subreddit, listing in REDDIT_LISTINGS
+            }
+            results = {key: future.result() for key, future in futures.items()}
+
+        seen_ids = set()
+        for key, (posts, newest) in results.items():
+            if newest and key.endswith("/new"):
+                cursors[key] = newest
+            for post_data in posts:
+                title = post_data.get("title", "")
+
                 if not any(keyword in title.lower() for keyword in keywords):
                     continue
 
-                description = submission.selftext or submission.url
-                url = submission.url
+                description = post_data.get("selftext", "").strip()
+                if not description:
+                    description = post_data.get("url", "").strip()
+
+                url = post_data.get("url", "")
+                if not url:
+                    continue
+
+                source_id = post_data.get("id", url)
+                if source_id in seen_ids:
+                    continue
+                seen_ids.add(source_id)
 
-                # PRAW submissions have a creation timestamp, use it for start_dt if possible
-                created_utc = datetime.fromtimestamp(submission.created_utc)
-                start_dt = created_utc
+                start_dt = datetime.now()
                 end_dt = start_dt + timedelta(hours=2)
-                
                 location = "Montreal"
 
                 event = Event(
@@ -55,67 +233,15 @@ def get_reddit_events() -> List[Event]:
                     location=location,
                     url=url,
                     source=EventSource.REDDIT,
-                    source_id=submission.id,
+                    source_id=source_id,
                     is_all_day=False,
-                    popularity=submission.score / 100.0 if submission.score else 0.05 # Proxy popularity
+                    popularity=0.1
                 )
-                events.append(event)
-        except Exception as e:
-            print(f"Error fetching Reddit events with PRAW: {e}")
-            # Fallback to public feed if PRAW fails
-            return _fetch_public_reddit_events(keywords)
-    else:
-        # Fallback to public JSON feed
-        return _fetch_public_reddit_events(keywords)
-        
-    return events
-
-def _fetch_public_reddit_events(keywords: List[str]) -> List[Event]:
-    """Helper to fetch events from the public Reddit JSON feed."""
-    public_events = []
-    headers = {"User-Agent": USER_AGENT_PUBLIC}
-    try:
-        response = requests.get(PUBLIC_REDDIT_JSON_URL, headers=headers, timeout=8)
-        response.raise_for_status()  # Raise an exception for HTTP errors
-        data = response.json()
-
-        posts = data.get("data", {}).get("children", [])
-        for post in posts:
-            post_data = post.get("data", {})
-            title = post_data.get("title", "")
-            
-            if not any(keyword in title.lower() for keyword in keywords):
-                continue
-
-            description = post_data.get("selftext", "").strip()
-            if not description:
-                description = post_data.get("url", "").strip()
-
-            url = post_data.get("url", "")
-            if not url:
-                continue
-
-            start_dt = datetime.now()
-            end_dt = start_dt + timedelta(hours=2)
-            location = "Montreal"
-
-            event = Event(
-                title=title,
-                description=description,
-                start_dt=start_dt,
-                end_dt=end_dt,
-                location=location,
-                url=url,
-                source=EventSource.REDDIT,
-                source_id=post_data.get("id", url),
-                is_all_day=False,
-                popularity=0.1
-            )
-            public_events.append(event)
+                public_events.append(event)
 
     except requests.exceptions.RequestException as e:
         print(f"Error fetching public Reddit events: {e}")
     except Exception as e:
         print(f"An unexpected error occurred while processing public Reddit events: {e}")
-        
-    return public_events 
\ No newline at end of file
+
+    return public_events, cursors
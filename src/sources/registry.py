@@ -0,0 +1,122 @@
+"""
+Source plugin registry and latency-aware scheduling.
+
+Each source registers its async stream with a name, an enabled flag, an
+expected cost and a default deadline. Observed latencies are kept across runs
+and used to start the slowest sources first and to size their deadlines, so
+a run takes about as long as its slowest source.
+"""
+from __future__ import annotations
+import json, os
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from ..fetcher import SourceResult, SourceStream
+from ..utils.state import state_path
+
+HISTORY_SAMPLES = 8     # latencies remembered per source
+HEADROOM = 1.5          # deadline = slowest recent latency * HEADROOM + SLACK
+SLACK = 2.0
+MIN_DEADLINE = 5.0
+MIN_DEADLINE_FRACTION = 0.5  # of the declared deadline: a fast history never shrinks it further
+
+@dataclass
+class SourceSpec:
+    name: str
+    stream: SourceStream
+    enabled: bool = True
+    cost: float = 5.0       # expected seconds until history exists
+    deadline: float = 30.0  # upper bound for this source's budget
+
+_REGISTRY: Dict[str, SourceSpec] = {}
+
+def register_source(
+    name: str,
+    *,
+    enabled: bool = True,
+    cost: float = 5.0,
+    deadline: float = 30.0,
+) -> Callable[[SourceStream], SourceStream]:
+    """Decorator registering an async source stream under ``name``."""
+    def decorator(stream: SourceStream) -> SourceStream:
+        _REGISTRY[name] = SourceSpec(name, stream, enabled, cost, deadline)
+        return stream
+    return decorator
+
+def registered_sources() -> List[SourceSpec]:
+    return list(_REGISTRY.values())
+
+def enabled_sources() -> List[SourceSpec]:
+    """Registered sources that are enabled.
+
+    MTL_EVENTS_SOURCES (comma-separated names) overrides the registered flags.
+    """
+    override = os.getenv("MTL_EVENTS_SOURCES")
+    if override:
+        wanted = {name.strip() for name in override.split(",") if name.strip()}
+        return [spec for spec in _REGISTRY.values() if spec.name in wanted]
+    return [spec for spec in _REGISTRY.values() if spec.enabled]
+
+class LatencyHistory:
+    """Recent per-source latencies, persisted as JSON between runs."""
+
+    def __init__(self, samples: Optional[Dict[str, List[float]]] = None):
+        self.samples = samples or {}
+
+    @classmethod
+    def load(cls) -> LatencyHistory:
+        try:
+            with open(state_path("source_latency.json")) as f:
+                return cls(json.load(f))
+        except (FileNotFoundError, ValueError):
+            return cls()
+
+    def save(self) -> None:
+        path = state_path("source_latency.json")
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump(self.samples, f)
+        os.replace(tmp, path)
+
+    def record(self, name: str, elapsed: float) -> None:
+        self.samples[name] = (self.samples.get(name, []) + [round(elapsed, 3)])[-HISTORY_SAMPLES:]
+
+    def expected(self, spec: SourceSpec) -> float:
+        """Slowest recent latency, or the declared cost without history."""
+        recent = self.samples.get(spec.name)
+        return max(recent) if recent else spec.cost
+
+def schedule(
+    specs: Sequence[SourceSpec],
+    history: LatencyHistory,
+) -> Tuple[List[Tuple[str, SourceStream, float]], float]:
+    """
+    Order sources slowest-first and size their deadlines from history.
+
+    Deadlines never drop below the declared cost or MIN_DEADLINE_FRACTION
+    of the declared deadline, so a week with more work than usual still fits.
+    Returns fetcher-ready (name, stream, deadline) tuples and the overall
+    budget, which is the longest individual deadline (the critical path).
+    """
+    plan = []
+    for spec in sorted(specs, key=history.expected, reverse=True):
+        expected = history.expected(spec)
+        floor = max(MIN_DEADLINE, spec.cost, spec.deadline * MIN_DEADLINE_FRACTION)
+        deadline = min(spec.deadline, max(floor, expected * HEADROOM + SLACK))
+        plan.append((spec.name, spec.stream, deadline))
+    budget = max((deadline for _, _, deadline in plan), default=0.0)
+    return plan, budget
+
+def record_run(results: Sequence[SourceResult], history: LatencyHistory) -> None:
+    """Feed a run's latencies back into the history and persist it.
+
+    A timed-out source's elapsed time is only a lower bound, so it is
+    recorded at its declared deadline instead: its next runs get the full
+    deadline back rather than growing towards it run by run.
+    """
+    for result in results:
+        spec = _REGISTRY.get(result.name)
+        if result.status == "timeout" and spec is not None:
+            history.record(result.name, spec.deadline)
+        elif result.status in ("ok", "timeout"):
+            history.record(result.name, result.elapsed)
+    history.save()
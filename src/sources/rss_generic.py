@@ -1,65 +1,144 @@
-from typing import List
-from datetime import datetime, timedelta
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from datetime import timedelta
+import asyncio
+import multiprocessing, multiprocessing.pool
+import os
 import feedparser
-import ssl
-import urllib.request
+from ..dates import parse_date
 from ..models import Event, EventSource
-
-# Create a custom SSL context that doesn't verify certificates
-if hasattr(ssl, '_create_unverified_context'):
-    ssl._create_default_https_context = ssl._create_unverified_context
+from ..utils.aio import run_blocking
+from ..utils.http import cached_get, load_parsed, store_parsed
+from .registry import register_source
 
 RSS_FEEDS = [
     ("https://montreal.citynews.ca/feed", EventSource.MTL_BLOG),
     ("https://www.mtlblog.com/feeds/news.rss", EventSource.MTL_BLOG),
 ]
 
-def get_rss_events() -> List[Event]:
-    """
-    Fetch events from configured RSS feeds.
-    Returns a list of Event objects.
+MAX_CONCURRENT_FEEDS = 4
+FEED_TIMEOUT = 15       # seconds per feed, download and parse included
+PARSE_WORKERS = 2
+
+def _parse_pool() -> Optional[multiprocessing.pool.Pool]:
+    """Process pool for feedparser work, or None to parse in daemon threads.
+
+    Processes keep parsing off the GIL while other sources run. They are
+    spawned, since forking would copy the locks of the fetch threads, and the
+    pool is terminated when the fetch ends, so a parse that outlives its
+    feed's deadline never keeps the interpreter from exiting.
+    RSS_PARSE_EXECUTOR=thread parses in threads instead, as does a platform
+    where the pool cannot start.
     """
+    if os.getenv("RSS_PARSE_EXECUTOR", "process") == "thread":
+        return None
+    try:
+        return multiprocessing.get_context("spawn").Pool(PARSE_WORKERS)
+    except (OSError, ImportError) as e:
+        print(f"RSS parse pool unavailable, parsing in threads: {e}")
+        return None
+
+def _parse_entries(content: bytes) -> Tuple[List[Dict[str, Optional[str]]], Optional[str]]:
+    """Parse a feed body into plain, picklable entry dicts and the parse error, if any."""
+    feed = feedparser.parse(content)
+    error = str(getattr(feed, 'bozo_exception', 'unknown')) if getattr(feed, 'bozo', False) else None
+    entries = []
+    for entry in feed.entries:
+        link = getattr(entry, 'link', None)
+        entries.append({
+            'title': getattr(entry, 'title', None),
+            'summary': getattr(entry, 'summary', ''),
+            'date': getattr(entry, 'published', getattr(entry, 'updated', '')),
+            'link': link,
+            'id': entry.get('id', link),
+        })
+    return entries, error
+
+def _build_events(url: str, source: EventSource, entries: List[Dict[str, Optional[str]]]) -> List[Event]:
+    """Turn parsed entries into Event objects."""
     events = []
-    for url, source in RSS_FEEDS:
-        print(f"Fetching RSS feed from {url}")
+    for entry in entries:
         try:
-            # Set a 10-second timeout for each feed
-            response = urllib.request.urlopen(url, timeout=10)
-            feed = feedparser.parse(response)
-            print(f"Got {len(feed.entries)} entries from {url}")
-            print(f"Feed status: {feed.status if hasattr(feed, 'status') else 'unknown'}")
-            print(f"Feed headers: {feed.headers if hasattr(feed, 'headers') else 'unknown'}")
-            print(f"Feed bozo: {feed.bozo if hasattr(feed, 'bozo') else 'unknown'}")
-            if hasattr(feed, 'bozo_exception'):
-                print(f"Feed exception: {feed.bozo_exception}")
-            for entry in feed.entries:
-                try:
-                    # Use Event.parse_date for robust parsing and timezone awareness
-                    dt_str = getattr(entry, 'published', getattr(entry, 'updated', ''))
-                    if not dt_str:
-                        print(f"No date found for entry: {entry.title}")
-                        continue
-                    start_dt = Event.parse_date(dt_str)
-                    # Assume 2-hour event if not all-day
-                    end_dt = start_dt + timedelta(hours=2)
-                    event = Event(
-                        title=entry.title,
-                        description=getattr(entry, 'summary', ''),
-                        start_dt=start_dt,
-                        end_dt=end_dt,
-                        location="Montreal",
-                        url=entry.link,
-                        source=source,
-                        source_id=entry.get('id', entry.link),
-                        is_all_day=False,
-                        popularity=None
-                    )
-                    events.append(event)
-                except Exception as e:
-                    print(f"Error parsing RSS event from {url}: {e}")
-                    continue
+            if not entry['title'] or not entry['link']:
+                raise ValueError("entry without title or link")
+            # Memoized parsing in Montreal time; a feed keeps to one date format
+            dt_str = entry['date']
+            if not dt_str:
+                print(f"No date found for entry: {entry['title']}")
+                continue
+            start_dt = parse_date(dt_str, source=url)
+            # Assume 2-hour event if not all-day
+            end_dt = start_dt + timedelta(hours=2)
+            event = Event(
+                title=entry['title'],
+                description=entry['summary'] or '',
+                start_dt=start_dt,
+                end_dt=end_dt,
+                location="Montreal",
+                url=entry['link'],
+                source=source,
+                source_id=entry['id'],
+                is_all_day=False,
+                popularity=None
+            )
+            events.append(event)
         except Exception as e:
-            print(f"Error fetching RSS feed from {url}: {e}")
+            print(f"Error parsing RSS event from {url}: {e}")
             continue
+    return events
+
+async def _parse(content: bytes, pool: Optional[multiprocessing.pool.Pool]) -> Tuple[List[Dict[str, Optional[str]]], Optional[str]]:
+    if pool is None:
+        return await run_blocking(_parse_entries, content)
+    return await run_blocking(pool.apply_async(_parse_entries, (content,)).get)
+
+async def _fetch_feed(url: str, source: EventSource, limit: asyncio.Semaphore,
+                      pool: Optional[multiprocessing.pool.Pool] = None) -> List[Event]:
+    """Fetch one feed and parse it off the event loop, within FEED_TIMEOUT."""
+    try:
+        async with limit, asyncio.timeout(FEED_TIMEOUT):
+            # Unchanged feeds come from the HTTP cache, along with their parsed entries
+            response = await run_blocking(cached_get, url)
+            response.raise_for_status()
+            parsed = load_parsed(response, "rss")
+            if parsed is None:
+                parsed = await _parse(response.content, pool)
+                store_parsed(response, "rss", parsed)
+            entries, error = parsed
+    except TimeoutError:
+        print(f"Timeout fetching RSS feed from {url}")
+        return []
+    except Exception as e:
+        print(f"Error fetching RSS feed from {url}: {e}")
+        return []
+    if error:
+        print(f"Feed {url} parsed with errors: {error}")
+    events = _build_events(url, source, entries)
+    print(f"Got {len(entries)} entries, {len(events)} events from {url}")
+    return events
+
+@register_source("rss", cost=5, deadline=30)
+async def stream_rss_events() -> AsyncIterator[List[Event]]:
+    """Async source protocol: fetch feeds concurrently, yielding each as it completes."""
+    limit = asyncio.Semaphore(MAX_CONCURRENT_FEEDS)
+    pool = _parse_pool()
+    tasks = [asyncio.create_task(_fetch_feed(url, source, limit, pool)) for url, source in RSS_FEEDS]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+        if pool is not None:
+            pool.terminate()
+
+def get_rss_events() -> List[Event]:
+    """
+    Fetch events from configured RSS feeds.
+    Returns a list of Event objects.
+    """
+    async def collect() -> List[Event]:
+        return [event async for batch in stream_rss_events() for event in batch]
+
+    events = asyncio.run(collect())
     print(f"Total RSS events found: {len(events)}")
-    return events 
\ No newline at end of file
+    return events
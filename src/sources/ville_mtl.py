@@ -1,75 +1,42 @@
-from typing import List, Optional, Tuple, Dict
+from typing import AsyncIterator, Iterable, Iterator, List, Tuple, Dict
 from datetime import datetime, timedelta, date
 import unicodedata
 import re
+from ..dates import parse_date
 from ..models import Event, EventSource
-from ..utils.http import fetch_csv
-import requests
+from ..utils.http import iter_csv, get_json
+from ..utils.aio import run_blocking
+from ..utils.translator import get_translation_cache, translate_texts
+from ..utils.fingerprints import FingerprintStore, fingerprint
+from ..utils.state import state_path
+from .registry import register_source
 import os
 import time
 
+RESOURCE_ID = "6decf611-6f11-4f34-bb36-324d804c9bad"
 URL = (
     "https://donnees.montreal.ca/dataset/evenements-publics/"
-    "resource/6decf611-6f11-4f34-bb36-324d804c9bad/download/evenements.csv"
+    f"resource/{RESOURCE_ID}/download/evenements.csv"
 )
 
-# Cache for translations to avoid duplicate API calls
-translation_cache: Dict[str, str] = {}
+# CKAN datastore: server-side date filtering, field selection and paging
+DATASTORE_URL = "https://donnees.montreal.ca/api/3/action/datastore_search_sql"
+DATASTORE_FIELDS = ("titre", "description", "url_fiche", "date_debut", "titre_adresse", "arrondissement")
+DATASTORE_PAGE_SIZE = 1000
+
+# "datastore" (falls back to the CSV on failure) or "csv"
+FETCH_MODE = os.getenv("VILLE_MTL_FETCH_MODE", "datastore")
 
 def translate_batch(texts: List[str], target_lang: str = 'en') -> List[str]:
     """
     Translate a batch of texts using Google Cloud Translation API.
     Returns list of translated texts, falling back to original if translation fails.
+    Duplicates are sent once, cached translations are not sent at all and the
+    remaining texts go out as concurrent, size-packed requests.
     """
     if not texts:
         return []
-        
-    # Filter out already cached translations
-    to_translate = []
-    text_to_idx = {}
-    results = [""] * len(texts)
-    
-    for i, text in enumerate(texts):
-        if text in translation_cache:
-            results[i] = translation_cache[text]
-        else:
-            to_translate.append(text)
-            text_to_idx[text] = i
-    
-    if not to_translate:
-        return results
-        
-    # Split into smaller batches to avoid connection issues
-    BATCH_SIZE = 50
-    for i in range(0, len(to_translate), BATCH_SIZE):
-        batch = to_translate[i:i + BATCH_SIZE]
-        try:
-            url = "https://translation.googleapis.com/language/translate/v2"
-            params = {
-                'q': batch,
-                'target': target_lang,
-                'source': 'fr',
-                'key': os.getenv('GOOGLE_TRANSLATE_KEY')
-            }
-            response = requests.post(url, params=params)
-            if response.status_code == 200:
-                translations = response.json()['data']['translations']
-                for text, trans in zip(batch, translations):
-                    translated = trans['translatedText']
-                    translation_cache[text] = translated
-                    results[text_to_idx[text]] = translated
-            else:
-                print(f"Translation API error: {response.status_code} - {response.text}")
-                # Fall back to original texts for this batch
-                for text in batch:
-                    results[text_to_idx[text]] = text
-        except Exception as e:
-            print(f"Batch translation error: {e}")
-            # Fall back to original texts for this batch
-            for text in batch:
-                results[text_to_idx[text]] = text
-                
-    return results
+    return translate_texts(texts, 'fr', target_lang)
 
 def fix_encoding(text: str) -> str:
     if not isinstance(text, str):
@@ -108,27 +75,99 @@ def parse_time_from_description(description: str, start_date: datetime) -> Tuple
     
     return start_date, start_date + timedelta(hours=2)  # Default to 2-hour duration
 
+_fingerprint_stores: Dict[str, FingerprintStore] = {}
+
+def get_fingerprint_store() -> FingerprintStore:
+    """Row fingerprints and built events from previous runs."""
+    path = state_path("ville_mtl_rows.sqlite")
+    if str(path) not in _fingerprint_stores:
+        _fingerprint_stores[str(path)] = FingerprintStore(path)
+    return _fingerprint_stores[str(path)]
+
+def row_key(r: Dict[str, str]) -> str:
+    """Store key for a CSV row: its url_fiche plus start date, since recurring events share a fiche."""
+    return f"{r['url_fiche']}|{r['date_debut']}"
+
+def datastore_sql(first_day: str, last_day: str, limit: int, offset: int) -> str:
+    """SQL for one page of rows starting between first_day and last_day (inclusive)."""
+    fields = ", ".join(f'"{f}"' for f in DATASTORE_FIELDS)
+    return (
+        f'SELECT {fields} FROM "{RESOURCE_ID}" '
+        f"WHERE \"date_debut\" >= '{first_day}' AND \"date_debut\" <= '{last_day}T23:59:59' "
+        f'ORDER BY "_id" LIMIT {limit} OFFSET {offset}'
+    )
+
+def iter_datastore_rows(first_day: str, last_day: str, *, page_size: int = DATASTORE_PAGE_SIZE) -> Iterator[Dict[str, str]]:
+    """Page through the CKAN datastore, yielding CSV-shaped rows in the date window."""
+    offset = 0
+    while True:
+        data = get_json(DATASTORE_URL, params={"sql": datastore_sql(first_day, last_day, page_size, offset)})
+        if not data.get("success"):
+            raise RuntimeError(f"datastore query failed: {data.get('error')}")
+        records = data["result"]["records"]
+        for rec in records:
+            yield {f: "" if rec.get(f) is None else str(rec[f]) for f in DATASTORE_FIELDS}
+        if len(records) < page_size:
+            return
+        offset += page_size
+
+def iter_city_rows(first_day: str, last_day: str) -> Iterable[Dict[str, str]]:
+    """Rows for the window, from the datastore when possible, else the full CSV."""
+    if FETCH_MODE == "datastore":
+        try:
+            rows = list(iter_datastore_rows(first_day, last_day))
+            print(f"Fetched {len(rows)} rows from the datastore")
+            return rows
+        except Exception as e:
+            print(f"Datastore unavailable ({e}), falling back to CSV")
+    return iter_csv(URL)           # 12-s timeout, rows parsed while streaming
+
 def get_city_events() -> List[Event]:
     events = []
     try:
         print("\nFetching city events:")
         fetch_start = time.time()
-        rows = fetch_csv(URL)          # 12-s timeout, 5 MB cap
-        print(f"[{time.time() - fetch_start:.1f}s] CSV fetched")
-        
         today = date.today()
         horizon = today + timedelta(days=35)
+        # Cheap prefilter on the raw YYYY-MM-DD prefix; one day of slack on each
+        # side since parse_date may shift the date when converting to Montreal time
+        first_day = (today - timedelta(days=1)).isoformat()
+        last_day = (horizon + timedelta(days=1)).isoformat()
+        rows = iter_city_rows(first_day, last_day)
+        
+        # First pass: fingerprint rows in the window
+        parse_start = time.time()
+        window_rows: Dict[str, Tuple[str, Dict[str, str]]] = {}
+        row_count = 0
+        for r in rows:
+            row_count += 1
+            try:
+                if not (first_day <= r["date_debut"][:10] <= last_day):
+                    continue
+                window_rows[row_key(r)] = (fingerprint(r), r)
+            except (KeyError, TypeError) as e:
+                print(f"Error parsing Ville de Montréal event row: {r} - {e}")
+                continue
+        
+        # Only new and changed rows are parsed, translated and rebuilt;
+        # unchanged ones are rehydrated from the store
+        store = get_fingerprint_store()
+        diff = store.classify({key: fp for key, (fp, _) in window_rows.items()})
+        print(f"[{time.time() - parse_start:.1f}s] Streamed {row_count} rows: {diff.summary()}")
+        for key, payload in store.load(diff.unchanged).items():
+            event = Event.from_dict(payload)
+            if today <= event.start_dt.date() <= horizon:
+                events.append(event)
+        reused = len(events)
         
         # Prepare batches for translation
         titles_fr = []
         descriptions_fr = []
         valid_rows = []
-        
-        # First pass: collect texts for translation
-        parse_start = time.time()
-        for r in rows:
+        for key in diff.new + diff.changed:
+            fp, r = window_rows[key]
             try:
-                start = Event.parse_date(r["date_debut"])
+                start = parse_date(r["date_debut"], source="ville_mtl")
                 if not (today <= start.date() <= horizon):
                     continue
                     
@@ -137,22 +176,26 @@ def get_city_events() -> List[Event]:
                 
                 titles_fr.append(title_fr)
                 descriptions_fr.append(description_fr)
-                valid_rows.append((r, start))
+                valid_rows.append((key, fp, r, start))
             except (ValueError, KeyError, TypeError) as e:
                 print(f"Error parsing Ville de Montréal event row: {r} - {e}")
                 continue
-        print(f"[{time.time() - parse_start:.1f}s] Parsed {len(valid_rows)} valid events")
+        print(f"[{time.time() - parse_start:.1f}s] Parsed {len(valid_rows)} new or changed events")
                 
         # Batch translate all texts
         trans_start = time.time()
-        titles_en = translate_batch(titles_fr)
-        descriptions_en = translate_batch(descriptions_fr)
+        # Titles and descriptions share one deduplicated work queue
+        translated = translate_batch(titles_fr + descriptions_fr)
+        titles_en = translated[:len(titles_fr)]
+        descriptions_en = translated[len(titles_fr):]
         print(f"[{time.time() - trans_start:.1f}s] Translated {len(titles_fr)} titles and {len(descriptions_fr)} descriptions")
-        print(f"Translation cache hits: {len(translation_cache)}")
+        stats = get_translation_cache().stats()
+        print(f"Translation cache: {stats['hits']} hits, {stats['misses']} misses, {stats['entries']} entries")
         
         # Second pass: create events with translations
         create_start = time.time()
-        for i, (r, start) in enumerate(valid_rows):
+        processed = {}
+        for i, (key, fp, r, start) in enumerate(valid_rows):
             try:
                 title_fr = titles_fr[i]
                 title_en = titles_en[i]
@@ -165,26 +208,35 @@ def get_city_events() -> List[Event]:
                 
                 start_dt, end_dt = parse_time_from_description(description_fr, start)
                 
-                events.append(
-                    Event(
-                        title       = title,
-                        description = description,
-                        url         = r["url_fiche"],
-                        start_dt    = start_dt,
-                        end_dt      = end_dt,
-                        location    = fix_encoding(r.get("titre_adresse") or r.get("arrondissement") or "Montreal"),
-                        popularity  = 0.2,
-                        source      = EventSource.VILLE_MTL,
-                        source_id   = r["url_fiche"],
-                        is_all_day  = False,
-                    )
+                event = Event(
+                    title       = title,
+                    description = description,
+                    url         = r["url_fiche"],
+                    start_dt    = start_dt,
+                    end_dt      = end_dt,
+                    location    = fix_encoding(r.get("titre_adresse") or r.get("arrondissement") or "Montreal"),
+                    popularity  = 0.2,
+                    source      = EventSource.VILLE_MTL,
+                    source_id   = r["url_fiche"],
+                    is_all_day  = False,
                 )
+                events.append(event)
+                # Rows whose translation fell back to French are retried next run
+                if title_en != title_fr or description_en != description_fr:
+                    processed[key] = (fp, event.to_dict())
             except Exception as e:
                 print(f"Error creating event from row: {e}")
                 continue
-        print(f"[{time.time() - create_start:.1f}s] Created {len(events)} events")
+        store.commit(processed, removed=diff.removed)
+        print(f"[{time.time() - create_start:.1f}s] Created {len(events) - reused} events, reused {reused}")
         print(f"Total time: {time.time() - fetch_start:.1f}s")
                 
     except Exception as e:
         print(f"Error fetching or processing Ville de Montréal CSV: {e}")
-    return events 
\ No newline at end of file
+    return events
+
+# City events need more time for translations
+@register_source("ville_mtl", cost=30, deadline=60)
+async def stream_city_events() -> AsyncIterator[List[Event]]:
+    """Async source protocol wrapper around get_city_events."""
+    yield await run_blocking(get_city_events)
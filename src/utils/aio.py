@@ -0,0 +1,40 @@
+"""Small asyncio helpers shared by the source adapters."""
+from __future__ import annotations
+import asyncio, threading
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+def _resolve(fut: asyncio.Future, result: Any = None, exc: BaseException = None) -> None:
+    if fut.cancelled():
+        return
+    if exc is not None:
+        fut.set_exception(exc)
+    else:
+        fut.set_result(result)
+
+async def run_blocking(func: Callable[..., T], *args: Any) -> T:
+    """Run a blocking call in a daemon thread and await its result.
+
+    Unlike ``asyncio.to_thread`` the worker is a daemon thread that nobody joins:
+    cancelling the awaiting task returns immediately and a hung call can never
+    keep the interpreter (or an executor shutdown) waiting.
+    """
+    loop = asyncio.get_running_loop()
+    fut = loop.create_future()
+
+    def runner() -> None:
+        try:
+            result = func(*args)
+        except BaseException as e:  # handed back to the awaiting task
+            outcome = (None, e)
+        else:
+            outcome = (result, None)
+        try:
+            loop.call_soon_threadsafe(_resolve, fut, *outcome)
+        except RuntimeError:
+            pass  # loop already closed: the caller gave up on us
+
+    name = getattr(func, "__name__", "blocking")
+    threading.Thread(target=runner, name=f"aio-{name}", daemon=True).start()
+    return await fut
@@ -0,0 +1,89 @@
+"""Persisted row fingerprints for incremental ingestion of tabular sources."""
+from __future__ import annotations
+import hashlib, json, sqlite3, threading, time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Tuple
+
+@dataclass
+class RowDiff:
+    """Classification of this run's rows against the previous run."""
+    new: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+
+    def summary(self) -> str:
+        return (f"{len(self.new)} new, {len(self.changed)} changed, "
+                f"{len(self.unchanged)} unchanged, {len(self.removed)} removed")
+
+def fingerprint(row: Mapping[str, Any]) -> str:
+    """Stable hash of a raw row, independent of column order."""
+    payload = json.dumps(sorted(row.items(), key=lambda kv: str(kv[0])), ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+class FingerprintStore:
+    """
+    SQLite store of row key -> (fingerprint, processed payload).
+
+    ``classify`` tells which rows need processing; ``load`` returns the payload
+    of unchanged rows; ``commit`` records processed rows and forgets removed ones.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS rows ("
+                " key TEXT PRIMARY KEY,"
+                " fingerprint TEXT NOT NULL,"
+                " payload TEXT NOT NULL,"
+                " updated_at REAL NOT NULL)"
+            )
+
+    def classify(self, fingerprints: Mapping[str, str]) -> RowDiff:
+        """Compare this run's {key: fingerprint} with the stored ones."""
+        with self._lock:
+            stored = dict(self._conn.execute("SELECT key, fingerprint FROM rows"))
+        diff = RowDiff()
+        for key, fp in fingerprints.items():
+            if key not in stored:
+                diff.new.append(key)
+            elif stored[key] != fp:
+                diff.changed.append(key)
+            else:
+                diff.unchanged.append(key)
+        diff.removed = [key for key in stored if key not in fingerprints]
+        return diff
+
+    def load(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Return the stored payloads for the given keys."""
+        keys = list(keys)
+        out: Dict[str, Any] = {}
+        with self._lock:
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                rows = self._conn.execute(
+                    f"SELECT key, payload FROM rows WHERE key IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                )
+                for key, payload in rows:
+                    out[key] = json.loads(payload)
+        return out
+
+    def commit(self, processed: Mapping[str, Tuple[str, Any]], removed: Iterable[str] = ()) -> None:
+        """Store {key: (fingerprint, payload)} and delete removed keys."""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO rows (key, fingerprint, payload, updated_at) VALUES (?, ?, ?, ?)",
+                [(key, fp, json.dumps(payload, ensure_ascii=False), now)
+                 for key, (fp, payload) in processed.items()],
+            )
+            self._conn.executemany("DELETE FROM rows WHERE key = ?", [(key,) for key in removed])
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM rows").fetchone()[0]
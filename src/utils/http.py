@@ -1,21 +1,265 @@
 """Tiny HTTP helpers with hard time-outs."""
 from __future__ import annotations
-import io, csv, requests, time
-from typing import List, Dict, Optional, Any
+import io, csv, codecs, random, requests, threading, time
+from dataclasses import dataclass, asdict
+from email.utils import parsedate_to_datetime
+from typing import Iterable, Iterator, List, Dict, Optional, Any, Tuple
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
+from .http_cache import HttpCache, CacheEntry, max_age_for
+from .state import state_path
 
-def fetch_csv(url: str, *, timeout: int = 12, max_bytes: int = 5_000_000) -> List[Dict[str, str]]:
+# Keep-alive connections kept per host
+POOL_SIZE = 10
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Retries with full-jitter exponential backoff; Retry-After wins when sent."""
+    retries: int = 3
+    backoff: float = 0.5
+    max_backoff: float = 30.0
+    statuses: Tuple[int, ...] = (429, 500, 502, 503, 504)
+
+    def delay(self, attempt: int, resp: Optional[requests.Response] = None) -> float:
+        retry_after = resp.headers.get("Retry-After") if resp is not None else None
+        if retry_after:
+            try:
+                seconds = float(retry_after)
+            except ValueError:
+                try:
+                    seconds = parsedate_to_datetime(retry_after).timestamp() - time.time()
+                except (TypeError, ValueError):
+                    seconds = None
+            if seconds is not None:
+                return min(max(seconds, 0.0), self.max_backoff)
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+DEFAULT_RETRY = RetryPolicy()
+
+@dataclass
+class HostStats:
+    requests: int = 0
+    retries: int = 0
+    errors: int = 0
+    connections: int = 0
+    total_latency: float = 0.0
+    max_latency: float = 0.0
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_stats: Dict[str, HostStats] = {}
+
+def get_session() -> requests.Session:
+    """Process-wide session with a keep-alive connection pool per host."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+def request(
+    method: str,
+    url: str,
+    *,
+    retry: RetryPolicy = DEFAULT_RETRY,
+    **kwargs: Any,
+) -> requests.Response:
+    """Send a request on the shared session, retrying transient failures.
+
+    Connection errors and the statuses in ``retry.statuses`` are retried;
+    timeouts are not, so callers keep their hard time-outs. The last response
+    is returned as-is once retries are exhausted.
+    """
+    host = urlsplit(url).netloc
+    session = get_session()
+    for attempt in range(retry.retries + 1):
+        with _session_lock:
+            stats = _stats.setdefault(host, HostStats())
+            stats.requests += 1
+        start = time.monotonic()
+        try:
+            resp = session.request(method, url, **kwargs)
+        except requests.exceptions.Timeout:
+            # ConnectTimeout is also a ConnectionError; a timeout must not multiply
+            with _session_lock:
+                stats.errors += 1
+            raise
+        except requests.exceptions.ConnectionError:
+            with _session_lock:
+                stats.errors += 1
+            if attempt == retry.retries:
+                raise
+            delay = retry.delay(attempt)
+            print(f"Connection error from {host}. Retrying after {delay:.1f} seconds...")
+        else:
+            latency = time.monotonic() - start
+            with _session_lock:
+                stats.total_latency += latency
+                stats.max_latency = max(stats.max_latency, latency)
+            if resp.status_code not in retry.statuses or attempt == retry.retries:
+                return resp
+            delay = retry.delay(attempt, resp)
+            print(f"HTTP {resp.status_code} from {host}. Retrying after {delay:.1f} seconds...")
+            resp.close()
+        with _session_lock:
+            stats.retries += 1
+        time.sleep(delay)
+
+def http_stats() -> Dict[str, Dict[str, Any]]:
+    """Per-host request, retry, error, connection and latency counters."""
+    connections: Dict[str, int] = {}
+    if _session is not None:
+        for adapter in set(_session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is not None:
+                    netloc = pool.host if pool.port in (None, 80, 443) else f"{pool.host}:{pool.port}"
+                    connections[netloc] = connections.get(netloc, 0) + pool.num_connections
+    with _session_lock:
+        out = {}
+        for host, stats in _stats.items():
+            row = asdict(stats)
+            row["connections"] = connections.get(host, 0)
+            row["avg_latency"] = stats.total_latency / max(stats.requests - stats.errors, 1)
+            out[host] = row
+        return out
+
+_caches: Dict[str, HttpCache] = {}
+
+def get_http_cache() -> HttpCache:
+    """Process-wide response cache living in the state directory."""
+    directory = state_path("http")
+    key = str(directory)
+    if key not in _caches:
+        _caches[key] = HttpCache(directory)
+    return _caches[key]
+
+def _cached_response(url: str, cache: HttpCache, entry: CacheEntry) -> requests.Response:
+    resp = requests.Response()
+    resp.url = url
+    resp.status_code = 200
+    resp.headers.update(entry.headers)
+    resp._content = cache.read(entry)
+    resp._content_consumed = True
+    resp.from_cache = True
+    resp.cached_url = url
+    return resp
+
+def cached_get(
+    url: str,
+    headers: Optional[Dict[str, str]] = None,
+    *,
+    timeout: int = 10,
+) -> requests.Response:
+    """GET through the on-disk cache.
+
+    Fresh entries are served without a request; stale ones are revalidated with
+    If-None-Match / If-Modified-Since and a 304 is answered from disk. Those
+    responses have ``from_cache`` set, and :func:`load_parsed` returns what was
+    parsed from the same body before.
+    """
+    cache = get_http_cache()
+    entry = cache.get(url)
+    if entry and entry.is_fresh(max_age_for(url)):
+        return _cached_response(url, cache, entry)
+
+    request_headers = dict(headers or {})
+    if entry:
+        request_headers.update(entry.validators())
+    resp = request("GET", url, headers=request_headers, timeout=timeout)
+    if resp.status_code == 304 and entry:
+        cache.touch(entry)
+        return _cached_response(url, cache, entry)
+    resp.from_cache = False
+    if resp.status_code == 200:
+        cache.store(url, resp.content, resp.headers)
+        resp.cached_url = url
+    return resp
+
+def load_parsed(resp: requests.Response, name: str) -> Optional[Any]:
+    """The result stored by :func:`store_parsed` for this body, if the body is unchanged."""
+    if getattr(resp, "from_cache", False) is not True:
+        return None
+    return get_http_cache().load_parsed(resp.cached_url, name)
+
+def store_parsed(resp: requests.Response, name: str, value: Any) -> None:
+    """Keep ``value``, parsed from a :func:`cached_get` body, for as long as the body is unchanged."""
+    url = getattr(resp, "cached_url", None)
+    if isinstance(url, str):
+        get_http_cache().store_parsed(url, name, value)
+
+def stream_get(
+    url: str,
+    headers: Optional[Dict[str, str]] = None,
+    *,
+    timeout: int = 12,
+    chunk_size: int = 8192,
+) -> Iterator[bytes]:
+    """Like :func:`cached_get` but yields the body in chunks.
+
+    A downloaded body is written to the cache as it streams and only committed
+    once it has been read to the end.
+    """
+    cache = get_http_cache()
+    entry = cache.get(url)
+    if not (entry and entry.is_fresh(max_age_for(url))):
+        request_headers = dict(headers or {})
+        if entry:
+            request_headers.update(entry.validators())
+        r = request("GET", url, headers=request_headers, stream=True, timeout=timeout)
+        if r.status_code == 304 and entry:
+            cache.touch(entry)
+        else:
+            r.raise_for_status()
+            with cache.writer(url, r.headers) as out:
+                for chunk in r.iter_content(chunk_size):
+                    out.write(chunk)
+                    yield chunk
+            return
+    with cache.open(entry) as f:
+        while chunk := f.read(chunk_size):
+            yield chunk
+
+def iter_lines(chunks: Iterable[bytes], encoding: str = "utf-8") -> Iterator[str]:
+    """Incrementally decode byte chunks into newline-terminated text lines."""
+    decoder = codecs.getincrementaldecoder(encoding)()
+    pending = ""
+    for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line + "\n"
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+def iter_csv(url: str, *, timeout: int = 12, max_bytes: Optional[int] = None) -> Iterator[Dict[str, str]]:
+    """Yield CSV rows as dicts while the download is still arriving.
+
+    Memory stays flat regardless of file size; ``max_bytes`` optionally aborts
+    oversized downloads. Unchanged files are served from the HTTP cache.
+    """
+    def chunks() -> Iterator[bytes]:
+        seen = 0
+        for chunk in stream_get(url, timeout=timeout):
+            seen += len(chunk)
+            if max_bytes is not None and seen > max_bytes:
+                raise RuntimeError(f"CSV larger than {max_bytes//1_000_000} MB – aborted")
+            yield chunk
+
+    yield from csv.DictReader(iter_lines(chunks()))
+
+def fetch_csv(url: str, *, timeout: int = 12, max_bytes: Optional[int] = 5_000_000) -> List[Dict[str, str]]:
     """Stream-download a CSV with a hard timeout and size cap.
     Returns a list of dict rows. Raises on timeout or >max_bytes.
+    Use :func:`iter_csv` to process large files without holding every row.
     """
-    r = requests.get(url, stream=True, timeout=timeout)
-    r.raise_for_status()
-    buf = io.BytesIO()
-    for chunk in r.iter_content(8192):
-        buf.write(chunk)
-        if buf.tell() > max_bytes:
-            raise RuntimeError(f"CSV larger than {max_bytes//1_000_000} MB – aborted")
-    buf.seek(0)
-    return list(csv.DictReader(io.TextIOWrapper(buf, encoding="utf-8")))
+    return list(iter_csv(url, timeout=timeout, max_bytes=max_bytes))
 
 def get_json(
     url: str,
@@ -23,7 +267,7 @@ def get_json(
     params: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
     """
-    Thin wrapper with timeout and single retry for 429.
+    Thin wrapper with timeout and retries on the shared session.
     
     Args:
         url: The URL to fetch
@@ -36,21 +280,13 @@ def get_json(
     Raises:
         requests.exceptions.RequestException: On HTTP errors
     """
-    resp = requests.get(
+    resp = request(
+        "GET",
         url,
         headers=headers or {},
         params=params or {},
         timeout=10
     )
-    if resp.status_code == 429:
-        print(f"Rate limit hit (status 429). Retrying after 2 seconds...")
-        time.sleep(2)
-        resp = requests.get(
-            url,
-            headers=headers or {},
-            params=params or {},
-            timeout=10
-        )
     resp.raise_for_status()
     return resp.json()
 
@@ -60,7 +296,7 @@ def get_csv(
     params: Optional[Dict[str, Any]] = None,
 ) -> pd.DataFrame:
     """
-    Thin wrapper with timeout and single retry for 429, returning a pandas DataFrame.
+    Thin wrapper with timeout and retries on the shared session, returning a pandas DataFrame.
     
     Args:
         url: The URL to fetch
@@ -73,20 +309,12 @@ def get_csv(
     Raises:
         requests.exceptions.RequestException: On HTTP errors
     """
-    resp = requests.get(
+    resp = request(
+        "GET",
         url,
         headers=headers or {},
         params=params or {},
         timeout=10
     )
-    if resp.status_code == 429:
-        print(f"Rate limit hit (status 429). Retrying after 2 seconds...")
-        time.sleep(2)
-        resp = requests.get(
-            url,
-            headers=headers or {},
-            params=params or {},
-            timeout=10
-        )
     resp.raise_for_status()
     return pd.read_csv(io.StringIO(resp.text)) 
\ No newline at end of file
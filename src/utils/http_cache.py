@@ -0,0 +1,188 @@
+"""On-disk HTTP response cache with conditional-GET revalidation.
+
+Each URL is stored as a body file plus a small JSON metadata file holding the
+ETag / Last-Modified validators. What callers parsed from a body can be kept
+next to it and is dropped when the body is replaced. Entries are evicted
+least-recently-used once the cache grows past ``max_bytes``.
+"""
+from __future__ import annotations
+import hashlib, json, os, threading, time
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict, field
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Mapping, Optional, Tuple
+
+DEFAULT_MAX_BYTES = 200_000_000
+
+# Seconds a stored response is served without revalidation, by URL prefix.
+# Anything not listed is revalidated on every request.
+FRESHNESS: List[Tuple[str, float]] = [
+    ("https://donnees.montreal.ca/", 6 * 3600),
+    ("https://www.reddit.com/", 5 * 60),
+    ("https://montreal.citynews.ca/", 15 * 60),
+    ("https://www.mtlblog.com/", 15 * 60),
+]
+
+# Response headers kept alongside the body
+KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+def max_age_for(url: str) -> float:
+    """Freshness lifetime for a URL according to FRESHNESS."""
+    for prefix, max_age in FRESHNESS:
+        if url.startswith(prefix):
+            return max_age
+    return 0.0
+
+@dataclass
+class CacheEntry:
+    url: str
+    size: int
+    stored_at: float            # last time the origin confirmed this body
+    last_used: float
+    headers: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def etag(self) -> Optional[str]:
+        return self.headers.get("ETag")
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        return self.headers.get("Last-Modified")
+
+    def validators(self) -> Dict[str, str]:
+        """Request headers that turn a GET into a conditional GET."""
+        out = {}
+        if self.etag:
+            out["If-None-Match"] = self.etag
+        if self.last_modified:
+            out["If-Modified-Since"] = self.last_modified
+        return out
+
+    def is_fresh(self, max_age: float, now: Optional[float] = None) -> bool:
+        return ((now or time.time()) - self.stored_at) < max_age
+
+class HttpCache:
+    """Size-bounded response cache shared by all source fetchers."""
+
+    def __init__(self, directory: Path, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def _key(self, url: str) -> str:
+        return hashlib.sha256(url.encode()).hexdigest()
+
+    def _meta_path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def body_path(self, url: str) -> Path:
+        return self.directory / f"{self._key(url)}.body"
+
+    def _parsed_path(self, url: str, name: str) -> Path:
+        return self.directory / f"{self._key(url)}.{name}.parsed"
+
+    def _drop_parsed(self, url: str) -> None:
+        for path in self.directory.glob(f"{self._key(url)}.*.parsed"):
+            path.unlink(missing_ok=True)
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        """Return the stored entry for a URL, if its body is still on disk."""
+        key = self._key(url)
+        try:
+            with open(self._meta_path(key)) as f:
+                entry = CacheEntry(**json.load(f))
+        except (FileNotFoundError, ValueError, TypeError):
+            return None
+        if entry.url != url or not self.body_path(url).exists():
+            return None
+        return entry
+
+    def _write_meta(self, entry: CacheEntry) -> None:
+        path = self._meta_path(self._key(entry.url))
+        tmp = path.with_suffix(".json.tmp")
+        with open(tmp, "w") as f:
+            json.dump(asdict(entry), f)
+        os.replace(tmp, path)
+
+    def read(self, entry: CacheEntry) -> bytes:
+        """Return the stored body and mark the entry as used."""
+        self.touch(entry, revalidated=False)
+        return self.body_path(entry.url).read_bytes()
+
+    def open(self, entry: CacheEntry) -> BinaryIO:
+        """Open the stored body for streaming and mark the entry as used."""
+        self.touch(entry, revalidated=False)
+        return open(self.body_path(entry.url), "rb")
+
+    def load_parsed(self, url: str, name: str) -> Optional[Any]:
+        """What ``name`` parsed from the stored body of ``url``, if kept."""
+        try:
+            with open(self._parsed_path(url, name)) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def store_parsed(self, url: str, name: str, value: Any) -> None:
+        """Keep a JSON-serialisable parse of the stored body until the body changes."""
+        path = self._parsed_path(url, name)
+        tmp = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        with open(tmp, "w") as f:
+            json.dump(value, f)
+        os.replace(tmp, path)
+
+    def touch(self, entry: CacheEntry, revalidated: bool = True) -> None:
+        """Record a use of the entry; ``revalidated`` restarts its freshness clock."""
+        now = time.time()
+        entry.last_used = now
+        if revalidated:
+            entry.stored_at = now
+        with self._lock:
+            self._write_meta(entry)
+
+    @contextmanager
+    def writer(self, url: str, headers: Mapping[str, str]) -> Iterator[BinaryIO]:
+        """Write a new body for ``url``; it is committed only if the block succeeds."""
+        body = self.body_path(url)
+        tmp = body.with_name(f"{body.name}.{threading.get_ident()}.tmp")
+        try:
+            with open(tmp, "wb") as out:
+                yield out
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        now = time.time()
+        entry = CacheEntry(
+            url=url,
+            size=tmp.stat().st_size,
+            stored_at=now,
+            last_used=now,
+            headers={k: headers[k] for k in KEPT_HEADERS if headers.get(k)},
+        )
+        with self._lock:
+            self._drop_parsed(url)
+            os.replace(tmp, body)
+            self._write_meta(entry)
+            self._evict()
+
+    def store(self, url: str, content: bytes, headers: Mapping[str, str]) -> None:
+        """Store a complete response body."""
+        with self.writer(url, headers) as out:
+            out.write(content)
+
+    def _evict(self) -> None:
+        entries = []
+        for meta in self.directory.glob("*.json"):
+            try:
+                with open(meta) as f:
+                    entries.append(CacheEntry(**json.load(f)))
+            except (FileNotFoundError, ValueError, TypeError):
+                meta.unlink(missing_ok=True)
+        total = sum(e.size for e in entries)
+        for entry in sorted(entries, key=lambda e: e.last_used):
+            if total <= self.max_bytes:
+                break
+            self.body_path(entry.url).unlink(missing_ok=True)
+            self._drop_parsed(entry.url)
+            self._meta_path(self._key(entry.url)).unlink(missing_ok=True)
+            total -= entry.size
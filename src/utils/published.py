@@ -0,0 +1,103 @@
+"""Index of events already published to the calendar, kept between runs."""
+from __future__ import annotations
+import sqlite3, threading, time
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from .state import state_path
+
+Key = Tuple[str, str]  # (title/date hash, source_id)
+
+@dataclass
+class PublishedRecord:
+    key: str
+    source_id: str
+    day: str                    # ISO start date, for range queries
+    score: float
+    content_hash: str
+    ranking: str                # fingerprint of the weights the score came from
+    calendar_id: Optional[str] = None
+    published_at: float = 0.0
+
+class PublishedIndex:
+    """
+    SQLite index of published events keyed by (title/date hash, source_id).
+
+    Lookups go through the start-day range of the events at hand, so a run
+    only reads the part of the index that its events can match.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS published ("
+                " key TEXT NOT NULL,"
+                " source_id TEXT NOT NULL,"
+                " day TEXT NOT NULL,"
+                " score REAL NOT NULL,"
+                " content_hash TEXT NOT NULL,"
+                " ranking TEXT NOT NULL,"
+                " calendar_id TEXT,"
+                " published_at REAL NOT NULL,"
+                " PRIMARY KEY (key, source_id))"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS published_day ON published(day)")
+
+    def between(self, first: date, last: date) -> List[PublishedRecord]:
+        """Records whose start day falls in [first, last]."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, source_id, day, score, content_hash, ranking, calendar_id, published_at"
+                " FROM published WHERE day BETWEEN ? AND ? ORDER BY day",
+                (first.isoformat(), last.isoformat()),
+            ).fetchall()
+        return [PublishedRecord(*row) for row in rows]
+
+    def lookup(self, keys: Iterable[Key], first: date, last: date) -> Dict[Key, PublishedRecord]:
+        """Records for the given keys among those starting in [first, last]."""
+        wanted = set(keys)
+        return {
+            (record.key, record.source_id): record
+            for record in self.between(first, last)
+            if (record.key, record.source_id) in wanted
+        }
+
+    def record(self, records: Iterable[PublishedRecord]) -> None:
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO published"
+                " (key, source_id, day, score, content_hash, ranking, calendar_id, published_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(r.key, r.source_id, r.day, r.score, r.content_hash, r.ranking, r.calendar_id, now)
+                 for r in records],
+            )
+
+    def forget(self, keys: Iterable[Key]) -> int:
+        """Drop the records of events no longer in the calendar."""
+        with self._lock, self._conn:
+            return self._conn.executemany(
+                "DELETE FROM published WHERE key = ? AND source_id = ?", list(keys)
+            ).rowcount
+
+    def prune(self, before: date) -> int:
+        """Forget events that started before ``before``."""
+        with self._lock, self._conn:
+            return self._conn.execute("DELETE FROM published WHERE day < ?", (before.isoformat(),)).rowcount
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM published").fetchone()[0]
+
+_indexes: Dict[str, PublishedIndex] = {}
+
+def get_published_index() -> PublishedIndex:
+    """Published-event index shared by every run."""
+    path = state_path("published.sqlite")
+    if str(path) not in _indexes:
+        _indexes[str(path)] = PublishedIndex(path)
+    return _indexes[str(path)]
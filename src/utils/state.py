@@ -0,0 +1,16 @@
+"""Location of on-disk state persisted between weekly runs."""
+from __future__ import annotations
+import os
+from pathlib import Path
+
+DEFAULT_STATE_DIR = ".cache"
+
+def state_dir() -> Path:
+    """Root directory for caches and stores; override with MTL_EVENTS_STATE_DIR."""
+    return Path(os.getenv("MTL_EVENTS_STATE_DIR") or DEFAULT_STATE_DIR)
+
+def state_path(*parts: str) -> Path:
+    """Path below the state directory, creating its parent directories."""
+    path = state_dir().joinpath(*parts)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path
@@ -0,0 +1,104 @@
+"""Disk-backed translation cache (SQLite) with TTL and LRU eviction."""
+from __future__ import annotations
+import hashlib, sqlite3, threading, time
+from pathlib import Path
+from typing import Dict, Iterable, Tuple
+
+DEFAULT_MAX_ENTRIES = 50_000
+DEFAULT_TTL = 180 * 24 * 3600  # recurring city events come back season after season
+
+class TranslationCache:
+    """
+    Translations keyed by a hash of (source text, source language, target language).
+
+    Entries older than ``ttl`` seconds are ignored and pruned; past
+    ``max_entries`` the least recently used ones are dropped.
+    """
+
+    def __init__(self, path: Path, max_entries: int = DEFAULT_MAX_ENTRIES, ttl: float = DEFAULT_TTL):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS translations ("
+                " key TEXT PRIMARY KEY,"
+                " translated TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " last_used REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS translations_last_used ON translations(last_used)"
+            )
+        self.prune()
+
+    @staticmethod
+    def key(text: str, source: str, target: str) -> str:
+        return hashlib.sha256(f"{source}\0{target}\0{text}".encode()).hexdigest()
+
+    def get_many(self, texts: Iterable[str], source: str, target: str) -> Dict[str, str]:
+        """Return cached translations for the given texts, counting hits and misses."""
+        keys = {self.key(t, source, target): t for t in set(texts)}
+        if not keys:
+            return {}
+        now = time.time()
+        found: Dict[str, str] = {}
+        with self._lock:
+            items = list(keys)
+            for i in range(0, len(items), 500):
+                chunk = items[i:i + 500]
+                rows = self._conn.execute(
+                    f"SELECT key, translated FROM translations"
+                    f" WHERE key IN ({','.join('?' * len(chunk))}) AND created_at >= ?",
+                    (*chunk, now - self.ttl),
+                ).fetchall()
+                for key, translated in rows:
+                    found[keys[key]] = translated
+            with self._conn:
+                self._conn.executemany(
+                    "UPDATE translations SET last_used = ? WHERE key = ?",
+                    [(now, self.key(t, source, target)) for t in found],
+                )
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, pairs: Iterable[Tuple[str, str]], source: str, target: str) -> None:
+        """Store (text, translation) pairs."""
+        now = time.time()
+        rows = [(self.key(t, source, target), tr, now, now) for t, tr in pairs]
+        if not rows:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO translations (key, translated, created_at, last_used)"
+                " VALUES (?, ?, ?, ?)",
+                rows,
+            )
+        self.prune()
+
+    def prune(self) -> int:
+        """Drop expired entries, then least recently used ones beyond the size cap."""
+        with self._lock, self._conn:
+            removed = self._conn.execute(
+                "DELETE FROM translations WHERE created_at < ?", (time.time() - self.ttl,)
+            ).rowcount
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()
+            if count > self.max_entries:
+                removed += self._conn.execute(
+                    "DELETE FROM translations WHERE key IN ("
+                    " SELECT key FROM translations ORDER BY last_used LIMIT ?)",
+                    (count - self.max_entries,),
+                ).rowcount
+        return removed
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self)}
@@ -0,0 +1,115 @@
+"""Translation dispatcher for the Google Cloud Translation v2 API.
+
+Texts are deduplicated, looked up in the persistent cache, packed into
+requests under the API's segment and character limits, sent concurrently
+under an in-flight limit and a rate limiter, then scattered back to their
+original positions.
+"""
+from __future__ import annotations
+import os, threading, time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+from .http import request
+from .state import state_path
+from .translation_cache import TranslationCache
+
+TRANSLATE_URL = "https://translation.googleapis.com/language/translate/v2"
+
+MAX_SEGMENTS = 128      # texts per request accepted by the v2 API
+MAX_CHARS = 5000        # recommended maximum characters per request
+MAX_IN_FLIGHT = 4       # concurrent requests
+REQUESTS_PER_SECOND = 10.0
+
+_translation_caches: Dict[str, TranslationCache] = {}
+
+def get_translation_cache() -> TranslationCache:
+    """Persistent translation cache shared by every run."""
+    path = state_path("translations.sqlite")
+    if str(path) not in _translation_caches:
+        _translation_caches[str(path)] = TranslationCache(path)
+    return _translation_caches[str(path)]
+
+class RateLimiter:
+    """Thread-safe limiter spacing calls at least ``1 / rate`` seconds apart."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+def pack(texts: List[str], max_chars: int = MAX_CHARS, max_segments: int = MAX_SEGMENTS) -> List[List[str]]:
+    """Pack texts into requests respecting both limits (first-fit decreasing).
+
+    A text longer than ``max_chars`` on its own gets a request to itself.
+    """
+    packs: List[List[str]] = []
+    sizes: List[int] = []
+    for text in sorted(texts, key=len, reverse=True):
+        for i, current in enumerate(packs):
+            if len(current) < max_segments and sizes[i] + len(text) <= max_chars:
+                current.append(text)
+                sizes[i] += len(text)
+                break
+        else:
+            packs.append([text])
+            sizes.append(len(text))
+    return packs
+
+def _send(texts: List[str], source: str, target: str, limiter: RateLimiter) -> Optional[List[str]]:
+    limiter.acquire()
+    try:
+        response = request(
+            "POST",
+            TRANSLATE_URL,
+            params={'key': os.getenv('GOOGLE_TRANSLATE_KEY')},
+            data={'q': texts, 'target': target, 'source': source, 'format': 'text'},
+            timeout=10,
+        )
+        if response.status_code == 200:
+            return [t['translatedText'] for t in response.json()['data']['translations']]
+        print(f"Translation API error: {response.status_code} - {response.text}")
+    except Exception as e:
+        print(f"Batch translation error: {e}")
+    return None
+
+def translate_texts(
+    texts: List[str],
+    source: str = 'fr',
+    target: str = 'en',
+    *,
+    max_in_flight: int = MAX_IN_FLIGHT,
+    requests_per_second: float = REQUESTS_PER_SECOND,
+    max_chars: int = MAX_CHARS,
+    max_segments: int = MAX_SEGMENTS,
+) -> List[str]:
+    """
+    Translate texts, falling back to the original for anything that fails.
+
+    Returns translations in the same order as ``texts``.
+    """
+    unique = [t for t in dict.fromkeys(texts) if t and t.strip()]
+    cache = get_translation_cache()
+    translated = cache.get_many(unique, source, target)
+    missing = [t for t in unique if t not in translated]
+
+    if missing:
+        packs = pack(missing, max_chars, max_segments)
+        limiter = RateLimiter(requests_per_second)
+        with ThreadPoolExecutor(max_workers=max(1, min(max_in_flight, len(packs)))) as pool:
+            replies = pool.map(lambda p: _send(p, source, target, limiter), packs)
+            for batch, reply in zip(packs, replies):
+                if reply is None:
+                    continue
+                pairs = list(zip(batch, reply))
+                translated.update(pairs)
+                cache.put_many(pairs, source, target)
+
+    return [translated.get(t, t) for t in texts]
@@ -0,0 +1,52 @@
+"""Local stand-in for the donnees.montreal.ca CKAN datastore API.
+
+Mount ``FakeCkanAdapter`` on a requests session to answer the
+``datastore_search_sql`` queries issued by ``ville_mtl`` from in-memory rows.
+"""
+import json
+import re
+from urllib.parse import urlsplit, parse_qs
+import requests
+from requests.adapters import BaseAdapter
+
+SQL_RE = re.compile(
+    r'SELECT (?P<fields>.+?) FROM "(?P<resource>[^"]+)" '
+    r"WHERE \"date_debut\" >= '(?P<start>[^']+)' AND \"date_debut\" <= '(?P<end>[^']+)' "
+    r'ORDER BY "_id" LIMIT (?P<limit>\d+) OFFSET (?P<offset>\d+)$'
+)
+
+class FakeCkanAdapter(BaseAdapter):
+    def __init__(self, resource_id, rows, fail=False):
+        super().__init__()
+        self.resource_id = resource_id
+        self.rows = [dict(r, _id=i + 1) for i, r in enumerate(rows)]
+        self.fail = fail
+        self.queries = []
+
+    def _respond(self, request, status, payload):
+        resp = requests.Response()
+        resp.status_code = status
+        resp.url = request.url
+        resp.request = request
+        resp.headers["Content-Type"] = "application/json"
+        resp._content = json.dumps(payload).encode()
+        return resp
+
+    def send(self, request, **kwargs):
+        if self.fail:
+            return self._respond(request, 409, {"success": False, "error": {"message": "datastore disabled"}})
+        sql = parse_qs(urlsplit(request.url).query)["sql"][0]
+        self.queries.append(sql)
+        m = SQL_RE.match(sql)
+        if not m or m["resource"] != self.resource_id:
+            return self._respond(request, 400, {"success": False, "error": {"message": "bad query"}})
+        fields = [f.strip().strip('"') for f in m["fields"].split(",")]
+        matching = [r for r in self.rows if m["start"] <= r["date_debut"] <= m["end"]]
+        page = matching[int(m["offset"]):int(m["offset"]) + int(m["limit"])]
+        return self._respond(request, 200, {
+            "success": True,
+            "result": {"records": [{f: r.get(f) for f in fields} for r in page]},
+        })
+
+    def close(self):
+        pass
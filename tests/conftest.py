@@ -0,0 +1,18 @@
+from datetime import datetime, timedelta
+import pytest
+from src.models import Event, EventSource
+
+def make_event(title="Concert", start=datetime(2025, 6, 1, 20), **overrides):
+    """Event for tests: two hours from ``start``, with ``overrides`` applied to any field."""
+    data = dict(
+        title=title, description="", url="https://example.com",
+        start_dt=start, end_dt=start + timedelta(hours=2), location="Montreal",
+        popularity=None, source=EventSource.VILLE_MTL, source_id=title,
+    )
+    data.update(overrides)
+    return Event(**data)
+
+@pytest.fixture(autouse=True)
+def isolated_state_dir(tmp_path, monkeypatch):
+    """Keep caches and stores written during tests out of the working tree."""
+    monkeypatch.setenv("MTL_EVENTS_STATE_DIR", str(tmp_path / "state"))
@@ -0,0 +1,53 @@
+from datetime import datetime
+import numpy as np
+import pytz
+from conftest import make_event
+from src.dedupe import hash_title
+from src.batch import EventBatch
+from src.models import MONTREAL_TZ, EventSource
+
+EVENTS = [
+    make_event("Jazz", datetime(2025, 6, 1, 20), popularity=0.1, score=0.42),
+    make_event("Jazz!", datetime(2025, 6, 1, 21), source=EventSource.MTL_BLOG, is_all_day=True),
+    # 23:30 in Montreal is the next day in UTC
+    make_event("Late show", datetime(2025, 6, 1, 23, 30), description=None),
+    make_event("Jazz", datetime(2025, 6, 2, 20, 0, 0, 123456)),
+    # A wall time in the spring-forward gap, and both passes of 1:30 in the fall
+    make_event("Gap", datetime(2025, 3, 9, 2, 30)),
+    make_event("Fall back", MONTREAL_TZ.localize(datetime(2025, 11, 2, 1, 30), is_dst=True)),
+    make_event("Fall back", pytz.UTC.localize(datetime(2025, 11, 2, 6, 30))),
+]
+
+def test_round_trip_is_lossless():
+    batch = EventBatch.from_events(EVENTS)
+    rebuilt = batch.to_events()
+
+    assert rebuilt == EVENTS
+    for before, after in zip(EVENTS, rebuilt):
+        assert after.start_dt.isoformat() == before.start_dt.isoformat()
+        assert after.end_dt.isoformat() == before.end_dt.isoformat()
+        assert after.content_hash() == before.content_hash()
+    assert rebuilt[0].title is rebuilt[3].title
+    assert (batch.start_ts == [e.start_ts for e in EVENTS]).all()
+
+def test_days_and_dedupe_keys_match_per_event_versions():
+    batch = EventBatch.from_events(EVENTS)
+
+    buckets = batch.day_buckets()
+    assert {day: rows.tolist() for day, rows in buckets.items()} == {
+        day: [i for i, e in enumerate(EVENTS) if e.start_dt.date() == day]
+        for day in {e.start_dt.date() for e in EVENTS}
+    }
+    assert batch.dedupe_keys() == [hash_title(e.title, e.start_dt) for e in EVENTS]
+    # "Jazz" and "Jazz!" on the same day share a key, as do both "Fall back"
+    assert batch.first_occurrences().tolist() == [True, False, True, True, True, True, False]
+
+def test_filter_keeps_columns_and_strings_together():
+    batch = EventBatch.from_events(EVENTS)
+
+    by_mask = batch.filter(batch.source == 0)
+    by_index = batch.filter(np.array([3, 0]))
+
+    assert by_mask.strings is batch.strings
+    assert by_mask.to_events() == [e for e in EVENTS if e.source is EventSource.VILLE_MTL]
+    assert by_index.to_events() == [EVENTS[3], EVENTS[0]]
@@ -0,0 +1,184 @@
+from datetime import datetime
+import pytest
+from conftest import make_event
+import src.calendar_client as calendar_client
+from src.calendar_client import AGENT_PROPERTY, HASH_PROPERTY, SyncSession, event_to_calendar_event
+
+class FakeRequest:
+    def __init__(self, fn):
+        self.fn = fn
+
+    def execute(self):
+        return self.fn()
+
+class FakeEvents:
+    """Calendar events resource serving ``items`` a few per page."""
+
+    def __init__(self, items, page_size=2):
+        self.items = items
+        self.page_size = page_size
+        self.list_calls = []
+
+    def list(self, **params):
+        self.list_calls.append(params)
+        matching = self.items
+        if 'privateExtendedProperty' in params:
+            name, value = params['privateExtendedProperty'].split('=')
+            matching = [i for i in matching if i['extendedProperties']['private'].get(name) == value]
+        start = int(params.get('pageToken', 0))
+        page = {'items': matching[start:start + self.page_size]}
+        if start + self.page_size < len(matching):
+            page['nextPageToken'] = str(start + self.page_size)
+        return FakeRequest(lambda: page)
+
+    def insert(self, calendarId, body):
+        return FakeRequest(lambda: self._store(f"new-{len(self.items)}", body, "insert"))
+
+    def update(self, calendarId, eventId, body):
+        return FakeRequest(lambda: self._store(eventId, body, "update"))
+
+    def delete(self, calendarId, eventId):
+        def remove():
+            self.writes.append(("delete", eventId))
+            self.items = [i for i in self.items if i['id'] != eventId]
+        return FakeRequest(remove)
+
+    def _store(self, event_id, body, action):
+        self.writes.append((action, body['extendedProperties']['private']['source_id']))
+        self.items = [i for i in self.items if i['id'] != event_id] + [{'id': event_id, **body}]
+        return {'id': event_id}
+
+class FakeBatch:
+    def __init__(self):
+        self.requests = []
+
+    def add(self, request, callback=None):
+        self.requests.append((request, callback))
+
+    def execute(self):
+        for request, callback in self.requests:
+            response = request.execute()
+            if callback:
+                callback(None, response, None)
+
+class FakeService:
+    def __init__(self, items, page_size=2):
+        self._events = FakeEvents(items, page_size)
+        self._events.writes = []
+
+    def events(self):
+        return self._events
+
+    def new_batch_http_request(self):
+        return FakeBatch()
+
+@pytest.fixture(autouse=True)
+def calendar_id(monkeypatch):
+    monkeypatch.setattr(calendar_client, "CALENDAR_ID", "calendar")
+
+def stored(event, event_id, marked=True):
+    body = event_to_calendar_event(event)
+    if not marked:  # written before the agent property and the content hash existed
+        del body['extendedProperties']['private'][AGENT_PROPERTY[0]]
+        del body['extendedProperties']['private'][HASH_PROPERTY]
+    return {'id': event_id, **body}
+
+def test_existing_events_are_listed_in_one_paginated_window():
+    events = [make_event(f"s{i}", datetime(2025, 6, 1 + i, 20)) for i in range(5)]
+    service = FakeService([stored(e, f"cal-{e.source_id}") for e in events])
+    session = SyncSession(service)
+
+    session.load_existing(e.start_dt.date() for e in events)
+
+    assert session.existing == {e.source_id: f"cal-{e.source_id}" for e in events}
+    calls = service.events().list_calls
+    assert len(calls) == session.list_requests == 3  # one window, three pages
+    assert 'privateExtendedProperty' not in calls[0]
+    assert calls[0]['fields'] == "items(id,extendedProperties/private),nextPageToken"
+    assert calls[0]['timeMin'] == "2025-06-01T00:00:00-04:00"
+    assert calls[0]['timeMax'] == "2025-06-06T00:00:00-04:00"
+
+    # Dates already listed are not listed again
+    session.load_existing([events[0].start_dt.date()])
+    assert session.list_requests == 3
+
+def test_dates_are_listed_again_after_a_failed_listing():
+    event = make_event("s1")
+    service = FakeService([stored(event, "cal-s1")])
+    session = SyncSession(service)
+    list_page = service.events().list
+
+    def fail_once(**params):
+        service.events().list = list_page
+        raise OSError("connection reset")
+    service.events().list = fail_once
+
+    session.load_existing([event.start_dt.date()])
+    assert session.existing == {} and session.error_count == 1
+
+    session.load_existing([event.start_dt.date()])
+    assert session.existing == {"s1": "cal-s1"}
+
+def test_marked_and_unmarked_events_are_both_found(monkeypatch):
+    monkeypatch.setattr(calendar_client.time, "sleep", lambda s: None)
+    new, legacy = make_event("new"), make_event("legacy")
+    service = FakeService([stored(new, "cal-new"), stored(legacy, "cal-legacy", marked=False)])
+    session = SyncSession(service)
+
+    session.upsert([new, legacy])
+
+    assert session.existing == {"new": "cal-new", "legacy": "cal-legacy"}
+    assert service.events().writes == [("update", "legacy")]  # now marked, and not duplicated
+    assert len(service.events().items) == 2
+
+def test_marked_only_sessions_filter_on_the_agent_property():
+    new, legacy = make_event("new"), make_event("legacy")
+    service = FakeService([stored(new, "cal-new"), stored(legacy, "cal-legacy", marked=False)])
+    session = SyncSession(service, marked_only=True)
+
+    session.load_existing([new.start_dt.date()])
+
+    assert session.existing == {"new": "cal-new"}
+    assert service.events().list_calls[0]['privateExtendedProperty'] == "agent=mtl-events"
+
+def test_only_changed_events_are_written(monkeypatch):
+    monkeypatch.setattr(calendar_client.time, "sleep", lambda s: None)
+    same, changed, new = make_event("same"), make_event("changed"), make_event("new")
+    old_changed = make_event("changed")
+    old_changed.title = "Old title"
+    service = FakeService([stored(same, "cal-same"), stored(old_changed, "cal-changed")])
+    session = SyncSession(service)
+
+    session.upsert([same, changed, new])
+
+    assert sorted(service.events().writes) == [("insert", "new"), ("update", "changed")]
+    assert (session.created_count, session.updated_count, session.unchanged_count) == (1, 1, 1)
+    assert session.synced == {"same": "cal-same", "changed": "cal-changed", "new": "new-2"}
+
+    # A second round, or a later run, writes nothing
+    session.upsert([same, changed, new])
+    assert len(service.events().writes) == 2
+    again = SyncSession(service)
+    again.upsert([same, changed, new])
+    assert again.unchanged_count == 3 and len(service.events().writes) == 2
+
+def test_content_hash_covers_the_written_body():
+    event = make_event("s1")
+    body = event_to_calendar_event(event)
+    assert body['extendedProperties']['private']['content_hash'] == event_to_calendar_event(make_event("s1"))[
+        'extendedProperties']['private']['content_hash']
+    event.location = "Verdun"
+    assert event_to_calendar_event(event)['extendedProperties']['private']['content_hash'] != \
+        body['extendedProperties']['private']['content_hash']
+
+def test_delete_returns_only_events_this_session_created(monkeypatch):
+    monkeypatch.setattr(calendar_client.time, "sleep", lambda s: None)
+    old, new = make_event("old"), make_event("new")
+    service = FakeService([stored(old, "cal-old")])
+    session = SyncSession(service)
+    session.upsert([old, new])
+
+    assert session.delete([old, new]) == [new]
+    assert service.events().writes[-1] == ("delete", "new-1")
+    assert session.deleted_count == 1 and "new" not in session.synced
+    assert session.delete([new]) == []
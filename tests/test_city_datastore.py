@@ -0,0 +1,58 @@
+from datetime import date, timedelta
+from unittest.mock import patch
+import pytest
+from src.sources import ville_mtl
+from src.utils.http import get_session
+from ckan_stub import FakeCkanAdapter
+
+PREFIX = "https://donnees.montreal.ca/"
+
+def row(n, day_offset):
+    return {
+        "titre": f"Spectacle {n}",
+        "description": "Concert",
+        "url_fiche": f"http://example.com/{n}",
+        "date_debut": (date.today() + timedelta(days=day_offset)).isoformat(),
+        "date_fin": "",
+        "titre_adresse": "Parc",
+        "arrondissement": None,
+        "type_evenement": "Spectacle",
+    }
+
+@pytest.fixture
+def mount_ckan():
+    session = get_session()
+    def mount(adapter):
+        session.mount(PREFIX, adapter)
+        return adapter
+    yield mount
+    session.adapters.pop(PREFIX, None)
+
+def test_datastore_pages_through_window_with_selected_fields(mount_ckan):
+    rows = [row(n, offset) for n, offset in enumerate([-30, 1, 2, 3, 60, 4, 5])]
+    ckan = mount_ckan(FakeCkanAdapter(ville_mtl.RESOURCE_ID, rows))
+    first, last = date.today().isoformat(), (date.today() + timedelta(days=35)).isoformat()
+
+    fetched = list(ville_mtl.iter_datastore_rows(first, last, page_size=2))
+
+    assert [r["titre"] for r in fetched] == [f"Spectacle {n}" for n in (1, 2, 3, 5, 6)]
+    assert set(fetched[0]) == set(ville_mtl.DATASTORE_FIELDS)
+    assert fetched[0]["arrondissement"] == ""
+    assert len(ckan.queries) == 3
+
+def test_get_city_events_uses_datastore(mount_ckan):
+    mount_ckan(FakeCkanAdapter(ville_mtl.RESOURCE_ID, [row(1, 2), row(2, 90)]))
+    with patch.object(ville_mtl, "FETCH_MODE", "datastore"), \
+         patch.object(ville_mtl, "iter_csv") as csv, \
+         patch.object(ville_mtl, "translate_batch", side_effect=lambda texts: texts):
+        events = ville_mtl.get_city_events()
+    csv.assert_not_called()
+    assert [e.source_id for e in events] == ["http://example.com/1"]
+
+def test_falls_back_to_csv_when_datastore_fails(mount_ckan):
+    mount_ckan(FakeCkanAdapter(ville_mtl.RESOURCE_ID, [], fail=True))
+    with patch.object(ville_mtl, "FETCH_MODE", "datastore"), \
+         patch.object(ville_mtl, "iter_csv", return_value=iter([row(3, 2)])) as csv:
+        rows = list(ville_mtl.iter_city_rows("2000-01-01", "2100-01-01"))
+    csv.assert_called_once_with(ville_mtl.URL)
+    assert rows[0]["titre"] == "Spectacle 3"
@@ -0,0 +1,66 @@
+from datetime import datetime
+import pytest
+import pytz
+from src.dates import DateParser
+from src.models import MONTREAL_TZ, Event
+
+def montreal(*args):
+    return MONTREAL_TZ.localize(datetime(*args))
+
+@pytest.mark.parametrize("date_str, expected", [
+    ("Sun, 01 Jun 2025 20:00:00 GMT", montreal(2025, 6, 1, 16)),
+    ("2025-06-01T10:00:00-04:00", montreal(2025, 6, 1, 10)),
+    ("2025-06-01T14:00:00Z", montreal(2025, 6, 1, 10)),
+    # Naive ISO strings are UTC, as they always were
+    ("2025-06-01", montreal(2025, 5, 31, 20)),
+    ("2025-06-01 14:00:00", montreal(2025, 6, 1, 10)),
+    # Only the strptime fallbacks read local Montreal time
+    ("2025-6-1", montreal(2025, 6, 1)),
+    ("01/06/2025 20:00", montreal(2025, 6, 1, 20)),
+])
+def test_parse_matches_original_cascade(date_str, expected):
+    parser = DateParser()
+    assert parser.parse(date_str) == expected
+    assert str(parser.parse(date_str)) == str(expected)
+    assert Event.parse_date(date_str) == expected
+
+def test_invalid_strings_raise_every_time():
+    parser = DateParser()
+    for _ in range(2):
+        with pytest.raises(ValueError, match="Could not parse date string"):
+            parser.parse("not a date")
+    with pytest.raises(ValueError):
+        parser.parse("")
+
+def test_source_hint_never_changes_the_result():
+    parser = DateParser()
+    assert parser.parse("2025-6-1", "city") == montreal(2025, 6, 1)
+    # The source's last winner is '%Y-%m-%d', but ISO still comes first
+    assert parser.parse("2025-06-02", "city") == pytz.UTC.localize(datetime(2025, 6, 2))
+    assert parser.parse("02/06/2025 20:00", "city") == montreal(2025, 6, 2, 20)
+    assert parser.parse("Mon, 02 Jun 2025 20:00:00 GMT", "city") == montreal(2025, 6, 2, 16)
+
+def test_cache_is_bounded_and_counts_hits():
+    parser = DateParser(cache_size=2)
+    for date_str in ["2025-06-01", "2025-06-01", "2025-06-02", "2025-06-03"]:
+        parser.parse(date_str)
+    assert parser.stats() == {"hits": 1, "misses": 3, "entries": 2}
+
+def test_parse_dates_bulk():
+    parser = DateParser()
+    parsed = parser.parse_dates(["2025-06-01", "bad", "2025-06-01"])
+    assert parsed == [montreal(2025, 5, 31, 20), None, montreal(2025, 5, 31, 20)]
+    assert parser.stats()["misses"] == 2
+
+def test_shared_parser_is_thread_safe():
+    from concurrent.futures import ThreadPoolExecutor
+    parser = DateParser(cache_size=8)
+    strings = [f"2025-{m:02d}-{d:02d}" for m in range(1, 13) for d in range(1, 29)]
+
+    def parse_all(source):
+        return [parser.parse(s, source) for s in strings * 5]
+
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(parse_all, ["ville_mtl", "rss"] * 4))
+    assert all(r == results[0] for r in results)
+    assert parser.stats()["entries"] == 8
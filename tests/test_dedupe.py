@@ -0,0 +1,49 @@
+import random
+import time
+from datetime import datetime
+from conftest import make_event
+from src.aggregator import deduplicate
+from src.dedupe import NearDuplicateIndex, merge_near_duplicates, title_variants
+from src.models import EventSource
+
+def test_bilingual_city_title_merges_with_blog_title_keeping_richest():
+    city = make_event("Concert sous les étoiles / Concert under the stars")
+    blog = make_event("Concert Under The Stars!", description="Free outdoor show in the Old Port with local bands.",
+                      source=EventSource.MTL_BLOG)
+    other = make_event("Improv night")
+
+    assert title_variants(city.title) == [city.title, "Concert sous les étoiles", "Concert under the stars"]
+    assert deduplicate([city, other, blog]) == [other, blog]
+
+def test_distinct_sessions_and_days_are_kept():
+    events = [
+        make_event("Yoga au parc - Session 1"),
+        make_event("Yoga au parc - Session 2"),
+        make_event("Jazz au parc", start=datetime(2025, 6, 1, 20)),
+        make_event("Jazz au parc!", start=datetime(2025, 6, 2, 20)),
+    ]
+    assert merge_near_duplicates(events) == events
+
+def test_similar_titles_with_matching_descriptions_merge():
+    description = "Une soirée de musique traditionnelle québécoise au parc La Fontaine"
+    a = make_event("Soirée trad au parc La Fontaine", description=description)
+    b = make_event("Trad night - parc La Fontaine", description=description + ".")
+    assert len(merge_near_duplicates([a, b])) == 1
+
+def test_index_reports_displaced_representative():
+    index = NearDuplicateIndex()
+    poor = make_event("Piknic Électronik", url="")
+    rich = make_event("Piknic Electronik", description="Outdoor electronic music at Parc Jean-Drapeau")
+    assert index.add(poor) == []
+    assert index.add(rich) == [poor]
+
+def test_scales_roughly_linearly():
+    rng = random.Random(0)
+    words = [f"w{i}" for i in range(2000)]
+    events = [
+        make_event(" ".join(rng.sample(words, 4)), start=datetime(2025, 6, 1 + i % 28, 20))
+        for i in range(10000)
+    ]
+    start = time.monotonic()
+    merge_near_duplicates(events)
+    assert time.monotonic() - start < 10
@@ -0,0 +1,40 @@
+import dataclasses
+from datetime import datetime
+import pytest
+import pytz
+from conftest import make_event
+from src.models import MONTREAL_TZ, Event, FrozenEvent, to_montreal
+
+def test_event_is_slotted_with_epoch_timestamps():
+    event = make_event()
+
+    assert not hasattr(event, "__dict__")
+    with pytest.raises(AttributeError):
+        event.extra = 1
+    assert event.start_dt.tzinfo.zone == "America/Montreal"
+    assert event.start_ts == event.start_dt.timestamp()
+    assert event.end_ts == event.end_dt.timestamp()
+    assert event.duration_hours == 2
+
+def test_freeze_and_thaw_round_trip():
+    event = make_event(score=0.7)
+    frozen = event.freeze()
+
+    assert isinstance(frozen, FrozenEvent)
+    assert frozen.thaw() == event
+    assert {frozen, make_event(score=0.7).freeze()} == {frozen}
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        frozen.score = 0.1
+    assert Event.from_dict(event.to_dict()) == event
+    assert FrozenEvent.from_dict(frozen.to_dict()) == frozen
+
+def test_cached_conversion_matches_pytz():
+    naive = datetime(2025, 11, 2, 1, 30)
+    utc = pytz.UTC.localize(datetime(2025, 6, 1, 12))
+    paris = utc.astimezone(pytz.timezone("Europe/Paris"))
+
+    assert to_montreal(naive) == MONTREAL_TZ.localize(naive)
+    assert to_montreal(naive).utcoffset() == MONTREAL_TZ.localize(naive).utcoffset()
+    # Same instant from another zone: same Montreal time
+    assert to_montreal(paris) == to_montreal(utc)
+    assert str(to_montreal(paris)) == str(utc.astimezone(MONTREAL_TZ))
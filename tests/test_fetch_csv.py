@@ -1,8 +1,38 @@
-from src.utils.http import fetch_csv
+import csv
+from src.utils.http import fetch_csv, iter_lines
 import pytest, requests
 
 def test_timeout(monkeypatch):
     def slow_get(*_, **__): raise requests.Timeout()
-    monkeypatch.setattr(requests, "get", slow_get)
+    monkeypatch.setattr(requests.Session, "request", slow_get)
     with pytest.raises(requests.Timeout):
-        fetch_csv("http://example.com/file.csv", timeout=1) 
\ No newline at end of file
+        fetch_csv("http://example.com/file.csv", timeout=1) 
+
+
+def test_iter_lines_handles_split_characters_and_quoted_newlines():
+    data = 'titre,description\n"Fête","ligne 1\nligne 2"\nÉté,x\n'.encode("utf-8")
+    chunks = [data[i:i + 3] for i in range(0, len(data), 3)]
+    rows = list(csv.DictReader(iter_lines(chunks)))
+    assert rows == [
+        {"titre": "Fête", "description": "ligne 1\nligne 2"},
+        {"titre": "Été", "description": "x"},
+    ]
+
+def test_iter_csv_yields_rows_while_streaming(monkeypatch):
+    from src.utils import http
+    served = []
+    def fake_stream(url, **_):
+        for chunk in (b"a,b\n1,2\n", b"3,4\n"):
+            served.append(chunk)
+            yield chunk
+    monkeypatch.setattr(http, "stream_get", fake_stream)
+    rows = http.iter_csv("http://example.com/file.csv")
+    assert next(rows) == {"a": "1", "b": "2"}
+    assert len(served) == 1
+    assert list(rows) == [{"a": "3", "b": "4"}]
+
+def test_iter_csv_max_bytes(monkeypatch):
+    from src.utils import http
+    monkeypatch.setattr(http, "stream_get", lambda url, **_: iter([b"a\n" * 10]))
+    with pytest.raises(RuntimeError, match="CSV larger"):
+        list(http.iter_csv("http://example.com/file.csv", max_bytes=5))
@@ -0,0 +1,52 @@
+import asyncio
+import time
+from conftest import make_event
+from src.fetcher import run
+from src.utils.aio import run_blocking
+
+async def fast_source():
+    yield [make_event("fast")]
+
+async def partial_source():
+    yield [make_event("first batch")]
+    await asyncio.sleep(10)
+    yield [make_event("never")]
+
+async def hung_blocking_source():
+    yield await run_blocking(time.sleep, 10)
+
+async def failing_source():
+    raise RuntimeError("boom")
+    yield []
+
+def test_budget_bounds_total_time_and_keeps_partial_results():
+    start = time.monotonic()
+    results = run([
+        ("fast", fast_source, None),
+        ("partial", partial_source, None),
+        ("hung", hung_blocking_source, None),
+    ], budget=0.3)
+    assert time.monotonic() - start < 2
+
+    by_name = {r.name: r for r in results}
+    assert by_name["fast"].status == "ok"
+    assert [e.title for e in by_name["fast"].events] == ["fast"]
+    assert by_name["partial"].status == "timeout"
+    assert [e.title for e in by_name["partial"].events] == ["first batch"]
+    assert by_name["hung"].status == "timeout"
+    assert by_name["hung"].events == []
+
+def test_per_source_deadline_and_errors():
+    results = run([
+        ("partial", partial_source, 0.1),
+        ("failing", failing_source, None),
+        ("fast", fast_source, None),
+    ], budget=5)
+
+    by_name = {r.name: r for r in results}
+    assert by_name["partial"].status == "timeout"
+    assert by_name["partial"].elapsed < 1
+    assert len(by_name["partial"].events) == 1
+    assert by_name["failing"].status == "error"
+    assert by_name["failing"].error == "boom"
+    assert by_name["fast"].status == "ok"
@@ -0,0 +1,57 @@
+from datetime import date, timedelta
+from unittest.mock import patch
+from src.sources import ville_mtl
+from src.utils.fingerprints import FingerprintStore, fingerprint
+
+def test_classify_and_commit(tmp_path):
+    store = FingerprintStore(tmp_path / "rows.sqlite")
+    store.commit({"a": ("1", {"x": 1}), "b": ("2", {"x": 2}), "c": ("3", {"x": 3})})
+
+    diff = store.classify({"a": "1", "b": "changed", "d": "4"})
+    assert diff.unchanged == ["a"]
+    assert diff.changed == ["b"]
+    assert diff.new == ["d"]
+    assert diff.removed == ["c"]
+    assert store.load(["a"]) == {"a": {"x": 1}}
+
+    store.commit({}, removed=diff.removed)
+    assert len(store) == 2
+
+def test_fingerprint_ignores_column_order():
+    assert fingerprint({"a": "1", "b": "2"}) == fingerprint({"b": "2", "a": "1"})
+    assert fingerprint({"a": "1"}) != fingerprint({"a": "2"})
+
+def city_row(n, day_offset, description="Concert de 18 h 30 à 20 h 00"):
+    return {
+        "titre": f"Spectacle {n}",
+        "description": description,
+        "url_fiche": f"http://example.com/{n}",
+        "date_debut": (date.today() + timedelta(days=day_offset)).isoformat() + "T12:00:00",
+        "titre_adresse": "Parc",
+    }
+
+def fake_translate(texts, target_lang="en"):
+    return [f"EN {t}" for t in texts]
+
+def test_city_events_only_process_churn():
+    first = [city_row(1, 3), city_row(2, 4), city_row(3, 5)]
+    with patch.object(ville_mtl, "iter_city_rows", return_value=first), \
+         patch.object(ville_mtl, "translate_batch", side_effect=fake_translate) as translate:
+        events = ville_mtl.get_city_events()
+    assert len(events) == 3
+    assert len(translate.call_args.args[0]) == 6
+
+    second = [city_row(1, 3), city_row(2, 4, description="Annulé"), city_row(4, 6)]
+    with patch.object(ville_mtl, "iter_city_rows", return_value=second), \
+         patch.object(ville_mtl, "translate_batch", side_effect=fake_translate) as translate:
+        events = ville_mtl.get_city_events()
+
+    assert sorted(translate.call_args.args[0]) == sorted([
+        "Spectacle 2", "Annulé", "Spectacle 4", "Concert de 18 h 30 à 20 h 00",
+    ])
+    by_id = {e.source_id: e for e in events}
+    assert set(by_id) == {"http://example.com/1", "http://example.com/2", "http://example.com/4"}
+    assert by_id["http://example.com/1"].title == "Spectacle 1 / EN Spectacle 1"
+    assert by_id["http://example.com/1"].start_dt.hour == 18
+    assert "EN Annulé" in by_id["http://example.com/2"].description
+    assert len(ville_mtl.get_fingerprint_store()) == 3
@@ -0,0 +1,61 @@
+from unittest.mock import patch, MagicMock
+import pytest
+import requests
+from src.utils import http
+from src.utils.http import RetryPolicy, request, http_stats
+
+def response(status, headers=None):
+    resp = MagicMock()
+    resp.status_code = status
+    resp.headers = headers or {}
+    return resp
+
+@patch("src.utils.http.time.sleep")
+@patch("requests.Session.request")
+def test_retry_honours_retry_after(mock_request, mock_sleep):
+    mock_request.side_effect = [response(429, {"Retry-After": "3"}), response(200)]
+    resp = request("POST", "https://translation.example.com/v2")
+    assert resp.status_code == 200
+    mock_sleep.assert_called_once_with(3.0)
+
+    stats = http_stats()["translation.example.com"]
+    assert stats["requests"] == 2
+    assert stats["retries"] == 1
+
+@patch("src.utils.http.time.sleep")
+@patch("requests.Session.request")
+def test_retries_are_bounded(mock_request, mock_sleep):
+    mock_request.return_value = response(503)
+    resp = request("GET", "https://flaky.example.com/", retry=RetryPolicy(retries=2))
+    assert resp.status_code == 503
+    assert mock_request.call_count == 3
+    assert all(0 <= c.args[0] <= 30 for c in mock_sleep.call_args_list)
+
+@patch("src.utils.http.time.sleep")
+@patch("requests.Session.request")
+def test_connection_errors_are_retried_then_raised(mock_request, mock_sleep):
+    mock_request.side_effect = requests.exceptions.ConnectionError("down")
+    with pytest.raises(requests.exceptions.ConnectionError):
+        request("GET", "https://down.example.com/", retry=RetryPolicy(retries=1))
+    assert mock_request.call_count == 2
+    assert http_stats()["down.example.com"]["errors"] == 2
+
+@patch("src.utils.http.time.sleep")
+@patch("requests.Session.request")
+def test_timeouts_are_not_retried(mock_request, mock_sleep):
+    for error in (requests.exceptions.ConnectTimeout, requests.exceptions.ReadTimeout):
+        mock_request.reset_mock()
+        mock_request.side_effect = error("slow")
+        with pytest.raises(error):
+            request("GET", "https://slow.example.com/")
+        assert mock_request.call_count == 1
+    mock_sleep.assert_not_called()
+
+def test_backoff_is_jittered_and_capped():
+    policy = RetryPolicy(backoff=1.0, max_backoff=4.0)
+    delays = [policy.delay(10) for _ in range(50)]
+    assert all(0 <= d <= 4.0 for d in delays)
+    assert len(set(delays)) > 1
+
+def test_session_is_shared():
+    assert http.get_session() is http.get_session()
@@ -0,0 +1,71 @@
+import time
+from unittest.mock import patch, MagicMock
+from src.utils import http_cache
+from src.utils.http import cached_get, load_parsed, store_parsed, stream_get
+from src.utils.http_cache import HttpCache
+
+URL = "http://example.com/feed.xml"
+
+def response(status, content=b"", headers=None):
+    resp = MagicMock()
+    resp.status_code = status
+    resp.content = content
+    resp.headers = headers or {}
+    resp.iter_content.return_value = [content]
+    return resp
+
+@patch("requests.Session.request")
+def test_not_modified_is_served_from_disk(mock_get):
+    mock_get.return_value = response(200, b"<rss/>", {"ETag": '"v1"', "Last-Modified": "Sun, 01 Jun 2025 00:00:00 GMT"})
+    assert cached_get(URL).content == b"<rss/>"
+
+    mock_get.return_value = response(304)
+    resp = cached_get(URL)
+    assert resp.content == b"<rss/>"
+    assert resp.from_cache
+    sent = mock_get.call_args.kwargs["headers"]
+    assert sent["If-None-Match"] == '"v1"'
+    assert sent["If-Modified-Since"] == "Sun, 01 Jun 2025 00:00:00 GMT"
+
+@patch("requests.Session.request")
+def test_fresh_entry_skips_the_request(mock_get):
+    mock_get.return_value = response(200, b"a,b\n1,2\n", {"ETag": '"v1"'})
+    with patch.object(http_cache, "FRESHNESS", [("http://example.com/", 60)]):
+        assert b"".join(stream_get(URL)) == b"a,b\n1,2\n"
+        assert b"".join(stream_get(URL)) == b"a,b\n1,2\n"
+    assert mock_get.call_count == 1
+
+@patch("requests.Session.request")
+def test_interrupted_stream_is_not_cached(mock_get):
+    mock_get.return_value = response(200, b"partial", {"ETag": '"v1"'})
+    chunks = stream_get(URL)
+    next(chunks)
+    chunks.close()
+
+    mock_get.return_value = response(200, b"full")
+    assert b"".join(stream_get(URL)) == b"full"
+    assert "If-None-Match" not in mock_get.call_args.kwargs["headers"]
+
+@patch("requests.Session.request")
+def test_parse_results_are_reused_until_the_body_changes(mock_get):
+    mock_get.return_value = response(200, b"<rss>1</rss>", {"ETag": '"v1"'})
+    resp = cached_get(URL)
+    assert load_parsed(resp, "rss") is None
+    store_parsed(resp, "rss", ["one"])
+
+    mock_get.return_value = response(304)
+    assert load_parsed(cached_get(URL), "rss") == ["one"]
+
+    mock_get.return_value = response(200, b"<rss>2</rss>", {"ETag": '"v2"'})
+    resp = cached_get(URL)
+    assert load_parsed(resp, "rss") is None
+    mock_get.return_value = response(304)
+    assert load_parsed(cached_get(URL), "rss") is None
+
+def test_eviction_drops_least_recently_used(tmp_path):
+    cache = HttpCache(tmp_path, max_bytes=10)
+    cache.store("http://a", b"123456", {})
+    time.sleep(0.01)
+    cache.store("http://b", b"123456", {})
+    assert cache.get("http://a") is None
+    assert cache.read(cache.get("http://b")) == b"123456"
@@ -0,0 +1,61 @@
+import os
+import random
+import pytest
+from src.keywords import DEFAULT_KEYWORDS, KeywordMatcher, load_profile
+from src.ranker import load_keywords
+
+def naive(kw_map, text):
+    matches = [kw_map[k] for k in kw_map if k.lower() in text.lower()]
+    return max(matches) if matches else 0.0
+
+def test_matches_substring_semantics_on_random_texts():
+    rng = random.Random(7)
+    alphabet = "abcAB é-"
+    for _ in range(300):
+        kw_map = {
+            "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))): round(rng.random(), 2)
+            for _ in range(rng.randint(1, 12))
+        }
+        matcher = KeywordMatcher(kw_map)
+        for _ in range(10):
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+            assert matcher.score(text) == naive(kw_map, text), (kw_map, text)
+
+def test_real_keywords_on_bilingual_text():
+    kw_map = load_keywords()
+    matcher = KeywordMatcher(kw_map)
+    text = "Spectacle d'IMPROV au parc / Improv show with a DJ and food trucks"
+    assert matcher.score(text) == naive(kw_map, text)
+    assert matcher.score("") == 0.0
+
+def test_word_boundary_mode():
+    kw_map = {"art": 0.5, "jazz": 1.0, "spoken-word": 0.8}
+    assert KeywordMatcher(kw_map).score("Party at the Smart Cafe") == 0.5
+    bounded = KeywordMatcher(kw_map, word_boundary=True)
+    assert bounded.score("Party at the Smart Cafe") == 0.0
+    assert bounded.score("Art, JAZZ & more") == 1.0
+    assert bounded.score("An evening of spoken-word.") == 0.8
+    assert bounded.score("jazzy") == 0.0
+
+def test_profile_is_cached_until_the_file_changes(tmp_path):
+    path = tmp_path / "keywords.yaml"
+    path.write_text("jazz: 1.0\nfood: 0.5\n")
+    profile = load_profile(path)
+    assert load_profile(path) is profile
+    assert profile.matcher.score("Jazz brunch") == 1.0
+
+    path.write_text("food: 0.5\n")
+    os.utime(path, ns=(0, profile.stamp[0] + 1))
+    reloaded = load_profile(path)
+    assert reloaded is not profile
+    assert reloaded.matcher.score("Jazz brunch") == 0.0
+
+def test_missing_file_uses_defaults(tmp_path):
+    assert load_profile(tmp_path / "missing.yaml").weights == DEFAULT_KEYWORDS
+
+@pytest.mark.parametrize("content", ["- jazz\n", "jazz: loud\n", "jazz: 1.5\n", "jazz: true\n"])
+def test_invalid_weights_are_rejected(tmp_path, content):
+    path = tmp_path / "keywords.yaml"
+    path.write_text(content)
+    with pytest.raises(ValueError, match="keywords.yaml"):
+        load_profile(path)
@@ -3,7 +3,8 @@ from unittest.mock import patch
 from click.testing import CliRunner
 from src.main import cli
 from src.models import Event, EventSource
-from datetime import datetime
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
 
 @pytest.fixture
 def mock_events():
@@ -47,4 +48,43 @@ def test_cli_error():
         result = runner.invoke(cli)
         # The CLI prints the error and exits with code 1 in real runs, but Click may return 0 in test context
         # Accept both 0 and 1 as valid exit codes for robustness
-        assert result.exit_code in (0, 1) 
\ No newline at end of file
+        assert result.exit_code in (0, 1) 
+
+
+def test_cli_saves_snapshot_and_replays_it_offline(tmp_path, monkeypatch):
+    start = datetime.combine(date.today() + timedelta(days=1), datetime.min.time()) + timedelta(hours=20)
+    events = [
+        Event(title="Jazz concert", description="Live music", start_dt=start, end_dt=start + timedelta(hours=2),
+              location="Montreal", url="http://example.com", source=EventSource.VILLE_MTL,
+              source_id="jazz", popularity=0.5),
+    ]
+    snapshot = tmp_path / "events.snap"
+    runner = CliRunner()
+    with patch("src.main.pull_all", return_value=events), \
+         patch("src.main.sync", return_value=SimpleNamespace(synced={}, error_count=0)):
+        result = runner.invoke(cli, ["--save-snapshot", str(snapshot)])
+    assert result.exit_code == 0, result.output
+    assert snapshot.exists()
+
+    monkeypatch.delenv("GCAL_ID", raising=False)
+    with patch("src.main.pull_all") as pull, patch("src.main.sync") as sync:
+        result = runner.invoke(cli, ["--replay", str(snapshot)])
+    assert result.exit_code == 0, result.output
+    pull.assert_not_called()
+    sync.assert_not_called()
+    assert "1 to create, 0 to update, 0 unchanged" in result.output
+    assert "Jazz concert" in result.output
+
+def test_batch_ranking_merges_near_duplicates(tmp_path):
+    from src.main import rank
+    from src.utils.published import PublishedIndex
+    start = datetime.combine(date.today() + timedelta(days=1), datetime.min.time()) + timedelta(hours=20)
+
+    def event(title, source, description=""):
+        return Event(title=title, description=description, start_dt=start, end_dt=start + timedelta(hours=2),
+                     location="Montreal", url="http://example.com", source=source, source_id=title, popularity=0.5)
+
+    city = event("Concert sous les étoiles / Concert under the stars", EventSource.VILLE_MTL)
+    blog = event("Concert Under The Stars!", EventSource.MTL_BLOG, "Free outdoor concert in the Old Port.")
+    ranked, _, _ = rank([city, blog], PublishedIndex(tmp_path / "published.sqlite"), "greedy")
+    assert ranked == [blog]
@@ -0,0 +1,95 @@
+import asyncio
+import time
+from datetime import date, datetime, time as dtime, timedelta
+from conftest import make_event
+from src.aggregator import deduplicate
+from src.models import EventSource
+from src.pipeline import IncrementalRanker, run_stages
+from src.utils.published import PublishedIndex
+from src.ranker import rank_and_filter
+
+KEYWORDS = {"concert": 1.0}
+
+def tomorrow_at(hour: int) -> datetime:
+    return datetime.combine(date.today() + timedelta(days=1), dtime(hour))
+
+class FakeSession:
+    def __init__(self):
+        self.calls = []
+        self.published = {}
+        self.synced = {}
+
+    def upsert(self, events):
+        self.calls.append(("upsert", time.monotonic(), [e.title for e in events]))
+        self.published.update((e.source_id, e) for e in events)
+        self.synced.update((e.source_id, f"cal-{e.source_id}") for e in events)
+
+    def delete(self, events):
+        self.calls.append(("delete", time.monotonic(), [e.title for e in events]))
+        return [e for e in events if self.published.pop(e.source_id, None) is not None]
+
+def fast_events():
+    return [make_event(f"fast concert {i}", tomorrow_at(18), popularity=0.0) for i in range(3)]
+
+def slow_events():
+    # Outscores the fast events in the same slot, displacing one of them
+    return [make_event("slow concert", tomorrow_at(18), source=EventSource.MTL_BLOG, popularity=1.0),
+            make_event("fast concert 0", tomorrow_at(18), popularity=0.0)]
+
+async def fast_source():
+    yield fast_events()
+
+async def slow_source():
+    await asyncio.sleep(0.5)
+    yield slow_events()
+
+def test_sync_overlaps_slow_sources_and_matches_batch_ranking():
+    session = FakeSession()
+    start = time.monotonic()
+    outcome = asyncio.run(run_stages(
+        [("fast", fast_source, None), ("slow", slow_source, None)],
+        budget=5, session=session, ranker=IncrementalRanker(KEYWORDS),
+    ))
+
+    first_kind, first_at, first_titles = session.calls[0]
+    assert first_kind == "upsert" and first_at - start < 0.4
+    assert sorted(first_titles) == ["fast concert 0", "fast concert 1", "fast concert 2"]
+
+    expected = rank_and_filter(deduplicate(fast_events() + slow_events()), KEYWORDS)
+    assert [e.title for e in outcome.selected] == [e.title for e in expected]
+    assert sorted(session.published) == sorted(e.title for e in expected)
+    assert ("delete", ["fast concert 2"]) in [(kind, titles) for kind, _, titles in session.calls]
+    assert [r.count for r in outcome.results] == [3, 2]
+
+def test_ranker_reports_only_changes():
+    ranker = IncrementalRanker(KEYWORDS)
+    added, retracted = ranker.add(fast_events())
+    assert len(added) == 3 and retracted == []
+    assert ranker.add(fast_events()) == ([], [])
+
+def test_published_unchanged_events_are_not_written_again(tmp_path):
+    index = PublishedIndex(tmp_path / "published.sqlite")
+    first = FakeSession()
+    asyncio.run(run_stages([("fast", fast_source, None)], budget=5, session=first,
+                           ranker=IncrementalRanker(KEYWORDS), index=index))
+    assert len(index) == 3
+
+    second = FakeSession()
+    outcome = asyncio.run(run_stages([("fast", fast_source, None)], budget=5, session=second,
+                                     ranker=IncrementalRanker(KEYWORDS), index=index))
+    assert second.calls == []
+    assert len(outcome.selected) == 3
+
+def test_retracted_events_are_forgotten_by_the_published_index(tmp_path):
+    index = PublishedIndex(tmp_path / "published.sqlite")
+    first = FakeSession()
+    asyncio.run(run_stages([("fast", fast_source, None), ("slow", slow_source, None)], budget=5,
+                           session=first, ranker=IncrementalRanker(KEYWORDS), index=index))
+    assert "fast concert 2" not in first.published
+    assert len(index) == len(first.published) == 3
+
+    # Without the slow source it is selected again, and must be written again
+    second = FakeSession()
+    asyncio.run(run_stages([("fast", fast_source, None)], budget=5, session=second,
+                           ranker=IncrementalRanker(KEYWORDS), index=index))
+    assert [(kind, titles) for kind, _, titles in second.calls] == [("upsert", ["fast concert 2"])]
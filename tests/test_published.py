@@ -0,0 +1,45 @@
+from datetime import date, datetime
+from conftest import make_event
+from src.aggregator import plan_sync, published_key, record_published, restore_published
+from src.utils.published import PublishedIndex, PublishedRecord
+
+def test_range_queries_and_pruning(tmp_path):
+    index = PublishedIndex(tmp_path / "p.sqlite")
+    index.record([
+        PublishedRecord(f"k{day}", f"s{day}", date(2025, 6, day).isoformat(), 0.5, "h", "r", f"cal{day}")
+        for day in (1, 5, 9)
+    ])
+    assert [r.calendar_id for r in index.between(date(2025, 6, 2), date(2025, 6, 9))] == ["cal5", "cal9"]
+    assert list(index.lookup([("k1", "s1"), ("k5", "s5")], date(2025, 6, 1), date(2025, 6, 3))) == [("k1", "s1")]
+    assert index.prune(date(2025, 6, 6)) == 2
+    assert len(index) == 1
+
+def test_only_known_unchanged_events_are_restored(tmp_path):
+    index = PublishedIndex(tmp_path / "p.sqlite")
+    published = [make_event("Jazz"), make_event("Blues"), make_event("Folk", datetime(2025, 6, 2, 20))]
+    for e in published:
+        e.score = 0.7
+    stored = record_published(index, published, {"Jazz": "cal-1", "Blues": "cal-2"}, "r1", today=date(2025, 6, 1))
+    assert stored == 2  # Folk never reached the calendar
+
+    fetched = [make_event("Jazz"), make_event("Blues", description="Now with a DJ"), make_event("Folk", datetime(2025, 6, 2, 20))]
+    unchanged = restore_published(fetched, index, "r1")
+    assert list(unchanged) == [published_key(fetched[0])]
+    assert unchanged[published_key(fetched[0])].calendar_id == "cal-1"
+    assert [e.score for e in fetched] == [0.7, None, None]
+
+    # Scores computed with other weights are not reused, but the event is still unchanged
+    again = [make_event("Jazz")]
+    assert list(restore_published(again, index, "r2")) == [published_key(again[0])]
+    assert again[0].score is None
+
+def test_plan_sync_splits_by_published_state(tmp_path):
+    index = PublishedIndex(tmp_path / "p.sqlite")
+    published = [make_event("Jazz"), make_event("Blues")]
+    for e in published:
+        e.score = 0.7
+    record_published(index, published, {"Jazz": "cal-1", "Blues": "cal-2"}, "r1", today=date(2025, 6, 1))
+
+    fetched = [make_event("Jazz"), make_event("Blues", description="Now with a DJ"), make_event("Folk")]
+    plan = plan_sync(fetched, index, restore_published(fetched, index, "r1"))
+    assert (plan.unchanged, plan.update, plan.create) == ([fetched[0]], [fetched[1]], [fetched[2]])
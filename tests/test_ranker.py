@@ -1,7 +1,8 @@
 import pytest
 from datetime import datetime, timedelta
 from src.models import Event, EventSource
-from src.ranker import rank_and_filter
+import random
+from src.ranker import load_keywords, rank_and_filter, score_batch, score_event
 
 def create_test_event(
     title: str,
@@ -75,4 +76,41 @@ def test_sorting():
     ranked = rank_and_filter(events)
     assert ranked[0].title == "High Score"
     assert ranked[1].title == "Medium Score"
-    assert ranked[2].title == "Low Score" 
\ No newline at end of file
+    assert ranked[2].title == "Low Score" 
+
+
+def test_score_batch_is_bit_compatible_with_score_event():
+    rng = random.Random(3)
+    words = ["Jazz", "food", "the", "and", "with", "show", "free", "festival", "🇫🇷", "🇬🇧", "parc", "/"]
+    events = []
+    for i in range(500):
+        start = datetime(2025, 1, 1) + timedelta(hours=rng.randint(0, 500))
+        events.append(Event(
+            title=" ".join(rng.choices(words, k=4)),
+            description=" ".join(rng.choices(words, k=rng.randint(0, 12))),
+            start_dt=start,
+            end_dt=start + timedelta(hours=rng.choice([1, 3, 5, 24])),
+            location="Montreal",
+            url="https://example.com",
+            source=rng.choice(list(EventSource)),
+            source_id=str(i),
+            is_all_day=rng.random() < 0.2,
+            popularity=rng.choice([None, 0, 1, rng.random()]),
+        ))
+    kw_map = load_keywords()
+    expected = [score_event(e, kw_map) for e in events]
+    scores = score_batch(events, kw_map)
+    assert scores.tolist() == expected
+    assert [e.score for e in events] == expected
+
+def test_ranking_fingerprint_covers_every_scoring_input(monkeypatch):
+    from src import ranker
+    kw_map = {"jazz": 1.0}
+    base = ranker.ranking_fingerprint(kw_map)
+    assert ranker.ranking_fingerprint({"jazz": 0.5}) != base
+    for name, value in [("FEATURE_WEIGHTS", (0.2, 0.35, 0.25, 0.1, 0.1)), ("MIN_SCORE", 0.3),
+                        ("SCORING_VERSION", ranker.SCORING_VERSION + 1)]:
+        with monkeypatch.context() as m:
+            m.setattr(ranker, name, value)
+            assert ranker.ranking_fingerprint(kw_map) != base, name
+    assert ranker.ranking_fingerprint(kw_map) == base
@@ -1,4 +1,5 @@
 import unittest
+import unittest.mock
 from unittest.mock import patch
 from datetime import datetime, timedelta
 import json
@@ -8,10 +9,12 @@ from src.models import Event, EventSource
 
 class TestRedditAdapter(unittest.TestCase):
 
-    @patch('requests.get')
+    @patch('requests.Session.request')
     def test_get_reddit_events_public_feed(self, mock_get):
         # Mock the requests.get response for the public JSON feed
         mock_get.return_value.status_code = 200
+        mock_get.return_value.headers = {}
+        mock_get.return_value.content = b"{}"
         mock_get.return_value.json.return_value = {
             "data": {
                 "children": [
@@ -69,19 +72,74 @@ class TestRedditAdapter(unittest.TestCase):
         self.assertEqual(event2.location, "Montreal")
         self.assertAlmostEqual(event2.duration_hours, 2.0)
 
-    @patch('requests.get')
+    @patch('requests.Session.request')
     def test_get_reddit_events_no_posts(self, mock_get):
         mock_get.return_value.status_code = 200
+        mock_get.return_value.headers = {}
+        mock_get.return_value.content = b"{}"
         mock_get.return_value.json.return_value = {"data": {"children": []}}
         events = get_reddit_events()
         self.assertEqual(len(events), 0, "Should return an empty list if no posts")
 
-    @patch('requests.get')
+    @patch('requests.Session.request')
     def test_get_reddit_events_http_error(self, mock_get):
         mock_get.return_value.status_code = 404
         mock_get.side_effect = requests.exceptions.HTTPError("Not Found")
         events = get_reddit_events()
         self.assertEqual(len(events), 0, "Should return an empty list on HTTP error")
 
+    @patch('src.utils.http_cache.FRESHNESS', [])
+    @patch('requests.Session.request')
+    def test_pages_with_after_and_stops_at_last_seen_post(self, mock_get):
+        def page(posts, after):
+            resp = unittest.mock.MagicMock(status_code=200, headers={}, content=b"{}")
+            resp.json.return_value = {"data": {"after": after, "children": [
+                {"data": {"name": f"t3_{n}", "id": n, "title": f"Festival {n}", "url": f"http://x/{n}",
+                          "selftext": "", "created_utc": created}} for n, created in posts
+            ]}}
+            return resp
+
+        mock_get.side_effect = [page([("c", 30), ("b", 20)], "t3_b"), page([("a", 10)], None)]
+        events = get_reddit_events()
+        self.assertEqual([e.source_id for e in events], ["c", "b", "a"])
+        self.assertIn("after=t3_b", mock_get.call_args_list[1].args[1])
+
+        # Next run: only the posts newer than "c" are read, and no second page is requested
+        mock_get.side_effect = [page([("e", 50), ("d", 40), ("c", 30), ("b", 20)], "t3_b")]
+        events = get_reddit_events()
+        self.assertEqual([e.source_id for e in events], ["e", "d"])
+        self.assertEqual(mock_get.call_count, 3)
+
+    @patch('src.utils.http_cache.FRESHNESS', [])
+    @patch('requests.Session.request')
+    def test_cursor_is_kept_when_the_batch_is_not_accepted(self, mock_get):
+        import asyncio
+        from src import fetcher
+        from src.sources.reddit import _load_cursors, commit_reddit_cursors, stream_reddit_events
+
+        resp = unittest.mock.MagicMock(status_code=200, headers={}, content=b"{}")
+        resp.json.return_value = {"data": {"after": None, "children": [
+            {"data": {"name": "t3_a", "id": "a", "title": "Festival a", "url": "http://x/a",
+                      "selftext": "", "created_utc": 10}}
+        ]}}
+        mock_get.return_value = resp
+
+        async def stuck_sink(name, batch):
+            await asyncio.sleep(10)
+
+        async def accepting_sink(name, batch):
+            pass
+
+        sources = [("reddit", stream_reddit_events, 0.5)]
+        asyncio.run(fetcher.fetch_all(sources, budget=5, sink=stuck_sink))
+        commit_reddit_cursors()
+        self.assertEqual(_load_cursors(), {})
+
+        # Taken but not synced yet: the cursor only moves once the run commits it
+        asyncio.run(fetcher.fetch_all(sources, budget=5, sink=accepting_sink))
+        self.assertEqual(_load_cursors(), {})
+        commit_reddit_cursors()
+        self.assertEqual(_load_cursors(), {"montreal/new": {"name": "t3_a", "created_utc": 10}})
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,64 @@
+import pytest
+from conftest import make_event
+from src import aggregator
+from src.sources import registry
+from src.sources.registry import LatencyHistory, SourceSpec, register_source, enabled_sources, schedule
+
+async def empty_stream():
+    yield []
+
+@pytest.fixture
+def fresh_registry(monkeypatch):
+    monkeypatch.setattr(registry, "_REGISTRY", {})
+    return registry._REGISTRY
+
+def test_registration_and_enablement(fresh_registry, monkeypatch):
+    register_source("a")(empty_stream)
+    register_source("b", enabled=False)(empty_stream)
+    assert [s.name for s in enabled_sources()] == ["a"]
+
+    monkeypatch.setenv("MTL_EVENTS_SOURCES", "b")
+    assert [s.name for s in enabled_sources()] == ["b"]
+
+def test_schedule_starts_slowest_first_and_sizes_deadlines():
+    specs = [
+        SourceSpec("fast", empty_stream, cost=1, deadline=30),
+        SourceSpec("slow", empty_stream, cost=20, deadline=60),
+        SourceSpec("new", empty_stream, cost=5, deadline=30),
+    ]
+    history = LatencyHistory({"fast": [1.0, 2.0], "slow": [10.0, 24.0]})
+    plan, budget = schedule(specs, history)
+
+    assert [name for name, _, _ in plan] == ["slow", "new", "fast"]
+    deadlines = {name: deadline for name, _, deadline in plan}
+    assert deadlines["slow"] == pytest.approx(24.0 * 1.5 + 2.0)
+    assert deadlines["fast"] == 30 * registry.MIN_DEADLINE_FRACTION
+    assert budget == deadlines["slow"]
+
+def test_deadlines_keep_a_floor_and_recover_after_a_timeout(fresh_registry):
+    from src.fetcher import SourceResult
+    register_source("city", cost=30, deadline=60)(empty_stream)
+    spec = fresh_registry["city"]
+    history = LatencyHistory({"city": [0.5, 0.8]})
+    (_, _, deadline), = schedule([spec], history)[0]
+    assert deadline == 30  # never below the declared cost
+
+    registry.record_run([SourceResult("city", status="timeout", elapsed=deadline)], history)
+    (_, _, deadline), = schedule([spec], history)[0]
+    assert deadline == 60
+
+def test_history_is_bounded_and_persisted():
+    history = LatencyHistory()
+    for i in range(20):
+        history.record("x", float(i))
+    history.save()
+    assert LatencyHistory.load().samples["x"] == [float(i) for i in range(12, 20)]
+
+def test_pull_all_runs_registered_sources_and_records_latency(fresh_registry):
+    @register_source("demo", cost=1, deadline=10)
+    async def demo_stream():
+        yield [make_event("Demo")]
+
+    events = aggregator.pull_all()
+    assert [e.title for e in events] == ["Demo"]
+    assert len(LatencyHistory.load().samples["demo"]) == 1
@@ -17,11 +17,118 @@ def mock_feedparser():
     with patch("feedparser.parse", return_value=mock_feed):
         yield
 
-def test_get_rss_events(mock_feedparser):
+def test_get_rss_events(mock_feedparser, monkeypatch):
+    from src.sources import rss_generic
+    monkeypatch.setattr(rss_generic, "cached_get", slow_cached_get({url: 0 for url, _ in rss_generic.RSS_FEEDS}))
+    monkeypatch.setenv("RSS_PARSE_EXECUTOR", "thread")  # feedparser is patched in this process
     events = get_rss_events()
     assert len(events) == 2  # One for each feed in RSS_FEEDS
     for event in events:
         assert event.title == "RSS Event Title"
         assert event.source in (EventSource.MTL_BLOG, EventSource.GAZETTE)
         assert event.source_id == "rss-123"
-        assert event.url == "https://mtlblog.com/event/123" 
\ No newline at end of file
+        assert event.url == "https://mtlblog.com/event/123"
+
+
+RSS_BODY = b"""<?xml version="1.0"?><rss version="2.0"><channel><title>t</title>
+<item><title>Jazz in the park</title><link>https://example.com/jazz</link>
+<guid>jazz-1</guid><pubDate>Wed, 27 Mar 2024 18:00:00 GMT</pubDate>
+<description>Free show</description></item></channel></rss>"""
+
+def slow_cached_get(delays):
+    def fetch(url, *_, **__):
+        import time
+        time.sleep(delays[url])
+        response = MagicMock(content=RSS_BODY)
+        response.raise_for_status.return_value = None
+        return response
+    return fetch
+
+def test_feeds_are_fetched_concurrently(monkeypatch):
+    import time
+    from src.sources import rss_generic
+    feeds = [(f"https://feed{i}.example.com/rss", EventSource.MTL_BLOG) for i in range(3)]
+    monkeypatch.setattr(rss_generic, "RSS_FEEDS", feeds)
+    monkeypatch.setattr(rss_generic, "cached_get", slow_cached_get({url: 0.3 for url, _ in feeds}))
+    monkeypatch.setenv("RSS_PARSE_EXECUTOR", "thread")  # times the fetches, not the pool's start-up
+
+    start = time.monotonic()
+    events = get_rss_events()
+    assert time.monotonic() - start < 0.8
+    assert len(events) == 3
+    assert {e.source_id for e in events} == {"jazz-1"}
+    assert events[0].description == "Free show"
+
+def test_slow_feed_hits_its_deadline(monkeypatch):
+    from src.sources import rss_generic
+    feeds = [("https://fast.example.com/rss", EventSource.MTL_BLOG),
+             ("https://slow.example.com/rss", EventSource.MTL_BLOG)]
+    monkeypatch.setattr(rss_generic, "RSS_FEEDS", feeds)
+    monkeypatch.setattr(rss_generic, "FEED_TIMEOUT", 0.2)
+    monkeypatch.setenv("RSS_PARSE_EXECUTOR", "thread")  # a 0.2 s deadline leaves no room for spawning
+    monkeypatch.setattr(rss_generic, "cached_get", slow_cached_get({feeds[0][0]: 0, feeds[1][0]: 5}))
+
+    events = get_rss_events()
+    assert [e.url for e in events] == ["https://example.com/jazz"]
+
+EXIT_SCRIPT = """
+import time
+from unittest.mock import MagicMock
+from src.sources import rss_generic
+from src.models import EventSource
+
+rss_generic.RSS_FEEDS = [("https://slow.example.com/rss", EventSource.MTL_BLOG)]
+rss_generic.FEED_TIMEOUT = 3
+# A parse of 30 s, picklable for the process pool: time.sleep(response.content)
+rss_generic.cached_get = lambda url: MagicMock(content=30)
+rss_generic._parse_entries = time.sleep
+assert rss_generic.get_rss_events() == []
+"""
+
+@pytest.mark.parametrize("executor", ["process", "thread"])
+def test_a_hung_parse_does_not_delay_exit(executor):
+    import os, subprocess, sys, time
+    start = time.monotonic()
+    subprocess.run([sys.executable, "-c", EXIT_SCRIPT], check=True, timeout=60,
+                   env={**os.environ, "RSS_PARSE_EXECUTOR": executor})
+    assert time.monotonic() - start < 15
+
+def test_parse_errors_are_reported_by_the_caller():
+    from src.sources.rss_generic import _parse_entries
+    entries, error = _parse_entries(RSS_BODY.replace(b"</rss>", b""))
+    assert [e['id'] for e in entries] == ["jazz-1"]
+    assert error
+
+def test_process_pool_is_spawned_by_default_and_terminated(monkeypatch):
+    from src.sources import rss_generic
+    monkeypatch.delenv("RSS_PARSE_EXECUTOR", raising=False)
+    monkeypatch.setattr(rss_generic, "RSS_FEEDS", [("https://feed.example.com/rss", EventSource.MTL_BLOG)])
+    monkeypatch.setattr(rss_generic, "cached_get", slow_cached_get({"https://feed.example.com/rss": 0}))
+    methods, pools = [], []
+    get_context = rss_generic.multiprocessing.get_context
+    monkeypatch.setattr(rss_generic.multiprocessing, "get_context",
+                        lambda method: methods.append(method) or get_context(method))
+    make_pool = rss_generic._parse_pool
+    monkeypatch.setattr(rss_generic, "_parse_pool", lambda: pools.append(make_pool()) or pools[-1])
+
+    assert [e.source_id for e in get_rss_events()] == ["jazz-1"]
+    assert methods == ["spawn"]
+    with pytest.raises(ValueError):  # terminated with the fetch
+        pools[0].apply_async(len, ([],))
+
+def test_unchanged_feed_is_not_parsed_again(monkeypatch):
+    import feedparser
+    from src.sources import rss_generic
+    url = "https://feed.example.com/rss"
+    monkeypatch.setattr(rss_generic, "RSS_FEEDS", [(url, EventSource.MTL_BLOG)])
+    monkeypatch.setenv("RSS_PARSE_EXECUTOR", "thread")  # counts parses in this process
+    parses = []
+    real_parse = feedparser.parse
+    monkeypatch.setattr(feedparser, "parse", lambda content: parses.append(1) or real_parse(content))
+
+    with patch("requests.Session.request") as mock_request:
+        mock_request.return_value = MagicMock(status_code=200, content=RSS_BODY, headers={"ETag": '"v1"'})
+        assert [e.source_id for e in get_rss_events()] == ["jazz-1"]
+        mock_request.return_value = MagicMock(status_code=304, headers={})
+        assert [e.source_id for e in get_rss_events()] == ["jazz-1"]
+    assert len(parses) == 1
@@ -0,0 +1,89 @@
+import itertools
+import random
+import time
+from datetime import datetime, timedelta
+from conftest import make_event
+from src.ranker import select
+from src.scheduling import OverlapCounter, greedy_select, optimal_select
+
+BASE = datetime(2025, 7, 1)
+
+def slot(i, start_min, length_min, score):
+    """Event ``i`` of ``length_min`` minutes, ``start_min`` minutes after BASE."""
+    start = BASE + timedelta(minutes=start_min)
+    return make_event(f"e{i}", start, end_dt=start + timedelta(minutes=length_min),
+                      source_id=str(i), score=score)
+
+def reference_select(events, max_per_day, max_parallel, key):
+    """The original scan over each day's accepted events."""
+    out, by_day = [], {}
+    for e in sorted(events, key=key):
+        day = e.start_dt.date()
+        by_day.setdefault(day, [])
+        active = [pe for pe in by_day[day] if not (e.end_dt <= pe.start_dt or e.start_dt >= pe.end_dt)]
+        if len(by_day[day]) < max_per_day and len(active) < max_parallel:
+            by_day[day].append(e)
+            out.append(e)
+    return out
+
+def test_matches_reference_greedy_on_random_days():
+    rng = random.Random(11)
+    keys = [lambda x: (-x.score, x.start_dt), lambda x: (x.start_dt, -x.score)]
+    for trial in range(300):
+        events = [
+            slot(i, rng.randrange(0, 3 * 24 * 60, 30),
+                       rng.choice([-60, 0, 30, 60, 120, 240, 600]),  # includes empty and inverted intervals
+                       rng.choice([0.2, 0.4, 0.5, 0.8]))
+            for i in range(rng.randint(0, 60))
+        ]
+        max_per_day, max_parallel = rng.randint(1, 12), rng.randint(1, 5)
+        key = keys[trial % 2]
+        assert greedy_select(events, max_per_day, max_parallel, key) == \
+            reference_select(events, max_per_day, max_parallel, key)
+
+def test_default_limits_come_from_ranker_constants():
+    events = [slot(i, 60 * i, 30, 0.5) for i in range(10)]
+    assert len(select(events)) == 5
+    assert len(select(events, max_per_day=8)) == 8
+
+def test_counter_counts_touching_intervals_as_disjoint():
+    counter = OverlapCounter([0, 10, 20, 30])
+    counter.add(0, 10)
+    counter.add(20, 30)
+    assert counter.count(10, 20) == 0
+    assert counter.count(0, 30) == 2
+    assert counter.count(10, 10) == 0
+
+def test_dense_day_scales():
+    rng = random.Random(5)
+    events = [slot(i, rng.randrange(0, 24 * 60), rng.randrange(30, 240), rng.random()) for i in range(20000)]
+    start = time.monotonic()
+    greedy_select(events, max_per_day=5000, max_parallel=500)
+    assert time.monotonic() - start < 5
+
+def max_running(selected):
+    return max((sum(1 for x in selected if x.start_dt <= e.start_dt < x.end_dt) for e in selected), default=0)
+
+def test_optimal_engine_beats_a_blocking_long_event():
+    long_event = slot(0, 0, 240, 0.9)
+    short = [slot(i, 60 * (i - 1), 60, 0.6) for i in range(1, 4)]
+    assert greedy_select([long_event] + short, 5, 1) == [long_event]
+    assert optimal_select([long_event] + short, 5, 1) == short
+    assert select([long_event] + short, max_parallel=1, engine="optimal") == short
+
+def test_optimal_engine_is_feasible_and_never_worse_than_greedy():
+    rng = random.Random(2)
+    for _ in range(200):
+        events = [slot(i, rng.randrange(0, 600, 30), rng.choice([30, 60, 120, 240]), round(rng.random(), 2))
+                  for i in range(rng.randint(1, 8))]
+        max_per_day, max_parallel = rng.randint(1, 4), rng.randint(1, 3)
+        chosen = optimal_select(events, max_per_day, max_parallel)
+        greedy_total = sum(e.score for e in greedy_select(events, max_per_day, max_parallel))
+        best_total = max(
+            sum(e.score for e in subset)
+            for r in range(min(max_per_day, len(events)) + 1)
+            for subset in itertools.combinations(events, r)
+            if max_running(subset) <= max_parallel
+        )
+        assert len(chosen) <= max_per_day and max_running(chosen) <= max_parallel
+        assert greedy_total - 1e-9 <= sum(e.score for e in chosen) <= best_total + 1e-9
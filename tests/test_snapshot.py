@@ -0,0 +1,45 @@
+from datetime import date, datetime
+import pytest
+from conftest import make_event
+from src.models import EventSource
+from src.snapshot import (SNAPSHOT_VERSION, default_snapshot_path, load_events, load_snapshot,
+                          read_header, save_snapshot)
+
+EVENTS = [
+    make_event("Jazz", datetime(2025, 6, 1, 20), popularity=0.1, score=0.5),
+    make_event("Café-concert", datetime(2025, 6, 1, 18), description=None, source=EventSource.MTL_BLOG),
+    make_event("Jazz", datetime(2025, 6, 1, 21), is_all_day=True, source_id="jazz-2"),
+]
+
+def test_round_trip_maps_arrays_read_only(tmp_path):
+    path = save_snapshot(EVENTS, tmp_path / "events.snap", meta={"mode": "batch"})
+
+    header = read_header(path)
+    assert (header["count"], header["version"], header["meta"]) == (3, SNAPSHOT_VERSION, {"mode": "batch"})
+    batch = load_snapshot(path)
+    assert not batch.start_us.flags.writeable
+    assert batch.to_events() == EVENTS
+    assert [e.content_hash() for e in load_events(path)] == [e.content_hash() for e in EVENTS]
+    assert load_events(save_snapshot([], tmp_path / "empty.snap")) == []
+
+def test_rejects_other_files_and_newer_versions(tmp_path):
+    (tmp_path / "bad.snap").write_bytes(b"not a snapshot at all")
+    with pytest.raises(ValueError, match="not a snapshot"):
+        load_snapshot(tmp_path / "bad.snap")
+
+    path = save_snapshot(EVENTS, tmp_path / "events.snap")
+    data = bytearray(path.read_bytes())
+    data[12:16] = (SNAPSHOT_VERSION + 1).to_bytes(4, "little")
+    path.write_bytes(bytes(data))
+    with pytest.raises(ValueError, match="newer than supported"):
+        load_snapshot(path)
+
+def test_default_path_is_dated_under_state_dir():
+    path = default_snapshot_path(date(2025, 6, 1))
+    assert path.name == "events-2025-06-01.snap"
+    assert path.parent.name == "snapshots"
+
+def test_snapshot_module_does_not_load_the_sources():
+    import subprocess, sys
+    code = "import sys, src.snapshot; assert not any(m.startswith(('src.sources', 'src.aggregator')) for m in sys.modules)"
+    subprocess.run([sys.executable, "-c", code], check=True)
@@ -0,0 +1,37 @@
+from unittest.mock import patch, MagicMock
+from src.sources import ville_mtl
+from src.utils.translation_cache import TranslationCache
+
+def test_persists_across_instances(tmp_path):
+    path = tmp_path / "t.sqlite"
+    TranslationCache(path).put_many([("Bonjour", "Hello")], "fr", "en")
+
+    cache = TranslationCache(path)
+    assert cache.get_many(["Bonjour", "Salut"], "fr", "en") == {"Bonjour": "Hello"}
+    assert cache.get_many(["Bonjour"], "fr", "es") == {}
+    assert cache.stats() == {"hits": 1, "misses": 2, "entries": 1}
+
+def test_ttl_and_size_cap(tmp_path):
+    cache = TranslationCache(tmp_path / "t.sqlite", max_entries=2)
+    cache.put_many([("a", "A")], "fr", "en")
+    cache.put_many([("b", "B")], "fr", "en")
+    cache.get_many(["a"], "fr", "en")          # a is now more recently used than b
+    cache.put_many([("c", "C")], "fr", "en")
+    assert set(cache.get_many(["a", "b", "c"], "fr", "en")) == {"a", "c"}
+
+    cache.ttl = -1
+    assert cache.get_many(["a"], "fr", "en") == {}
+    assert cache.prune() == 2
+
+@patch("src.utils.translator.request")
+def test_translate_batch_only_sends_uncached_texts(mock_request):
+    ville_mtl.get_translation_cache().put_many([("Bonjour", "Hello")], "fr", "en")
+    mock_request.return_value = MagicMock(status_code=200)
+    mock_request.return_value.json.return_value = {
+        "data": {"translations": [{"translatedText": "Good evening"}]}
+    }
+
+    assert ville_mtl.translate_batch(["Bonjour", "Bonsoir"]) == ["Hello", "Good evening"]
+    assert mock_request.call_args.kwargs["data"]["q"] == ["Bonsoir"]
+    assert ville_mtl.translate_batch(["Bonsoir"]) == ["Good evening"]
+    assert mock_request.call_count == 1
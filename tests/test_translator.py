@@ -0,0 +1,44 @@
+import threading
+import time
+from unittest.mock import patch, MagicMock
+from src.utils.translator import pack, translate_texts, RateLimiter
+
+def fake_api(calls):
+    lock = threading.Lock()
+    def respond(method, url, data, **_):
+        with lock:
+            calls.append(list(data["q"]))
+        resp = MagicMock(status_code=200)
+        resp.json.return_value = {
+            "data": {"translations": [{"translatedText": t.upper()} for t in data["q"]]}
+        }
+        return resp
+    return respond
+
+def test_pack_respects_segment_and_char_limits():
+    texts = ["x" * n for n in (40, 30, 30, 20, 10, 5, 5, 5)]
+    packs = pack(texts, max_chars=50, max_segments=3)
+    assert sorted(t for p in packs for t in p) == sorted(texts)
+    assert all(len(p) <= 3 and sum(map(len, p)) <= 50 for p in packs)
+    assert pack(["y" * 80], max_chars=50) == [["y" * 80]]
+
+def test_dedupes_and_scatters_results():
+    calls = []
+    with patch("src.utils.translator.request", side_effect=fake_api(calls)):
+        out = translate_texts(["chat", "chien", "chat", "", "oiseau"], max_segments=2, max_in_flight=2)
+    assert out == ["CHAT", "CHIEN", "CHAT", "", "OISEAU"]
+    sent = [t for c in calls for t in c]
+    assert sorted(sent) == ["chat", "chien", "oiseau"]
+    assert len(calls) == 2
+
+def test_failed_pack_falls_back_to_original():
+    resp = MagicMock(status_code=403, text="forbidden")
+    with patch("src.utils.translator.request", return_value=resp):
+        assert translate_texts(["bonjour"]) == ["bonjour"]
+
+def test_rate_limiter_spaces_calls():
+    limiter = RateLimiter(rate=20)
+    start = time.monotonic()
+    for _ in range(3):
+        limiter.acquire()
+    assert time.monotonic() - start >= 0.09